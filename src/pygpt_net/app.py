@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.07 08:00:00                  #
+# Updated Date: 2024.01.19 12:00:00                  #
 # ================================================== #
 
 import os
@@ -21,6 +21,7 @@ from logging import ERROR, WARNING, INFO, DEBUG
 from pygpt_net.container import Container
 from pygpt_net.controller import Controller
 from pygpt_net.core.debug import Debug
+from pygpt_net.core.debug.profiler import Profiler
 from pygpt_net.core.platforms import Platforms
 from pygpt_net.ui import UI
 from pygpt_net.utils import get_app_meta, trans
@@ -62,27 +63,35 @@ class MainWindow(QMainWindow, QtStyleTools):
         self.is_closing = False
         self.timer_interval = 30
         self.post_timer_interval = 1000
+        self.profiler = Profiler()  # startup timeline
 
         # load version info
         self.meta = get_app_meta()
 
         # setup service container
-        self.core = Container(self)
-        self.core.init()
-        self.core.patch()  # patch version if needed
+        with self.profiler.phase('container'):
+            self.core = Container(self)
+        with self.profiler.phase('container.init'):
+            self.core.init()
+        with self.profiler.phase('patch'):
+            self.core.patch()  # patch version if needed
 
         # setup thread pool
         self.threadpool = QThreadPool()
 
         # setup controllers
-        self.controller = Controller(self)
+        with self.profiler.phase('controller'):
+            self.controller = Controller(self)
 
         # init, load settings options, etc.
-        self.controller.init()
+        with self.profiler.phase('controller.init'):
+            self.controller.init()
 
         # setup UI
-        self.ui = UI(self)
-        self.ui.init()
+        with self.profiler.phase('ui'):
+            self.ui = UI(self)
+        with self.profiler.phase('ui.init'):
+            self.ui.init()
 
         # setup global signals
         self.statusChanged.connect(self.update_status)
@@ -105,20 +114,32 @@ class MainWindow(QMainWindow, QtStyleTools):
 
     def setup(self):
         """Setup app"""
-        self.controller.setup()
-        self.controller.plugins.setup()
-        self.controller.post_setup()
+        with self.profiler.phase('controller.setup'):
+            self.controller.setup()
+        with self.profiler.phase('plugins.setup'):
+            self.controller.plugins.setup()
+        with self.profiler.phase('controller.post_setup'):
+            self.controller.post_setup()
 
     def post_setup(self):
         """Called after setup"""
-        self.controller.layout.post_setup()
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update)
-        self.timer.start(self.timer_interval)
-        self.post_timer = QTimer()
-        self.post_timer.timeout.connect(self.post_update)
-        self.post_timer.start(self.post_timer_interval)
-        self.ui.post_setup()
+        with self.profiler.phase('post_setup'):
+            self.controller.layout.post_setup()
+            self.timer = QTimer()
+            self.timer.timeout.connect(self.update)
+            self.timer.start(self.timer_interval)
+            self.post_timer = QTimer()
+            self.post_timer.timeout.connect(self.post_update)
+            self.post_timer.start(self.post_timer_interval)
+            self.ui.post_setup()
+        QTimer.singleShot(0, self.setup_deferred)  # after first paint
+
+    def setup_deferred(self):
+        """Setup subsystems not needed for first paint"""
+        with self.profiler.phase('deferred'):
+            self.controller.setup_deferred()
+        self.profiler.mark('ready')
+        self.profiler.dump(self.core.config.path)
 
     def update(self):
         """Called on every update"""
@@ -147,8 +168,12 @@ class MainWindow(QMainWindow, QtStyleTools):
         """
         self.is_closing = True
         print("Closing...")
+        self.controller.setup_deferred()  # load deferred data before saving it
         print("Sending terminate signal to plugins...")
         self.controller.plugins.destroy()
+        print("Stopping indexing...")
+        self.controller.idx.watcher.stop()
+        self.controller.idx.indexer.on_close()
         print("Saving notepad...")
         self.controller.notepad.save_all()
         print("Saving calendar...")
@@ -223,6 +248,7 @@ class Launcher:
         self.window.resize(available_geometry.width() - margin, available_geometry.height() - margin)
         self.window.show()
         self.window.move(pos)
+        self.window.profiler.mark('window.show')
         self.window.post_setup()
         sys.exit(self.app.exec())
 
@@ -265,7 +291,16 @@ def run(plugins: list = None, llms: list = None):
 
         run(plugins=plugins, llms=llms)
 
+    Headless batch mode (prompts from JSONL file, without UI):
+    ---------------------------------------------------------
+    ::
+
+        pygpt batch prompts.jsonl -n 8 -o results.jsonl
+
     """
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from pygpt_net.batch import run as run_batch
+        sys.exit(run_batch(sys.argv[2:]))
 
     # initialize app launcher
     launcher = Launcher()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from pygpt_net.container import Container
+from pygpt_net.item.ctx import CtxItem
+from pygpt_net.utils import get_app_meta
+
+
+class Headless:
+    def __init__(self):
+        """Window replacement for headless mode (core services only, without UI and controllers)"""
+        self.meta = get_app_meta()
+        self.controller = None
+        self.ui = None
+        self.core = Container(self)
+        self.core.init()
+        self.core.patch()  # patch version if needed
+
+
+class Batch:
+    MODES = ['chat', 'completion']  # modes available in batch
+
+    def __init__(self, window=None, workers: int = 4, store_ctx: bool = True):
+        """
+        Headless batch runner
+
+        :param window: Window instance (Headless)
+        :param workers: number of concurrent requests
+        :param store_ctx: store results in contexts DB
+        """
+        self.window = window
+        self.workers = workers
+        self.store_ctx = store_ctx
+        self.defaults = {}  # default job params: preset, mode, model
+
+    def load(self, path: str) -> list:
+        """
+        Load jobs from JSONL file
+
+        Every line is a prompt string or object with "prompt" and optional keys:
+        "id", "preset", "mode", "model", "system_prompt", "temperature", "max_tokens"
+
+        :param path: input file path
+        :return: list of jobs
+        """
+        jobs = []
+        with open(path, 'r', encoding="utf-8") as file:
+            for i, line in enumerate(file, 1):
+                line = line.strip()
+                if line == "":
+                    continue
+                data = json.loads(line)
+                if not isinstance(data, dict):
+                    data = {"prompt": str(data)}
+                job = dict(self.defaults)
+                job.update(data)
+                job["id"] = str(data.get("id", i))  # line number if no ID
+                jobs.append(job)
+        return jobs
+
+    def load_done(self, path: str) -> set:
+        """
+        Load IDs of finished jobs from previous run (resume)
+
+        :param path: output file path
+        :return: set of finished jobs IDs
+        """
+        done = set()
+        if not os.path.exists(path):
+            return done
+        with open(path, 'r', encoding="utf-8") as file:
+            for line in file:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue  # interrupted write
+                if result.get("status") == "ok":
+                    done.add(str(result["id"]))
+        return done
+
+    def prepare(self, job: dict) -> dict:
+        """
+        Prepare request params (config, then preset, then job params)
+
+        :param job: job
+        :return: request params
+        """
+        config = self.window.core.config
+        request = {
+            "mode": config.get('mode'),
+            "model": config.get('model'),
+            "sys_prompt": config.get('prompt'),
+            "temperature": config.get('temperature'),
+            "max_tokens": config.get('max_output_tokens'),
+            "user_name": config.get('user_name'),
+            "ai_name": config.get('ai_name'),
+        }
+        preset_id = job.get("preset")
+        if preset_id:
+            if not self.window.core.presets.exists(preset_id):
+                raise Exception("Preset not found: {}".format(preset_id))
+            preset = self.window.core.presets.items[preset_id]
+            mode = self.window.core.presets.get_first_mode(preset_id)
+            if mode is not None:
+                request["mode"] = mode
+            if preset.model:
+                request["model"] = preset.model
+            request["sys_prompt"] = preset.prompt
+            request["temperature"] = preset.temperature
+            request["user_name"] = preset.user_name
+            request["ai_name"] = preset.ai_name
+        for key in ["mode", "model", "temperature", "max_tokens"]:
+            if job.get(key) is not None:
+                request[key] = job[key]
+        if job.get("system_prompt") is not None:
+            request["sys_prompt"] = job["system_prompt"]
+
+        if request["mode"] not in self.MODES:
+            raise Exception("Mode not supported in batch: {}".format(request["mode"]))
+        if not self.window.core.models.has(request["model"]):
+            raise Exception("Model not found: {}".format(request["model"]))
+        request["model_id"] = self.window.core.models.get_id(request["model"])
+        return request
+
+    def call(self, job: dict) -> dict:
+        """
+        Execute job (in worker thread)
+
+        :param job: job
+        :return: result
+        """
+        start = time.time()
+        result = {
+            "id": job["id"],
+            "prompt": job.get("prompt"),
+        }
+        try:
+            request = self.prepare(job)
+            result["mode"] = request["mode"]
+            result["model"] = request["model"]
+            if request["mode"] == "chat":
+                output, usage = self.call_chat(job["prompt"], request)
+            else:
+                output, usage = self.call_completion(job["prompt"], request)
+            result["status"] = "ok"
+            result["output"] = output
+            result["input_tokens"] = usage.prompt_tokens
+            result["output_tokens"] = usage.completion_tokens
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["time"] = round(time.time() - start, 3)
+        return result
+
+    def call_chat(self, prompt: str, request: dict) -> (str, any):
+        """
+        Call chat API (every job is a new conversation)
+
+        :param prompt: user prompt
+        :param request: request params
+        :return: output, usage
+        """
+        messages = []
+        if request["sys_prompt"]:
+            messages.append({"role": "system", "content": request["sys_prompt"]})
+        messages.append({"role": "user", "content": str(prompt)})
+
+        chat = self.window.core.gpt.chat
+        max_tokens = chat.fit_tokens(messages, request["model"], request["max_tokens"])
+        response = chat.create(messages, request["model_id"], max_tokens, temperature=request["temperature"])
+        return response.choices[0].message.content.strip(), response.usage
+
+    def call_completion(self, prompt: str, request: dict) -> (str, any):
+        """
+        Call completion API
+
+        :param prompt: user prompt
+        :param request: request params
+        :return: output, usage
+        """
+        completion = self.window.core.gpt.completion
+        message = completion.append_input(request["sys_prompt"] or "", prompt,
+                                          ai_name=request["ai_name"], user_name=request["user_name"])
+        response = completion.create(message, request["model_id"], request["max_tokens"],
+                                     stop=completion.get_stop(request["user_name"]),
+                                     temperature=request["temperature"])
+        return response.choices[0].text.strip(), response.usage
+
+    def store(self, job: dict, result: dict, name: str) -> int:
+        """
+        Store result in contexts DB (as new context)
+
+        :param job: job
+        :param result: result
+        :param name: batch name
+        :return: ctx meta ID
+        """
+        meta = self.window.core.ctx.build()
+        meta.name = "{} #{}".format(name, job["id"])
+        meta.mode = result["mode"]
+        meta.model = result["model"]
+        meta.last_mode = result["mode"]
+        meta.last_model = result["model"]
+        meta.initialized = True
+        meta.id = self.window.core.ctx.provider.create(meta)
+
+        item = CtxItem()
+        item.mode = result["mode"]
+        item.model = result["model"]
+        item.set_input(job["prompt"])
+        item.set_output(result["output"])
+        item.set_tokens(result["input_tokens"], result["output_tokens"])
+        if not self.window.core.ctx.provider.append_item(meta, item):
+            self.window.core.ctx.provider.save(meta.id, meta, [item])
+        return meta.id
+
+    def run(self, path: str, output: str, name: str = None) -> dict:
+        """
+        Run jobs from file, skip jobs finished in previous run
+
+        :param path: input file path
+        :param output: output file path (JSONL, appended)
+        :param name: batch name (contexts name prefix)
+        :return: summary
+        """
+        if name is None:
+            name = "[BATCH] {}".format(os.path.basename(path))
+        jobs = self.load(path)
+        done = self.load_done(output)
+        pending = [job for job in jobs if job["id"] not in done]
+        summary = {"total": len(jobs), "skipped": len(jobs) - len(pending), "ok": 0, "error": 0}
+        print("[BATCH] Jobs: {}, already finished: {}".format(summary["total"], summary["skipped"]))
+
+        executor = ThreadPoolExecutor(max_workers=max(1, self.workers))
+        futures = {}
+        try:
+            with open(output, 'a', encoding="utf-8") as file:
+                futures = {executor.submit(self.call, job): job for job in pending}
+                for n, future in enumerate(as_completed(futures), 1):
+                    job = futures[future]
+                    result = future.result()
+                    if result["status"] == "ok" and self.store_ctx:
+                        try:
+                            result["ctx_id"] = self.store(job, result, name)
+                        except Exception as e:
+                            print("[BATCH] Error storing context: {}".format(e))
+                    file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    file.flush()  # progress is saved after every job
+                    summary[result["status"]] += 1
+                    print("[BATCH] {}/{} {}: {}".format(n, len(pending), job["id"], result["status"]))
+        except KeyboardInterrupt:
+            running = sum(1 for future in futures if future.running())
+            print("[BATCH] Interrupted, waiting for {} running requests to finish before exit "
+                  "(their results are not saved), run again to resume".format(running))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return summary
+
+
+def run(args: list = None) -> int:
+    """
+    Headless batch launcher: pygpt batch <input.jsonl> [options]
+
+    :param args: command line arguments (without "batch")
+    :return: exit code
+    """
+    parser = argparse.ArgumentParser(prog="pygpt batch", description="Run prompts from JSONL file without UI")
+    parser.add_argument("input", help="input JSONL file, one prompt per line")
+    parser.add_argument("-o", "--output", help="output JSONL file (default: <input>.results.jsonl)")
+    parser.add_argument("-n", "--workers", type=int, default=4, help="number of concurrent requests")
+    parser.add_argument("--preset", help="default preset")
+    parser.add_argument("--mode", help="default mode (chat or completion)")
+    parser.add_argument("--model", help="default model")
+    parser.add_argument("--name", help="name of created contexts")
+    parser.add_argument("--no-ctx", action="store_true", help="do not store results in contexts DB")
+    args = parser.parse_args(sys.argv[1:] if args is None else args)
+
+    output = args.output
+    if output is None:
+        output = os.path.splitext(args.input)[0] + ".results.jsonl"
+
+    batch = Batch(Headless(), workers=args.workers, store_ctx=not args.no_ctx)
+    for key in ["preset", "mode", "model"]:
+        if getattr(args, key) is not None:
+            batch.defaults[key] = getattr(args, key)
+    summary = batch.run(args.input, output, args.name)
+    print("[BATCH] Finished: {} ok, {} errors, {} skipped. Results: {}".format(
+        summary["ok"], summary["error"], summary["skipped"], output))
+    return 1 if summary["error"] > 0 else 0
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.11 09:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from pygpt_net.controller.assistant import Assistant
@@ -69,6 +69,7 @@ class Controller:
         self.settings = Settings(window)
         self.theme = Theme(window)
         self.ui = UI(window)
+        self.deferred = False  # deferred setup finished
 
     def setup(self):
         """Setup controller"""
@@ -79,17 +80,14 @@ class Controller:
 
         # setup controllers
         self.lang.setup()
-        self.assistant.setup()
+        self.assistant.setup()  # before ctx, ctx selects its assistant
         self.chat.setup()
         self.ctx.setup()
         self.presets.setup()
-        self.idx.setup()
         self.ui.update_tokens()
         self.dialogs.setup()
         self.audio.setup()
         self.attachment.setup()
-        self.notepad.setup()
-        self.camera.setup_ui()
 
     def post_setup(self):
         """Post-setup, after plugins are loaded"""
@@ -97,8 +95,22 @@ class Controller:
         self.plugins.settings.setup()
         self.model.editor.setup()
         self.launcher.post_setup()
-        self.calendar.setup()  # after everything is loaded
-        self.drawing.setup()  # load previous image if exists
+
+    def setup_deferred(self):
+        """Setup subsystems not needed for first paint (called after window is shown)"""
+        if self.deferred:
+            return
+        self.deferred = True
+        items = [
+            ('indexes', self.idx.setup),
+            ('notepad', self.notepad.setup),
+            ('camera', self.camera.setup_ui),
+            ('calendar', self.calendar.setup),
+            ('drawing', self.drawing.setup),  # load previous image if exists
+        ]
+        for name, setup in items:
+            with self.window.profiler.phase('deferred.' + name):
+                setup()
 
     def on_update(self):
         """On app main loop update"""
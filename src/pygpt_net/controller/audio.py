@@ -6,9 +6,10 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 20:00:00                  #
 # ================================================== #
 
+from pygpt_net.core.audio.splitter import Splitter
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
 
@@ -21,6 +22,8 @@ class Audio:
         :param window: Window instance
         """
         self.window = window
+        self.splitter = None  # splits streamed output into sentences
+        self.streamed = None  # ctx spoken while streaming
 
     def setup(self):
         """Setup controller"""
@@ -134,3 +137,67 @@ class Audio:
             event = Event('audio.read_text')  # to all plugins (even if disabled)
         event.ctx = ctx
         self.window.core.dispatcher.dispatch(event, all)
+
+    def stream_begin(self, ctx: CtxItem):
+        """
+        Begin speaking of streamed output (sentence by sentence)
+
+        :param ctx: CtxItem
+        """
+        self.splitter = None
+        self.streamed = None
+        if self.window.core.config.get('audio.output.stream') and self.is_output_enabled():
+            self.splitter = Splitter()
+            self.streamed = ctx
+
+    def stream_chunk(self, ctx: CtxItem, text: str):
+        """
+        Speak sentences completed by streamed chunk
+
+        :param ctx: CtxItem
+        :param text: chunk of output
+        """
+        if self.splitter is None:
+            return
+        for sentence in self.splitter.append(text):
+            self.stream_sentence(ctx, sentence)
+
+    def stream_end(self, ctx: CtxItem, stopped: bool = False):
+        """
+        End speaking of streamed output
+
+        :param ctx: CtxItem
+        :param stopped: True if generation was stopped by user
+        """
+        if self.splitter is None:
+            return
+        if stopped:
+            self.splitter = None
+            self.stop_output()  # cancel queued sentences
+            return
+        self.stream_sentence(ctx, self.splitter.flush(), True)
+        self.splitter = None
+
+    def stream_sentence(self, ctx: CtxItem, text: str, end: bool = False):
+        """
+        Send sentence to audio output plugins
+
+        :param ctx: CtxItem
+        :param text: sentence
+        :param end: True if last sentence
+        """
+        text = self.window.core.audio.clean_text(text).strip()
+        if text == "" and not end:
+            return
+        event = Event('audio.output.stream', {"text": text, "end": end})
+        event.ctx = ctx
+        self.window.core.dispatcher.dispatch(event)
+
+    def is_streamed(self, ctx: CtxItem) -> bool:
+        """
+        Check if ctx output was already spoken while streaming
+
+        :param ctx: CtxItem
+        :return: True if spoken
+        """
+        return self.streamed is not None and self.streamed is ctx
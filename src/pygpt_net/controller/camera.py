@@ -6,12 +6,11 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 10:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import datetime
 import os
-import cv2
 from PySide6.QtCore import Slot
 
 from PySide6.QtGui import QImage, QPixmap, Qt
@@ -144,6 +143,7 @@ class Camera:
         if self.frame is None:
             return None
         if flip_colors:
+            import cv2  # imported on first use
             return cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB)
         else:
             return self.frame
@@ -168,6 +168,7 @@ class Camera:
             path = os.path.join(self.window.core.config.get_user_dir('capture'), name + '.jpg')
 
             # capture frame
+            import cv2  # imported on first use
             compression_params = [cv2.IMWRITE_JPEG_QUALITY, int(self.window.core.config.get('vision.capture.quality'))]
             frame = self.get_current_frame()
             self.window.controller.drawing.from_camera()  # capture to draw
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.14 09:00:00                  #
+# Updated Date: 2024.01.19 20:00:00                  #
 # ================================================== #
 
 from PySide6.QtWidgets import QApplication
@@ -39,7 +39,9 @@ class Output:
             self.append_stream(ctx, mode)
 
         # event: ctx.after
-        event = Event('ctx.after')
+        event = Event('ctx.after', {
+            "streamed": self.window.controller.audio.is_streamed(ctx),  # already spoken while streaming
+        })
         event.ctx = ctx
         self.window.core.dispatcher.dispatch(event)
 
@@ -65,6 +67,8 @@ class Output:
         output_tokens = 0
         begin = True
         sub_mode = None  # sub mode for langchain (chat, completion)
+        cmd_offset = 0  # position of commands parsing in output
+        speculative = self.window.core.config.get('cmd') and self.window.core.config.get('cmd.speculative')
 
         # get sub mode for langchain
         if mode == "langchain":
@@ -79,6 +83,7 @@ class Output:
 
         # chunks: stream begin
         self.window.controller.chat.render.stream_begin()
+        self.window.controller.audio.stream_begin(ctx)  # speak sentences while streaming
 
         # read stream
         try:
@@ -122,7 +127,14 @@ class Output:
                             continue
                         output += response
                         output_tokens += 1
+
+                        # execute completed commands while response is still streaming
+                        if speculative:
+                            cmds, cmd_offset = self.window.core.command.extract_cmds_partial(output, cmd_offset)
+                            for cmd in cmds:
+                                self.window.controller.command.speculate(ctx, cmd)
                         self.window.controller.chat.render.append_chunk(ctx, response, begin)
+                        self.window.controller.audio.stream_chunk(ctx, response)
                         self.window.controller.ui.update_tokens()  # update UI
                         QApplication.processEvents()  # process events to update UI after each chunk
                         begin = False
@@ -132,6 +144,7 @@ class Output:
 
         # chunks: stream end
         self.window.controller.chat.render.stream_end()
+        self.window.controller.audio.stream_end(ctx, self.window.controller.chat.input.stop)
 
         # log
         self.log("End of stream.")
@@ -169,6 +182,8 @@ class Output:
         :param ctx: CtxItem
         """
         cmds = self.window.core.command.extract_cmds(ctx.output)
+        if len(cmds) == 0:
+            self.window.controller.command.discard(ctx)  # speculative jobs (if response was changed)
         if len(cmds) > 0:
             ctx.cmds = cmds  # append to ctx
             if self.window.core.config.get('cmd'):
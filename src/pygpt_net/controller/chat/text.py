@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.07 02:00:00                  #
+# Updated Date: 2024.01.19 14:00:00                  #
 # ================================================== #
 
 from PySide6.QtWidgets import QApplication
@@ -237,6 +237,10 @@ class Text:
         if self.window.core.config.get('ctx.auto_summary'):
             self.window.controller.ctx.prepare_name(ctx)
 
+        # summarize items dropped from prompt (if context compaction enabled)
+        if self.window.core.config.get('ctx.compact'):
+            self.window.controller.ctx.summarizer.compact()
+
         return ctx
 
     def log(self, data: any):
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.06 22:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import json
@@ -15,6 +15,7 @@ from PySide6.QtCore import QObject, Signal
 
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.core.worker import Worker
+from pygpt_net.item.ctx import CtxItem
 
 
 class WorkerSignals(QObject):
@@ -30,6 +31,8 @@ class Command:
         """
         self.window = window
         self.stop = False
+        self.batches = {}  # id(ctx) => batch of scheduled jobs waiting for results
+        self.last_tag = 0  # last job tag, unique for all batches
 
     def dispatch(self, event: Event):
         """
@@ -37,8 +40,302 @@ class Command:
 
         :param event: event object
         """
+        if event.name == "cmd.execute" and event.ctx is not None:
+            self.schedule(event)
+            return
         self.dispatch_sync(event)
-        # self.dispatch_async(event)  # TODO: async execution
+
+    def get_executor(self, cmd: str) -> str or None:
+        """
+        Get ID of plugin which executes command and returns its result
+
+        :param cmd: command name
+        :return: plugin ID or None
+        """
+        for id in self.window.core.dispatcher.get_handlers("cmd.execute"):
+            if self.window.core.plugins.get(id).has_cmd(cmd):
+                return id
+
+    def get_jobs(self, commands: list) -> list:
+        """
+        Build jobs list from commands (in order of commands)
+
+        :param commands: commands list (from core.command.extract_cmds)
+        :return: list of jobs: idx, cmd, plugin ID (None if command has no result), tag
+        """
+        jobs = []
+        for idx, item in enumerate(commands):
+            jobs.append({
+                "idx": idx,
+                "cmd": item,
+                "plugin": self.get_executor(item["cmd"]),
+                "tag": None,
+            })
+        return jobs
+
+    def get_groups(self, jobs: list) -> list:
+        """
+        Group jobs into chains executed concurrently
+
+        Commands of one plugin are executed in order in one chain, independent commands (without side effects)
+        get their own chain only if the plugin has no other commands in the list.
+
+        :param jobs: jobs list
+        :return: list of (plugin ID, jobs)
+        """
+        groups = []
+        chains = {}  # plugin ID => serial chain
+        serial = set()  # plugins with commands which must be executed in order
+        for job in jobs:
+            id = job["plugin"]
+            if id is not None and not self.window.core.plugins.get(id).is_cmd_independent(job["cmd"]["cmd"]):
+                serial.add(id)
+        for job in jobs:
+            id = job["plugin"]
+            if id is None:
+                continue
+            if id not in serial:
+                groups.append((id, [job]))
+                continue
+            if id not in chains:
+                chains[id] = []
+                groups.append((id, chains[id]))
+            chains[id].append(job)
+        return groups
+
+    def next_tag(self) -> int:
+        """
+        Get new job tag (plugins return it in result request, see BasePlugin.prepare_request)
+
+        :return: job tag
+        """
+        self.last_tag += 1
+        return self.last_tag
+
+    def get_tag(self, result: any) -> int or None:
+        """
+        Get job tag from command result
+
+        :param result: command result
+        :return: job tag or None if not tagged
+        """
+        if isinstance(result, dict) and isinstance(result.get("request"), dict):
+            return result["request"].get("job")
+
+    def schedule(self, event: Event):
+        """
+        Execute commands concurrently and reply once with all results (in commands order)
+
+        :param event: event object
+        """
+        ctx = event.ctx
+        jobs = self.get_jobs(event.data['commands'])
+        rest = [job["cmd"] for job in jobs if job["plugin"] is None]
+        batch = self.batches.get(id(ctx))
+        if batch is not None and batch.get("discarded"):
+            batch = None
+        if len(rest) == len(jobs) and batch is None:
+            self.dispatch_sync(event)  # no results expected
+            return
+        if ctx.internal and rest and batch is None:
+            # commands without results may reply by themselves (e.g. image generation in internal mode),
+            # so batch can't own the reply: execute all commands synchronously as before
+            self.dispatch_sync(event)
+            return
+
+        if batch is None:
+            batch = self.create_batch(ctx)
+        batch["open"] = False
+        batch["jobs"] = [job for job in jobs if job["plugin"] is not None]
+
+        # skip jobs already started while streaming
+        started = list(batch["started"])
+        pending = []
+        for job in batch["jobs"]:
+            item = next((item for item in started if item["cmd"] == job["cmd"]), None)
+            if item is not None:
+                started.remove(item)
+                job["tag"] = item["tag"]
+            else:
+                job["tag"] = self.next_tag()
+                pending.append(job)
+
+        for plugin_id, group in self.get_groups(pending):
+            plugin = self.window.core.plugins.get(plugin_id)
+            if self.is_running(batch, plugin_id) \
+                    and any(not plugin.is_cmd_independent(job["cmd"]["cmd"]) for job in group):
+                batch["deferred"].append((plugin_id, group))  # wait for commands started while streaming
+                continue
+            self.dispatch_group(batch, plugin_id, group)
+
+        # commands without results (e.g. image generation, goal update)
+        if rest:
+            other = Event('cmd.execute', {
+                'commands': rest,
+            })
+            other.ctx = ctx
+            for plugin_id in self.window.core.dispatcher.get_handlers(other.name):
+                if other.stop:
+                    break
+                self.window.core.dispatcher.apply(plugin_id, other, is_async=False)
+
+        if not self.collect(ctx):
+            self.window.core.dispatcher.reply(ctx)  # all results are already collected (sync)
+
+    def dispatch_group(self, batch: dict, plugin_id: str, jobs: list):
+        """
+        Dispatch chain of jobs to plugin (plugins execute commands in workers, results are collected in batch)
+
+        :param batch: batch
+        :param plugin_id: plugin ID
+        :param jobs: jobs chain
+        """
+        if self.is_stop():
+            # not executed, results of already started jobs are sent without them
+            batch["jobs"] = [job for job in batch["jobs"] if job not in jobs]
+            batch["stopped"] = True
+            return
+        batch["tags"].update(job["tag"] for job in jobs)
+        event = Event('cmd.execute', {
+            'commands': [dict(job["cmd"], job=job["tag"]) for job in jobs],
+        })
+        event.ctx = batch["ctx"]
+        self.window.core.dispatcher.apply(plugin_id, event, is_async=True)
+
+    def is_running(self, batch: dict, plugin_id: str) -> bool:
+        """
+        Check if command of plugin started while streaming is still running
+
+        :param batch: batch
+        :param plugin_id: plugin ID
+        :return: True if running
+        """
+        return any(item["plugin"] == plugin_id and item["tag"] not in batch["results"]
+                   for item in batch["started"])
+
+    def create_batch(self, ctx: CtxItem) -> dict:
+        """
+        Create batch of jobs for context
+
+        :param ctx: context object
+        :return: batch
+        """
+        batch = {
+            "ctx": ctx,
+            "jobs": [],
+            "offset": len(ctx.results),
+            "tags": set(),  # tags of all dispatched jobs
+            "results": {},  # job tag => result
+            "started": [],  # commands started while streaming
+            "deferred": [],  # chains waiting for commands started while streaming
+            "open": True,  # more jobs may be added
+        }
+        self.batches[id(ctx)] = batch
+        return batch
+
+    def speculate(self, ctx: CtxItem, cmd: dict):
+        """
+        Start independent command before response is complete (while streaming)
+
+        Result is collected in batch and sent with results of other commands when response ends.
+
+        :param ctx: context object
+        :param cmd: command
+        """
+        if not isinstance(cmd, dict) or "cmd" not in cmd or ctx.internal:
+            return  # internal commands are executed after response (may be executed synchronously)
+        plugin_id = self.get_executor(cmd["cmd"])
+        if plugin_id is None or not self.window.core.plugins.get(plugin_id).is_cmd_independent(cmd["cmd"]):
+            return
+        batch = self.batches.get(id(ctx))
+        if batch is None:
+            batch = self.create_batch(ctx)
+        if not batch["open"]:
+            return
+        tag = self.next_tag()
+        batch["started"].append({
+            "cmd": cmd,
+            "plugin": plugin_id,
+            "tag": tag,
+        })
+        batch["tags"].add(tag)
+        event = Event('cmd.execute', {
+            'commands': [dict(cmd, job=tag)],
+        })
+        event.ctx = ctx
+        self.window.core.dispatcher.apply(plugin_id, event, is_async=True)
+
+    def discard(self, ctx: CtxItem):
+        """
+        Discard batch of jobs started while streaming (their results will not be sent)
+
+        :param ctx: context object
+        """
+        batch = self.batches.get(id(ctx))
+        if batch is not None and batch["open"]:
+            batch["jobs"] = []
+            batch["open"] = False
+            batch["discarded"] = True
+            self.collect(ctx)  # remove batch if all results are already received
+
+    def match(self, batch: dict):
+        """
+        Match new results in context with jobs of batch
+
+        :param batch: batch
+        """
+        results = batch["results"]
+        for result in batch["ctx"].results[batch["offset"]:]:
+            if any(result is item for item in results.values()):
+                continue
+            tag = self.get_tag(result)
+            if tag is None and isinstance(result, dict) and isinstance(result.get("request"), dict):
+                # result of plugin not returning job tag, match by command name
+                name = result["request"].get("cmd")
+                tag = next((job["tag"] for job in batch["jobs"]
+                            if job["tag"] not in results and job["cmd"]["cmd"] == name), None)
+            if tag in batch["tags"] and tag not in results:
+                results[tag] = result
+
+    def collect(self, ctx: CtxItem) -> bool:
+        """
+        Collect results of scheduled jobs
+
+        :param ctx: context object
+        :return: True if batch is still waiting for results
+        """
+        batch = self.batches.get(id(ctx))
+        if batch is None:
+            return False
+        self.match(batch)
+        if batch["open"]:
+            return True  # response is still streaming
+
+        # dispatch chains waiting for commands started while streaming
+        for plugin_id, group in list(batch["deferred"]):
+            if not self.is_running(batch, plugin_id):
+                batch["deferred"].remove((plugin_id, group))
+                self.dispatch_group(batch, plugin_id, group)
+                self.match(batch)
+        if batch["deferred"] or any(tag not in batch["results"] for tag in batch["tags"]):
+            return True
+
+        # all results collected, restore commands order (results of not sent commands are dropped)
+        del self.batches[id(ctx)]
+        if batch.get("stopped"):
+            self.stop = False  # unlock needed here
+        ordered = [batch["results"][job["tag"]] for job in batch["jobs"] if job["tag"] in batch["results"]]
+        extra = [result for result in ctx.results[batch["offset"]:]
+                 if not any(result is item for item in batch["results"].values())]
+        ctx.results[batch["offset"]:] = ordered + extra
+        for result in ordered + extra:
+            if self.get_tag(result) is not None:
+                result["request"].pop("job")
+        if batch.get("discarded"):
+            return True  # nothing to reply, response has no commands
+        if ordered or extra:
+            ctx.reply = True
+        return False
 
     def dispatch_sync(self, event: Event):
         """
@@ -46,13 +343,12 @@ class Command:
 
         :param event: event object
         """
-        for id in self.window.core.plugins.get_ids():
-            if self.window.controller.plugins.is_enabled(id):
-                if event.stop or (event.name == "cmd.execute" and self.is_stop()):
-                    if self.is_stop():
-                        self.stop = False  # unlock needed here
-                    break
-                self.window.core.dispatcher.apply(id, event, is_async=False)
+        for id in self.window.core.dispatcher.get_handlers(event.name):
+            if event.stop or (event.name == "cmd.execute" and self.is_stop()):
+                if self.is_stop():
+                    self.stop = False  # unlock needed here
+                break
+            self.window.core.dispatcher.apply(id, event, is_async=False)
 
         # WARNING: do not emit finished signal here if event is internal (otherwise it will be emitted twice)
         # it is handled already in internal event, in synchronous way
@@ -83,13 +379,12 @@ class Command:
         :param window: Window instance
         :param finished_signal: WorkerSignals: finished signal
         """
-        for id in window.core.plugins.get_ids():
-            if window.controller.plugins.is_enabled(id):
-                if event.stop or (event.name == "cmd.execute" and self.is_stop()):
-                    if self.is_stop():
-                        self.stop = False  # unlock needed here
-                    break
-                window.core.dispatcher.apply(id, event, is_async=True)
+        for id in window.core.dispatcher.get_handlers(event.name):
+            if event.stop or (event.name == "cmd.execute" and self.is_stop()):
+                if self.is_stop():
+                    self.stop = False  # unlock needed here
+                break
+            window.core.dispatcher.apply(id, event, is_async=True)
         finished_signal.emit(event)
 
     def is_stop(self):
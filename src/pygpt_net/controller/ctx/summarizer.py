@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.02 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from PySide6.QtCore import QObject, Signal, Slot
@@ -18,6 +18,10 @@ class WorkerSignals(QObject):
     updated = Signal(int, object, str)
 
 
+class CompactSignals(QObject):
+    compacted = Signal(int, str, int)
+
+
 class Summarizer:
     def __init__(self, window=None):
         """
@@ -26,6 +30,7 @@ class Summarizer:
         :param window: Window instance
         """
         self.window = window
+        self.compacting = set()  # ctx IDs with summary in progress
 
     def summarize(self, id: int, ctx: CtxItem):
         """
@@ -79,3 +84,73 @@ class Summarizer:
             refresh = False
         self.window.controller.ctx.update_name(id, title, refresh=refresh)
 
+    def compact(self):
+        """Update rolling summary of items dropped from prompt (in background)"""
+        id = self.window.core.ctx.current
+        if not self.window.core.ctx.is_compact() or id is None or id in self.compacting:
+            return
+        model = self.window.core.config.get('model')
+        model_id = self.window.core.models.get_id(model)
+        mode = self.window.core.config.get('mode')
+        used_tokens = self.window.core.tokens.from_user(self.window.core.config.get('prompt'), "")
+        max_tokens = self.window.core.config.get('max_total_tokens')
+        model_ctx = self.window.core.models.get_num_ctx(model_id)
+        if max_tokens > model_ctx:
+            max_tokens = model_ctx
+        start, end = self.window.core.ctx.get_compact_range(model_id, mode, used_tokens, max_tokens)
+        if end <= start:
+            return  # nothing new dropped from prompt
+        summary, _ = self.window.core.ctx.get_summary(id)
+        self.compacting.add(id)
+        self.start_compact_worker(id, list(self.window.core.ctx.items[start:end]), summary, start)
+
+    def compactor(self, id: int, items: list, summary: str, start: int, window, compacted_signal: Signal):
+        """
+        Compact worker callback
+
+        :param id: CtxMeta ID
+        :param items: items to add to summary
+        :param summary: current summary
+        :param start: number of summarized items before update
+        :param window: Window instance
+        :param compacted_signal: CompactSignals: compacted signal
+        """
+        try:
+            summary, num = window.core.gpt.summarizer.summary_history(items, summary)
+        except Exception as e:
+            window.core.debug.log(e)
+            summary, num = None, 0
+        compacted_signal.emit(id, summary or "", start + num)
+
+    def start_compact_worker(self, id: int, items: list, summary: str, start: int):
+        """
+        Handle compact worker thread
+
+        :param id: CtxMeta ID
+        :param items: items to add to summary
+        :param summary: current summary
+        :param start: number of summarized items before update
+        """
+        worker = Worker(self.compactor)
+        worker.signals = CompactSignals()
+        worker.signals.compacted.connect(self.handle_compacted)
+        worker.kwargs['id'] = id
+        worker.kwargs['items'] = items
+        worker.kwargs['summary'] = summary
+        worker.kwargs['start'] = start
+        worker.kwargs['window'] = self.window
+        worker.kwargs['compacted_signal'] = worker.signals.compacted
+        self.window.threadpool.start(worker)
+
+    @Slot(int, str, int)
+    def handle_compacted(self, id: int, summary: str, count: int):
+        """
+        Handle compacted signal (store summary in ctx meta)
+
+        :param id: CtxMeta ID
+        :param summary: updated summary, empty on error
+        :param count: number of summarized items
+        """
+        self.compacting.discard(id)
+        if summary:
+            self.window.core.ctx.set_summary(id, summary, count)
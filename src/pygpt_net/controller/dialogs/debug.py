@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.18 12:00:00                  #
 # ================================================== #
 
 from PySide6.QtCore import Qt
@@ -17,6 +17,7 @@ from pygpt_net.core.debug.assistants import AssistantsDebug
 from pygpt_net.core.debug.attachments import AttachmentsDebug
 from pygpt_net.core.debug.config import ConfigDebug
 from pygpt_net.core.debug.context import ContextDebug
+from pygpt_net.core.debug.events import EventsDebug
 from pygpt_net.core.debug.indexes import IndexesDebug
 from pygpt_net.core.debug.models import ModelsDebug
 from pygpt_net.core.debug.plugins import PluginsDebug
@@ -41,6 +42,7 @@ class Debug:
         self.workers['attachments'] = AttachmentsDebug(self.window)
         self.workers['config'] = ConfigDebug(self.window)
         self.workers['context'] = ContextDebug(self.window)
+        self.workers['events'] = EventsDebug(self.window)
         self.workers['indexes'] = IndexesDebug(self.window)
         self.workers['models'] = ModelsDebug(self.window)
         self.workers['plugins'] = PluginsDebug(self.window)
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 21:00:00                  #
+# Updated Date: 2024.01.17 20:00:00                  #
 # ================================================== #
 
 import datetime
@@ -15,6 +15,7 @@ from pygpt_net.item.ctx import CtxItem
 from pygpt_net.utils import trans
 from .indexer import Indexer
 from .settings import Settings
+from .watcher import Watcher
 
 
 class Idx:
@@ -27,6 +28,7 @@ class Idx:
         self.window = window
         self.settings = Settings(window)
         self.indexer = Indexer(window)
+        self.watcher = Watcher(window)
         self.current_idx = "base"
 
     def setup(self):
@@ -36,6 +38,7 @@ class Idx:
         self.window.core.idx.load()
         self.indexer.update_explorer()
         self.update()
+        self.watcher.update()
 
     def select(self, idx: int):
         """
@@ -150,13 +153,14 @@ class Idx:
                 idx = self.window.core.config.get('llama.idx.auto.index')
             self.indexer.index_ctx_current(idx, force=True, silent=True)
 
-    def after_index(self, idx: str = None):
+    def after_index(self, idx: str = None, file_ids: list = None):
         """
         Called after index (update things, etc...)
 
         :param idx: index name
+        :param file_ids: indexed file ids, None to update all
         """
-        self.indexer.update_explorer()  # update file explorer view
+        self.indexer.update_explorer(file_ids)  # update file explorer view
 
         # update last indexing timestamp label
         last_str = '---'
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.16 06:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import datetime
@@ -27,9 +27,17 @@ class Indexer:
         """
         self.window = window
         self.tmp_idx = None
+        self.workers = []  # running workers
 
-    def update_explorer(self):
-        """Update file explorer view"""
+    def update_explorer(self, file_ids: list = None):
+        """
+        Update file explorer view
+
+        :param file_ids: changed file ids, None to update all
+        """
+        if file_ids is not None:
+            self.window.ui.nodes['output_files'].model.update_files(file_ids)
+            return
         all_idx_data = self.window.core.idx.get_idx_data()  # get all files data, from all indexes
         self.window.ui.nodes['output_files'].model.update_idx_status(all_idx_data)
 
@@ -48,6 +56,91 @@ class Indexer:
         self.window.core.config.set('llama.idx.status', idx_data)
         self.window.core.config.save()
 
+    def start(self, worker):
+        """
+        Start indexing worker
+
+        :param worker: IndexWorker instance
+        """
+        worker.signals.progress.connect(self.handle_progress)
+        worker.signals.finished.connect(lambda *args: self.release(worker))
+        worker.signals.error.connect(lambda *args: self.release(worker))
+        self.workers.append(worker)
+        self.window.threadpool.start(worker)
+
+    def release(self, worker):
+        """
+        Remove finished worker from running workers
+
+        :param worker: IndexWorker instance
+        """
+        if worker in self.workers:
+            self.workers.remove(worker)
+
+    def is_running(self) -> bool:
+        """
+        Check if any indexing job is running
+
+        :return: True if running
+        """
+        return len(self.workers) > 0
+
+    def is_running_idx(self, idx: str) -> bool:
+        """
+        Check if indexing job for index is running
+
+        :param idx: index name
+        :return: True if running
+        """
+        for worker in self.workers:
+            if worker.idx == idx:
+                return True
+        return False
+
+    def is_stopped(self, idx: str) -> bool:
+        """
+        Check if running job for index was cancelled
+
+        :param idx: index name
+        :return: True if cancelled
+        """
+        for worker in self.workers:
+            if worker.idx == idx and worker.stopped:
+                return True
+        return False
+
+    def stop(self, idx: str = None):
+        """
+        Cancel running indexing jobs (cooperative, data indexed so far is stored)
+
+        :param idx: index name, None for all
+        """
+        for worker in self.workers:
+            if idx is None or worker.idx == idx:
+                worker.stopped = True
+        if self.is_running():
+            self.window.update_status(trans('idx.status.stopping'))
+
+    def stop_by_idx(self, idx: int):
+        """
+        Cancel indexing jobs by list idx
+
+        :param idx: on list idx
+        """
+        idx_name = self.window.core.idx.get_by_idx(idx)
+        self.stop(idx_name)
+
+    def on_close(self, timeout: int = 10000):
+        """
+        Cancel running jobs and wait for checkpoint on app close
+
+        :param timeout: max wait time in ms
+        """
+        if not self.is_running():
+            return
+        self.stop()
+        self.window.threadpool.waitForDone(timeout)
+
     def index_ctx_meta_confirm(self, ctx_idx):
         """
         Index context meta (confirm)
@@ -83,7 +176,7 @@ class Indexer:
         worker.type = "db_meta"
         worker.signals.finished.connect(self.handle_finished_db_meta)
         worker.signals.error.connect(self.handle_error)
-        self.window.threadpool.start(worker)
+        self.start(worker)
 
     def index_ctx_current(self, idx, force: bool = False, silent: bool = False):
         """
@@ -135,7 +228,7 @@ class Indexer:
         worker.silent = silent
         worker.signals.finished.connect(self.handle_finished_db_current)
         worker.signals.error.connect(self.handle_error)
-        self.window.threadpool.start(worker)
+        self.start(worker)
 
     def index_path(self, path: str, idx: str = "base"):
         """
@@ -152,7 +245,25 @@ class Indexer:
         worker.type = "file"
         worker.signals.finished.connect(self.handle_finished_file)
         worker.signals.error.connect(self.handle_error)
-        self.window.threadpool.start(worker)
+        self.start(worker)
+
+    def index_changes(self, idx: str, modified: list, deleted: list):
+        """
+        Update index with changed files in background (watch mode, threaded)
+
+        :param idx: index name
+        :param modified: created or modified files
+        :param deleted: deleted files
+        """
+        worker = IndexWorker()
+        worker.window = self.window
+        worker.content = {"modified": modified, "deleted": deleted}
+        worker.idx = idx
+        worker.type = "watch"
+        worker.silent = True
+        worker.signals.finished.connect(self.handle_finished_watch)
+        worker.signals.error.connect(self.handle_error_silent)
+        self.start(worker)
 
     def index_all_files(self, idx: str, force: bool = False):
         """
@@ -226,9 +337,9 @@ class Indexer:
         try:
             result = self.window.core.idx.remove_index(idx)
             if result:
-                self.window.core.idx.clear(idx)
+                file_ids = self.window.core.idx.clear(idx)
                 self.window.update_status(trans('idx.status.truncate.success'))
-                self.update_explorer()  # update file explorer view
+                self.update_explorer(file_ids)  # update file explorer view
 
                 # reset DB update time if db index was cleared
                 if self.window.core.config.has('llama.idx.db.index'):
@@ -252,6 +363,39 @@ class Indexer:
         self.window.update_status(str(e))
         print(e)
 
+    @Slot(object)
+    def handle_error_silent(self, e: any):
+        """
+        Handle thread error signal (background jobs, no alert)
+
+        :param e: error message
+        """
+        self.window.update_status(str(e))
+        self.window.core.debug.log(e)
+        print(e)
+
+    @Slot(str, object)
+    def handle_progress(self, idx: str, data: dict):
+        """
+        Handle indexing progress signal
+
+        :param idx: index name
+        :param data: progress data
+        """
+        msg = trans('idx.status.progress').format(
+            idx=idx,
+            docs=data['docs'],
+            docs_per_sec=round(data['docs_per_sec'], 2),
+            tokens_per_sec=round(data['tokens_per_sec'], 2),
+        )
+        if 'files_total' in data:
+            msg += " | " + trans('idx.status.progress.files').format(
+                done=data['files_done'],
+                total=data['files_total'],
+                file=os.path.basename(data['file']),
+            )
+        self.window.update_status(msg)
+
     @Slot(str, object, object)
     def handle_finished_db_current(self, idx: str, num: int, errors: list, silent: bool = False):
         """
@@ -262,13 +406,14 @@ class Indexer:
         :param errors: errors
         :param silent: silent mode (no msg and status update)
         """
-        if num > 0:
-            msg = trans('idx.status.success') + f" {num}"
-
-            # store last DB update timestamp
+        # store last DB update timestamp (not on cancel, job is resumed from checkpoint next time)
+        if not self.is_stopped(idx) and len(errors) == 0:
             self.window.core.config.set('llama.idx.db.index', idx)
             self.window.core.config.set('llama.idx.db.last', int(datetime.datetime.now().timestamp()))
             self.window.core.config.save()
+
+        if num > 0:
+            msg = trans('idx.status.success') + f" {num}"
             self.update_idx_status(idx)
             self.window.controller.idx.after_index(idx)  # post-actions (update UI, etc.)
             if not silent:
@@ -316,9 +461,9 @@ class Indexer:
         num = len(files)
         if num > 0:
             msg = trans('idx.status.success') + f" {num}"
-            self.window.core.idx.append(idx, files)  # append files list to index
+            file_ids = self.window.core.idx.append(idx, files)  # append files list to index
             self.update_idx_status(idx)
-            self.window.controller.idx.after_index(idx)  # post-actions (update UI, etc.)
+            self.window.controller.idx.after_index(idx, file_ids)  # post-actions (update UI, etc.)
             if not silent:
                 self.window.update_status(msg)
                 self.window.ui.dialogs.alert(msg)
@@ -328,9 +473,36 @@ class Indexer:
         if len(errors) > 0:
             self.window.ui.dialogs.alert("\n".join(errors))
 
+    @Slot(str, object, object, bool)
+    def handle_finished_watch(self, idx: str, result: dict, errors: list, silent: bool = False):
+        """
+        Handle watch mode indexing finished signal
+
+        :param idx: index name
+        :param result: indexed and removed files
+        :param errors: errors
+        :param silent: silent mode (no msg and status update)
+        """
+        file_ids = []
+        if len(result['files']) > 0:
+            file_ids += self.window.core.idx.append(idx, result['files'])  # append files list to index
+        if len(result['removed']) > 0:
+            file_ids += self.window.core.idx.remove(idx, result['removed'])  # remove deleted files
+        if len(file_ids) > 0:
+            self.update_idx_status(idx)
+            self.window.controller.idx.after_index(idx, file_ids)  # post-actions (update UI, etc.)
+            self.window.update_status(trans('idx.status.watch').format(
+                idx=idx,
+                indexed=len(result['files']),
+                removed=len(result['removed']),
+            ))
+        if len(errors) > 0:
+            self.window.update_status("\n".join(errors))
+
 
 class IndexWorkerSignals(QObject):
     finished = Signal(str, object, object, bool)  # idx, result, errors, silent mode
+    progress = Signal(str, object)  # idx, progress data
     error = Signal(object)
 
 
@@ -343,6 +515,7 @@ class IndexWorker(QRunnable):
         self.idx = None
         self.type = None
         self.silent = False
+        self.stopped = False  # cancel flag, checked between documents
 
     @Slot()
     def run(self):
@@ -359,13 +532,39 @@ class IndexWorker(QRunnable):
                 print("[LLAMA-INDEX] Idx: {}, type: {}, content: {}".format(self.idx, self.type, self.content))
             # execute indexing
             if self.type == "file":
-                result, errors = self.window.core.idx.index_files(self.idx, self.content)
+                result, errors = self.window.core.idx.index_files(
+                    self.idx, self.content, self.progress, self.is_stopped)
+            elif self.type == "watch":
+                files, removed, errors = self.window.core.idx.sync_files(
+                    self.idx, self.content['modified'], self.content['deleted'], self.progress, self.is_stopped)
+                result = {"files": files, "removed": removed}
             elif self.type == "db_meta":
-                result, errors = self.window.core.idx.index_db_by_meta_id(self.idx, self.content)
+                result, errors = self.window.core.idx.index_db_by_meta_id(
+                    self.idx, self.content, self.progress, self.is_stopped)
             elif self.type == "db_current":
-                result, errors = self.window.core.idx.index_db_from_updated_ts(self.idx, self.content)
+                result, errors = self.window.core.idx.index_db_from_updated_ts(
+                    self.idx, self.content, self.progress, self.is_stopped)
             if is_log:
-                print("[LLAMA-INDEX] Finished indexing.")
+                if self.stopped:
+                    print("[LLAMA-INDEX] Indexing stopped.")
+                else:
+                    print("[LLAMA-INDEX] Finished indexing.")
             self.signals.finished.emit(self.idx, result, errors, self.silent)
         except Exception as e:
             self.signals.error.emit(e)
+
+    def progress(self, data: dict):
+        """
+        Emit progress
+
+        :param data: progress data
+        """
+        self.signals.progress.emit(self.idx, data)
+
+    def is_stopped(self) -> bool:
+        """
+        Check if job was cancelled
+
+        :return: True if cancelled
+        """
+        return self.stopped
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import os
+import threading
+import time
+
+from PySide6.QtCore import QFileSystemWatcher, QTimer, QObject, Signal
+
+from pygpt_net.core.worker import Worker
+
+
+class ScanSignals(QObject):
+    finished = Signal(object, object)
+
+
+class Watcher:
+    DEFAULT_DELAY = 2000  # ms
+    SKIP_DIRS = ["__pycache__", "node_modules"]
+    SKIP_EXT = ["~", ".tmp", ".temp", ".swp", ".swx", ".part", ".crdownload", ".pyc", ".lock"]
+    KEEP_PAUSES = 60  # seconds to keep finished pauses (late change notifications)
+
+    def __init__(self, window=None):
+        """
+        Data directory watcher (live indexing of changed files)
+
+        :param window: Window instance
+        """
+        self.window = window
+        self.watcher = None
+        self.timer = None
+        self.root = None
+        self.ready = False  # initial scan finished
+        self.mtimes = {}  # snapshot: file path => mtime
+        self.dirs = {}  # snapshot: dir path => mtime
+        self.pending = set()  # changed dirs waiting for debounce
+        self.lock = threading.Lock()
+        self.paused = 0  # number of running app jobs writing to data dir
+        self.pauses = []  # time ranges of app writes: [start, end or None]
+    def is_enabled(self) -> bool:
+        """
+        Check if watch mode is enabled in config
+
+        :return: True if enabled
+        """
+        return self.window.core.config.has('llama.idx.watch') and self.window.core.config.get('llama.idx.watch')
+
+    def is_running(self) -> bool:
+        """
+        Check if watcher is running
+
+        :return: True if running
+        """
+        return self.watcher is not None
+
+    def get_idx(self) -> str:
+        """
+        Get index name for watch mode
+
+        :return: index name
+        """
+        idx = "base"
+        if self.window.core.config.has('llama.idx.watch.index'):
+            idx = self.window.core.config.get('llama.idx.watch.index')
+        return idx
+
+    def get_delay(self) -> int:
+        """
+        Get debounce delay
+
+        :return: delay in ms
+        """
+        delay = self.DEFAULT_DELAY
+        if self.window.core.config.has('llama.idx.watch.delay'):
+            delay = int(self.window.core.config.get('llama.idx.watch.delay'))
+        return delay
+
+    def update(self):
+        """Start or stop watcher according to config"""
+        if self.is_enabled() and not self.is_running():
+            self.start()
+        elif not self.is_enabled() and self.is_running():
+            self.stop()
+
+    def start(self):
+        """Start watching data directory (initial scan is done in background)"""
+        self.root = os.path.normpath(self.window.core.config.get_user_dir('data'))
+        self.ready = False
+        self.mtimes = {}
+        self.dirs = {}
+        self.pending = set()
+        self.watcher = QFileSystemWatcher()
+        self.watcher.directoryChanged.connect(self.on_change)
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        self.start_scan_worker(self.root)
+
+    def stop(self):
+        """Stop watching data directory"""
+        if self.timer is not None:
+            self.timer.stop()
+        if self.watcher is not None:
+            self.watcher.deleteLater()
+        self.watcher = None
+        self.timer = None
+        self.ready = False
+        self.mtimes = {}
+        self.dirs = {}
+        self.pending = set()
+
+    def scanner(self, root: str, finished_signal: Signal):
+        """
+        Scan worker callback
+
+        :param root: directory path
+        :param finished_signal: ScanSignals: finished signal
+        """
+        files, dirs = self.scan(root)
+        finished_signal.emit(files, dirs)
+
+    def start_scan_worker(self, root: str):
+        """
+        Start initial scan in background
+
+        :param root: directory path
+        """
+        worker = Worker(self.scanner)
+        worker.signals = ScanSignals()
+        worker.signals.finished.connect(self.handle_scanned)
+        worker.kwargs['root'] = root
+        worker.kwargs['finished_signal'] = worker.signals.finished
+        self.window.threadpool.start(worker)
+
+    def handle_scanned(self, files: dict, dirs: dict):
+        """
+        Handle initial scan finished (start watching directories)
+
+        :param files: dict: file path => mtime
+        :param dirs: dict: dir path => mtime
+        """
+        if self.watcher is None:
+            return  # stopped during scan
+        self.mtimes = files
+        self.dirs = dirs
+        self.ready = True
+        self.watch(list(dirs.keys()))
+        if self.pending:
+            self.timer.start(self.get_delay())
+
+    def watch(self, dirs: list):
+        """
+        Add directories to watcher (files are not watched, changed dir is rescanned)
+
+        :param dirs: list of directories
+        """
+        items = sorted(set(dirs) - set(self.watcher.directories()))
+        if items:
+            self.watcher.addPaths(items)
+
+    def is_skipped(self, name: str) -> bool:
+        """
+        Check if file or directory is skipped (hidden, temporary or generated files)
+
+        :param name: file or directory name
+        :return: True if skipped
+        """
+        if name.startswith('.') or name in self.SKIP_DIRS:
+            return True
+        return name.lower().endswith(tuple(self.SKIP_EXT))
+
+    def scan_dir(self, path: str) -> tuple:
+        """
+        Scan directory entries (not recursive)
+
+        :param path: directory path
+        :return: dict: file path => mtime, list of subdirectories
+        """
+        files = {}
+        subdirs = []
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return files, subdirs  # removed
+        for entry in entries:
+            if self.is_skipped(entry.name):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    files[entry.path] = entry.stat().st_mtime
+            except OSError:
+                continue  # removed during scan
+        return files, subdirs
+
+    def scan(self, path: str) -> tuple:
+        """
+        Scan directory recursively
+
+        :param path: directory path
+        :return: dict: file path => mtime, dict: dir path => mtime
+        """
+        files = {}
+        dirs = {}
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            try:
+                dirs[current] = os.stat(current).st_mtime
+            except OSError:
+                continue
+            found, subdirs = self.scan_dir(current)
+            files.update(found)
+            stack.extend(subdirs)
+        return files, dirs
+
+    def on_change(self, path: str):
+        """
+        Handle directory change (debounced)
+
+        :param path: changed directory path
+        """
+        self.pending.add(os.path.normpath(path))
+        self.timer.start(self.get_delay())  # restart debounce timer
+
+    def pause(self):
+        """Start app job writing to data dir (can be called from any thread)"""
+        with self.lock:
+            if self.paused == 0:
+                self.pauses.append([time.time(), None])
+            self.paused += 1
+
+    def resume(self):
+        """Finish app job writing to data dir, its files are not indexed (can be called from any thread)"""
+        with self.lock:
+            self.paused = max(0, self.paused - 1)
+            if self.paused == 0 and self.pauses:
+                self.pauses[-1][1] = time.time()
+
+    def is_generated(self, mtime: float) -> bool:
+        """
+        Check if file was modified by app job
+
+        :param mtime: file mtime
+        :return: True if modified while app job was running
+        """
+        with self.lock:
+            for start, end in self.pauses:
+                if start - 1 <= mtime and (end is None or mtime <= end + 1):
+                    return True
+        return False
+
+    def remove_dir(self, path: str) -> list:
+        """
+        Remove directory with nested items from snapshot
+
+        :param path: directory path
+        :return: list of removed files
+        """
+        prefix = path + os.sep
+        deleted = [p for p in self.mtimes if p.startswith(prefix)]
+        for p in deleted:
+            del self.mtimes[p]
+        for p in [p for p in self.dirs if p == path or p.startswith(prefix)]:
+            del self.dirs[p]
+        return deleted
+
+    def get_changes(self, paths: set) -> tuple:
+        """
+        Rescan changed directories, compare with snapshot and update snapshot
+
+        :param paths: changed directories
+        :return: list of created or modified files, list of deleted files, list of new directories
+        """
+        modified = []
+        deleted = []
+        new_dirs = []
+        for path in sorted(paths):
+            if path not in self.dirs:
+                continue  # removed with parent or skipped
+            if not os.path.isdir(path):
+                deleted.extend(self.remove_dir(path))
+                continue
+            self.dirs[path] = os.stat(path).st_mtime
+            found, subdirs = self.scan_dir(path)
+            for p in [p for p in self.mtimes if os.path.dirname(p) == path and p not in found]:
+                deleted.append(p)
+                del self.mtimes[p]
+            for p in [p for p in self.dirs if os.path.dirname(p) == path and p not in subdirs]:
+                deleted.extend(self.remove_dir(p))
+            for subdir in subdirs:
+                if subdir not in self.dirs:
+                    files, dirs = self.scan(subdir)  # new directory, scan all nested items
+                    self.dirs.update(dirs)
+                    new_dirs.extend(dirs.keys())
+                    found.update(files)
+            for p, mtime in found.items():
+                if self.mtimes.get(p) != mtime:
+                    self.mtimes[p] = mtime
+                    if not self.is_generated(mtime):
+                        modified.append(p)
+        return modified, deleted, new_dirs
+
+    def flush(self):
+        """Send changes to background indexing queue"""
+        if self.watcher is None or not self.pending:
+            return
+        idx = self.get_idx()
+        if not self.ready or self.paused > 0 or self.window.controller.idx.indexer.is_running_idx(idx):
+            self.timer.start(self.get_delay())  # wait for scan, app job or running job
+            return
+        paths = self.pending
+        self.pending = set()
+        modified, deleted, new_dirs = self.get_changes(paths)
+        self.watch(new_dirs)
+        with self.lock:
+            limit = time.time() - self.KEEP_PAUSES
+            self.pauses = [p for p in self.pauses if p[1] is None or p[1] > limit]
+        if modified or deleted:
+            self.window.controller.idx.indexer.index_changes(idx, modified, deleted)
@@ -97,6 +97,7 @@ class Plugins:
         if self.window.core.plugins.is_registered(id):
             self.enabled[id] = True
             self.window.core.plugins.enable(id)
+            self.window.core.dispatcher.rebuild()  # update event handlers
 
             # dispatch event
             event = Event('enable', {
@@ -120,6 +121,7 @@ class Plugins:
         if self.window.core.plugins.is_registered(id):
             self.enabled[id] = False
             self.window.core.plugins.disable(id)
+            self.window.core.dispatcher.rebuild()  # update event handlers
 
             # dispatch event
             event = Event('disable', {
@@ -206,6 +208,7 @@ class Plugins:
         self.window.core.plugins.unregister(id)
         if id in self.enabled:
             self.enabled.pop(id)
+        self.window.core.dispatcher.rebuild()  # update event handlers
 
     def destroy(self):
         """Destroy plugins workers"""
@@ -111,6 +111,7 @@ class Editor:
 
         self.window.core.idx.sync_items()
         self.window.controller.idx.update()
+        self.window.controller.idx.watcher.update()  # start/stop watch mode
 
         # update layout if needed
         if self.before_config['layout.density'] != self.window.core.config.get('layout.density'):
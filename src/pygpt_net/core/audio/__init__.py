@@ -6,11 +6,14 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 22:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import re
 
+from .cache import Cache
+from .output import Output
+
 
 class Audio:
     def __init__(self, window=None):
@@ -20,6 +23,8 @@ class Audio:
         :param window: Window instance
         """
         self.window = window
+        self.cache = Cache(window)
+        self.output = Output(window)
 
     def clean_text(self, text: str) -> str:
         """
@@ -28,4 +33,5 @@ class Audio:
         :param text: text
         :return: cleaned text
         """
-        return re.sub(r'~###~.*?~###~', '', str(text))
+        text = re.sub(r'```.*?```', '', str(text), flags=re.DOTALL)  # code blocks
+        return re.sub(r'~###~.*?~###~', '', text)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 18:00:00                  #
+# ================================================== #
+
+import hashlib
+import os
+import re
+import threading
+
+
+class Cache:
+    DIR = "audio_cache"
+    EXT = ".pcm"
+
+    def __init__(self, window=None):
+        """
+        Synthesized audio cache (on disk, least recently used files are removed first)
+
+        :param window: Window instance
+        """
+        self.window = window
+        self.lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        """
+        Check if cache is enabled
+
+        :return: True if enabled
+        """
+        return bool(self.window.core.config.get('audio.cache'))
+
+    def get_dir(self) -> str:
+        """
+        Return cache directory path
+
+        :return: path
+        """
+        return os.path.join(self.window.core.config.path, self.DIR)
+
+    def get_max_size(self) -> int:
+        """
+        Return max cache size in bytes
+
+        :return: max size
+        """
+        return int(self.window.core.config.get('audio.cache.max_size') or 0) * 1024 * 1024
+
+    def get_key(self, provider: str, voice: str, text: str) -> str:
+        """
+        Return cache key (used as file name)
+
+        :param provider: provider ID
+        :param voice: voice (with model if model changes the output)
+        :param text: synthesized text
+        :return: key
+        """
+        hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return "{}_{}_{}".format(
+            re.sub(r'[^\w.-]', '_', provider),
+            re.sub(r'[^\w.-]', '_', voice),
+            hash,
+        )
+
+    def get_path(self, provider: str, voice: str, text: str) -> str:
+        """
+        Return cached file path
+
+        :param provider: provider ID
+        :param voice: voice
+        :param text: synthesized text
+        :return: path
+        """
+        return os.path.join(self.get_dir(), self.get_key(provider, voice, text) + self.EXT)
+
+    def get(self, provider: str, voice: str, text: str) -> bytes or None:
+        """
+        Return cached audio data
+
+        :param provider: provider ID
+        :param voice: voice
+        :param text: synthesized text
+        :return: raw PCM data or None if not cached
+        """
+        if not self.is_enabled():
+            return None
+        path = self.get_path(provider, voice, text)
+        with self.lock:
+            if not os.path.exists(path):
+                return None
+            os.utime(path)  # mark as recently used
+            with open(path, "rb") as file:
+                return file.read()
+
+    def put(self, provider: str, voice: str, text: str, data: bytes):
+        """
+        Store audio data in cache and remove oldest files if cache is full
+
+        :param provider: provider ID
+        :param voice: voice
+        :param text: synthesized text
+        :param data: raw PCM data
+        """
+        if not self.is_enabled() or not data:
+            return
+        path = self.get_path(provider, voice, text)
+        with self.lock:
+            os.makedirs(self.get_dir(), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)  # never read partially written file
+            self.evict(self.get_max_size())
+
+    def evict(self, max_size: int):
+        """
+        Remove least recently used files until cache fits in max size
+
+        :param max_size: max size in bytes
+        """
+        files = []
+        total = 0
+        for name in os.listdir(self.get_dir()):
+            if not name.endswith(self.EXT):
+                continue
+            path = os.path.join(self.get_dir(), name)
+            stat = os.stat(path)
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        files.sort()
+        for mtime, size, path in files:
+            if total <= max_size:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove all cached files"""
+        with self.lock:
+            if os.path.exists(self.get_dir()):
+                self.evict(0)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import threading
+import time
+from collections import deque
+
+
+class Playback:
+    def __init__(self):
+        """Playback of audio blocks queued one after another on the mixer channel"""
+        self.channel = None
+        self.blocks = deque()
+        self.stopped = False
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def put(self, data: bytes):
+        """
+        Add PCM block to play after the previous ones (does not wait for playback)
+
+        :param data: raw PCM data
+        """
+        with self.lock:
+            if self.stopped:
+                return
+            self.blocks.append(data)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        """Feed mixer channel with queued blocks (in playback thread, ends when all blocks are queued)"""
+        import pygame  # imported on first use
+        while True:
+            with self.lock:
+                if self.stopped or not self.blocks:
+                    self.thread = None
+                    return
+                data = None
+                if self.channel is None or self.channel.get_queue() is None:
+                    data = self.blocks.popleft()
+            if data is None:
+                time.sleep(0.01)  # channel holds only one queued sound, wait for its turn
+                continue
+            sound = pygame.mixer.Sound(buffer=data)
+            if self.channel is None:
+                self.channel = pygame.mixer.find_channel(True)
+            if self.channel.get_busy():
+                self.channel.queue(sound)
+            else:
+                self.channel.play(sound)
+
+    def is_playing(self) -> bool:
+        """
+        Check if audio is still playing
+
+        :return: True if playing
+        """
+        if self.stopped:
+            return False
+        if len(self.blocks) > 0 or self.thread is not None:
+            return True
+        return self.channel is not None and self.channel.get_busy()
+
+    def stop(self):
+        """Stop playback (can be called from any thread)"""
+        with self.lock:
+            self.stopped = True
+            self.blocks.clear()
+        if self.channel is not None:
+            self.channel.stop()
+
+
+class Output:
+    RATE = 24000  # PCM format: 24kHz, 16-bit, mono
+    WIDTH = 2
+    BLOCK = 0.2  # seconds of audio per queued block
+
+    def __init__(self, window=None):
+        """
+        Audio output engine (plays PCM streams from the first received bytes)
+
+        :param window: Window instance
+        """
+        self.window = window
+        self.lock = threading.Lock()
+        self.playbacks = []  # created playbacks (finished are removed on next create)
+
+    def init(self):
+        """Initialize mixer in PCM format (device format is converted by mixer)"""
+        import pygame  # imported on first use
+        with self.lock:
+            current = pygame.mixer.get_init()
+            if current == (self.RATE, -8 * self.WIDTH, 1):
+                return
+            if current is not None:
+                if self.is_playing():
+                    return  # do not cut active playback
+                pygame.mixer.quit()
+            pygame.mixer.init(frequency=self.RATE, size=-8 * self.WIDTH, channels=1, allowedchanges=0)
+
+    def create(self) -> Playback:
+        """
+        Create new playback
+
+        :return: Playback
+        """
+        playback = Playback()
+        with self.lock:
+            self.playbacks = [item for item in self.playbacks if item.is_playing()]
+            self.playbacks.append(playback)
+        return playback
+
+    def is_playing(self) -> bool:
+        """
+        Check if any playback is active
+
+        :return: True if playing
+        """
+        return any(playback.is_playing() for playback in self.playbacks)
+
+    def play(self, playback: Playback, chunks) -> bytes or None:
+        """
+        Play PCM stream while it is received (in worker thread, returns when stream ends)
+
+        :param playback: Playback
+        :param chunks: iterable of raw PCM data chunks
+        :return: all received data or None if stopped before the end of stream
+        """
+        self.init()
+        block = int(self.RATE * self.BLOCK) * self.WIDTH
+        data = bytearray()
+        buffer = b""
+        for chunk in chunks:
+            if playback.stopped:
+                return None
+            data += chunk
+            buffer += chunk
+            while len(buffer) >= block:
+                playback.put(buffer[:block])
+                buffer = buffer[block:]
+        if playback.stopped:
+            return None
+        buffer = buffer[:len(buffer) - len(buffer) % self.WIDTH]  # incomplete sample
+        if buffer:
+            playback.put(buffer)
+        return bytes(data)
+
+    def wait(self, playback: Playback):
+        """
+        Wait until playback ends (in worker thread)
+
+        :param playback: Playback
+        """
+        while playback.is_playing():
+            time.sleep(0.05)
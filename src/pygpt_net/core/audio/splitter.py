@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import re
+
+
+class Splitter:
+    CMD_TAG = "~###~"
+    CODE_TAG = "```"
+    MIN_LENGTH = 20  # shorter sentences are joined with the next one
+    BOUNDARY = re.compile(r'[.!?…]+["\'”’)\]]*\s+|\n+')
+    CODE = re.compile(r'```.*?```', re.DOTALL)
+    LIST_NUM = re.compile(r'(^|\n)[ \t]*\d+$')
+
+    def __init__(self):
+        """Splits streamed text into completed sentences"""
+        self.buffer = ""
+
+    def is_in_cmd(self, pos: int) -> bool:
+        """
+        Check if position is inside command block
+
+        :param pos: position in buffer
+        :return: True if inside command block
+        """
+        return self.buffer.count(self.CMD_TAG, 0, pos) % 2 == 1
+
+    def is_in_code(self, pos: int) -> bool:
+        """
+        Check if position is inside fenced code block
+
+        :param pos: position in buffer
+        :return: True if inside code block
+        """
+        return self.buffer.count(self.CODE_TAG, 0, pos) % 2 == 1
+
+    def is_list_num(self, pos: int) -> bool:
+        """
+        Check if boundary at position is a list item number, e.g. "1. "
+
+        :param pos: position in buffer
+        :return: True if list item number
+        """
+        return self.LIST_NUM.search(self.buffer, 0, pos) is not None
+
+    def strip_code(self, text: str) -> str:
+        """
+        Remove fenced code blocks from text (code is not spoken)
+
+        :param text: text
+        :return: text without code blocks
+        """
+        return self.CODE.sub('', text).strip()
+
+    def append(self, text: str) -> list:
+        """
+        Append chunk of text and return sentences completed by it
+
+        :param text: text chunk
+        :return: list of completed sentences
+        """
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in self.BOUNDARY.finditer(self.buffer):
+            if self.is_in_cmd(match.start()) or self.is_in_code(match.start()) \
+                    or self.is_list_num(match.start()):
+                continue
+            sentence = self.strip_code(self.buffer[start:match.end()])
+            if len(sentence) < self.MIN_LENGTH:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> str:
+        """
+        Return rest of text (at the end of stream)
+
+        :return: rest of text
+        """
+        text = self.buffer
+        if self.is_in_cmd(len(text)):
+            text = text[:text.rfind(self.CMD_TAG)]  # unclosed command block
+        if self.is_in_code(len(text)):
+            text = text[:text.rfind(self.CODE_TAG)]  # unclosed code block
+        self.buffer = ""
+        return self.strip_code(text)
@@ -6,11 +6,10 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 10:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import os
-import cv2
 import time
 
 from PySide6.QtCore import QObject, Signal, QRunnable, Slot
@@ -57,6 +56,7 @@ class CaptureWorker(QRunnable):
     def setup_camera(self):
         """Initialize camera"""
         try:
+            import cv2  # imported on first use
             # get params from global config
             self.capture = cv2.VideoCapture(self.window.core.config.get('vision.capture.idx'))
             self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.window.core.config.get('vision.capture.width'))
@@ -70,6 +70,7 @@ class CaptureWorker(QRunnable):
     @Slot()
     def run(self):
         """Frame capture loop"""
+        import cv2  # imported on first use
         target_fps = 30
         fps_interval = 1.0 / target_fps
         try:
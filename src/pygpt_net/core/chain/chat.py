@@ -6,12 +6,9 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
-from langchain.schema import SystemMessage, HumanMessage, AIMessage
-
-
 class Chat:
     def __init__(self, window=None):
         """
@@ -70,6 +67,7 @@ class Chat:
         :param user_name: username (optional)
         :return: list of messages
         """
+        from langchain.schema import SystemMessage, HumanMessage, AIMessage  # imported on first use
         messages = []
 
         # tokens config
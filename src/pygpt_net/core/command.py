@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 06:00:00                  #
 # ================================================== #
 
 import json
@@ -104,6 +104,30 @@ class Command:
             pass
         return cmds
 
+    def extract_cmds_partial(self, output: str, offset: int = 0) -> (list, int):
+        """
+        Extract complete commands from streamed (incomplete) response
+
+        Only commands already closed with ~###~ are extracted, scanning starts from offset.
+
+        :param output: response received so far
+        :param offset: position to start from (returned by previous call)
+        :return: commands list, offset for next call
+        """
+        cmds = []
+        start = output.find('~###~', offset)
+        while start != -1:
+            end = output.find('~###~', start + 5)
+            if end == -1:
+                break
+            cmd = self.extract_cmd(output[start + 5:end])
+            if cmd is not None:
+                cmds.append(cmd)
+            start = end
+        if start == -1:
+            start = max(offset, len(output) - 4)  # marker may be split between chunks
+        return cmds, start
+
     def extract_cmd(self, chunk: str) -> dict or None:
         """
         Extract command from response
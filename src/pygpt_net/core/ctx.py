@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import datetime
@@ -14,6 +14,7 @@ import os
 
 from packaging.version import Version
 
+from pygpt_net.core.gpt.summarizer import Summarizer
 from pygpt_net.item.ctx import CtxItem, CtxMeta
 from pygpt_net.provider.ctx.db_sqlite import DbSqliteProvider
 from pygpt_net.utils import trans
@@ -159,6 +160,8 @@ class Ctx:
 
         :param item: CtxItem to update
         """
+        if item in self.items:
+            self.reset_summary(self.items.index(item))
         self.provider.update_item(item)
 
     def is_empty(self) -> bool:
@@ -454,22 +457,134 @@ class Ctx:
         :return: context items list
         """
         items = []
+        nums = {}  # item ID => tokens
         # loop on items from end to start
         tokens = used_tokens
         is_first = True
+        truncated = False
         for item in reversed(self.items):
             if is_first and ignore_first:
                 is_first = False
                 continue
-            tokens += self.window.core.tokens.from_ctx(item, mode, model)
+            num = self.window.core.tokens.from_ctx(item, mode, model)
+            tokens += num
             if tokens > max_tokens:
+                truncated = True
                 break
             items.append(item)
+            nums[id(item)] = num
 
         # reverse items
         items.reverse()
+
+        # replace dropped items with summary
+        if truncated and self.is_compact():
+            items = self.compact(items, nums, model, mode, max_tokens - used_tokens)
         return items
 
+    def is_compact(self) -> bool:
+        """
+        Check if context compaction is enabled
+
+        :return: True if enabled
+        """
+        return bool(self.window.core.config.get('ctx.compact'))
+
+    def get_summary(self, id: int) -> (str or None, int):
+        """
+        Return rolling summary of ctx
+
+        :param id: ctx ID
+        :return: summary, number of summarized items (from the beginning)
+        """
+        if id not in self.meta:
+            return None, 0
+        return self.meta[id].summary, self.meta[id].summary_count
+
+    def set_summary(self, id: int, summary: str, count: int):
+        """
+        Set rolling summary of ctx
+
+        :param id: ctx ID
+        :param summary: summary
+        :param count: number of summarized items (from the beginning)
+        """
+        if id not in self.meta:
+            return
+        self.meta[id].summary = summary
+        self.meta[id].summary_count = count
+        self.save(id)
+
+    def build_summary(self, summary: str) -> CtxItem:
+        """
+        Build ctx item with summary
+
+        :param summary: summary
+        :return: context item
+        """
+        item = CtxItem()
+        item.input = ""
+        item.output = "Summary of the earlier part of the conversation:\n" + summary
+        return item
+
+    def compact(self, items: list, nums: dict, model: str, mode: str, max_tokens: int) -> list:
+        """
+        Prepend rolling summary to prompt items, remove items already summarized
+
+        :param items: prompt items
+        :param nums: tokens of items: item ID => tokens
+        :param model: model
+        :param mode: mode
+        :param max_tokens: max tokens for items
+        :return: prompt items with summary
+        """
+        summary, count = self.get_summary(self.current)
+        if not summary:
+            return items  # not summarized yet, dropped items are summarized in background
+        summarized = {id(item) for item in self.items[:count]}
+        result = [item for item in items if id(item) not in summarized]
+        item = self.build_summary(summary)
+        tokens = self.window.core.tokens.from_ctx(item, mode, model)
+        tokens += sum(nums[id(i)] for i in result)
+        if tokens > max_tokens:
+            return items  # summary longer than reserved, keep items until next summary update
+        return [item] + result
+
+    def get_summary_reserve(self, model: str, mode: str) -> int:
+        """
+        Return tokens reserved in prompt for rolling summary (max summary length)
+
+        :param model: model
+        :param mode: mode
+        :return: tokens count
+        """
+        return self.window.core.tokens.from_ctx(self.build_summary(""), mode, model) + Summarizer.HISTORY_TOKENS
+
+    def get_compact_range(self, model: str, mode: str, used_tokens: int = 100, max_tokens: int = 1000) -> (int, int):
+        """
+        Return range of items to add to summary: from the first not summarized to the last dropped from prompt
+
+        :param model: model
+        :param mode: mode
+        :param used_tokens: used tokens
+        :param max_tokens: max tokens
+        :return: start, end (items indexes)
+        """
+        _, count = self.get_summary(self.current)
+        used_tokens += self.get_summary_reserve(model, mode)  # items that not fit next to summary
+        kept, _ = self.count_prompt_items(model, mode, used_tokens, max_tokens)
+        return count, max(count, len(self.items) - kept)
+
+    def reset_summary(self, idx: int):
+        """
+        Clear rolling summary if summarized item is removed or changed
+
+        :param idx: item index
+        """
+        summary, count = self.get_summary(self.current)
+        if summary and idx < count:
+            self.set_summary(self.current, None, 0)
+
     def get_all_items(self, ignore_first: bool = True) -> list:
         """
         Return all ctx items
@@ -496,8 +611,8 @@ class Ctx:
         :param threshold: threshold
         :param max_total: max total tokens
         """
-        if self.get_tokens_left(max_total) <= threshold:
-            self.remove_first()
+        if self.get_tokens_left(max_total) <= threshold and not self.is_compact():
+            self.remove_first()  # in compact mode old items are summarized instead
 
     def get_tokens_left(self, max: int) -> int:
         """
@@ -533,11 +648,13 @@ class Ctx:
     def remove_last(self):
         """Remove last item"""
         if len(self.items) > 0:
+            self.reset_summary(len(self.items) - 1)
             self.items.pop()
 
     def remove_first(self):
         """Remove first item"""
         if len(self.items) > 0:
+            self.reset_summary(0)
             self.items.pop(0)
 
     def is_allowed_for_mode(self, mode: str, check_assistant: bool = True) -> bool:
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.18 12:00:00                  #
+# ================================================== #
+
+
+class EventsDebug:
+    def __init__(self, window=None):
+        """
+        Plugin events debug
+
+        :param window: Window instance
+        """
+        self.window = window
+        self.id = 'events'
+
+    def update(self):
+        """Update debug window."""
+        self.window.core.debug.begin(self.id)
+
+        threshold = self.window.core.config.get('debug.plugins.slow_ms')
+        self.window.core.debug.add(self.id, 'Slow threshold:', str(threshold) + ' ms')
+
+        for item in self.window.core.dispatcher.get_stats():
+            key = '[' + item['id'] + '] ' + item['event']
+            self.window.core.debug.add(
+                self.id, key,
+                'count: {}, p50: {:.2f} ms, p95: {:.2f} ms, max: {:.2f} ms'.format(
+                    item['count'], item['p50'], item['p95'], item['max']))
+
+        self.window.core.debug.end(self.id)
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 11:00:00                  #
+# Updated Date: 2024.01.17 10:00:00                  #
 # ================================================== #
 import datetime
 import os
@@ -29,6 +29,14 @@ class IndexesDebug:
         self.window.core.debug.add(self.id, 'Current idx:', str(self.window.controller.idx.current_idx))
         self.window.core.debug.add(self.id, 'Storage:', str(list(self.window.core.idx.storage.indexes.keys())))
 
+        # storage cache
+        storage = self.window.core.idx.storage
+        self.window.core.debug.add(self.id, 'Cache size:', str(storage.get_cache_size())
+                                   + ' / ' + str(storage.get_cache_limit()) + ' bytes')
+        self.window.core.debug.add(self.id, 'Cache contexts:', str(len(storage.contexts)))
+        for key in storage.stats:
+            self.window.core.debug.add(self.id, 'Cache ' + key + ':', str(storage.stats[key]))
+
         # indexes
         indexes = self.window.core.idx.get_all()
         for key in list(indexes):
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.18 16:00:00                  #
+# ================================================== #
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+class Profiler:
+    ENV_TRACE = 'PYGPT_TRACE_STARTUP'
+    ARG_TRACE = '--trace-startup'
+    TRACE_FILE = 'startup.trace.log'
+
+    def __init__(self, start: float = None):
+        """
+        Startup profiler (timeline of init phases)
+
+        :param start: start time (perf_counter), default: now
+        """
+        self.start = start if start is not None else time.perf_counter()
+        self.items = []  # (name, offset, duration) in seconds
+        self.depth = 0
+        self.enabled = os.environ.get(self.ENV_TRACE, '') not in ('', '0') or self.ARG_TRACE in sys.argv
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Measure init phase
+
+        :param name: phase name
+        """
+        begin = time.perf_counter()
+        item = [name, begin - self.start, 0.0, self.depth]
+        self.items.append(item)
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            item[2] = time.perf_counter() - begin
+
+    def mark(self, name: str):
+        """
+        Add point in time to timeline
+
+        :param name: mark name
+        """
+        self.items.append([name, time.perf_counter() - self.start, 0.0, self.depth])
+
+    def get_timeline(self) -> list:
+        """
+        Get timeline lines
+
+        :return: list of lines: offset, duration, phase
+        """
+        lines = []
+        for name, offset, duration, depth in self.items:
+            lines.append("{:>10.2f} ms {:>10.2f} ms  {}{}".format(
+                offset * 1000, duration * 1000, '  ' * depth, name))
+        return lines
+
+    def get_duration(self, name: str) -> float or None:
+        """
+        Get phase duration
+
+        :param name: phase name
+        :return: duration in seconds
+        """
+        for item in self.items:
+            if item[0] == name:
+                return item[2]
+
+    def dump(self, path: str = None):
+        """
+        Print timeline and save it to file (if trace mode is enabled)
+
+        :param path: directory to save trace file
+        """
+        if not self.enabled:
+            return
+        lines = ["{:>13} {:>13}  {}".format('start', 'duration', 'phase')] + self.get_timeline()
+        print("Startup timeline:")
+        print("\n".join(lines))
+        if path is not None:
+            try:
+                with open(os.path.join(path, self.TRACE_FILE), 'w', encoding='utf-8') as f:
+                    f.write("\n".join(lines) + "\n")
+            except Exception as e:
+                print("Error saving startup trace: {}".format(e))
@@ -6,10 +6,12 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.06 23:00:00                  #
+# Updated Date: 2024.01.19 04:00:00                  #
 # ================================================== #
 
 import json
+import time
+from collections import deque
 
 from pygpt_net.item.ctx import CtxItem
 
@@ -30,6 +32,8 @@ class Event:
 
 
 class Dispatcher:
+    STATS_SIZE = 500  # rolling window of handle() timings per plugin and event
+
     def __init__(self, window=None):
         """
         Event dispatcher
@@ -37,6 +41,30 @@ class Dispatcher:
         :param window: Window instance
         """
         self.window = window
+        self.handlers = {}  # event name => list of subscribed enabled plugins ids
+        self.timings = {}  # (plugin id, event name) => {count, max, samples}
+
+    def rebuild(self):
+        """Rebuild event handlers lists (on plugin enable/disable)"""
+        self.handlers = {}
+
+    def get_handlers(self, name: str) -> list:
+        """
+        Get enabled plugins subscribed to event
+
+        :param name: event name
+        :return: list of plugins ids (in plugins order)
+        """
+        if name not in self.handlers:
+            ids = []
+            for id in self.window.core.plugins.plugins:
+                if not self.window.controller.plugins.is_enabled(id):
+                    continue
+                events = self.window.core.plugins.plugins[id].events
+                if events is None or name in events:  # None = subscribed to all events
+                    ids.append(id)
+            self.handlers[name] = ids
+        return self.handlers[name]
 
     def dispatch(self, event: Event, all: bool = False, is_async: bool = False) -> (list, Event):
         """
@@ -48,12 +76,15 @@ class Dispatcher:
         :return: list of affected plugins ids and event object
         """
         affected = []
-        for id in self.window.core.plugins.plugins:
-            if self.window.controller.plugins.is_enabled(id) or all:
-                if event.stop:
-                    break
-                self.apply(id, event, is_async)
-                affected.append(id)
+        if all:
+            ids = list(self.window.core.plugins.plugins)
+        else:
+            ids = self.get_handlers(event.name)
+        for id in ids:
+            if event.stop:
+                break
+            self.apply(id, event, is_async)
+            affected.append(id)
 
         return affected, event
 
@@ -66,11 +97,65 @@ class Dispatcher:
         :param is_async: true if async event  TODO: remove this param
         """
         if id in self.window.core.plugins.plugins:
+            start = time.perf_counter()
             try:
                 self.window.core.plugins.plugins[id].is_async = is_async
                 self.window.core.plugins.plugins[id].handle(event)
             except AttributeError:
                 pass
+            finally:
+                self.record(id, event.name, time.perf_counter() - start)
+
+    def record(self, id: str, name: str, elapsed: float):
+        """
+        Record handle() time
+
+        :param id: plugin id
+        :param name: event name
+        :param elapsed: handle time in seconds
+        """
+        key = (id, name)
+        if key not in self.timings:
+            self.timings[key] = {
+                'count': 0,
+                'max': 0.0,
+                'samples': deque(maxlen=self.STATS_SIZE),
+            }
+        item = self.timings[key]
+        item['count'] += 1
+        item['samples'].append(elapsed)
+        if elapsed > item['max']:
+            item['max'] = elapsed
+
+        # slow handler warning
+        threshold = self.window.core.config.get('debug.plugins.slow_ms')
+        if threshold and elapsed * 1000 >= threshold:
+            print("Slow plugin handler: {} [{}]: {:.2f} ms".format(id, name, elapsed * 1000))
+
+    def get_stats(self) -> list:
+        """
+        Get handle() timings stats, slowest first
+
+        :return: list of dicts: id, event, count, p50, p95, max (in ms)
+        """
+        stats = []
+        for (id, name), item in list(self.timings.items()):
+            samples = sorted(item['samples'])
+            if not samples:
+                continue
+            stats.append({
+                'id': id,
+                'event': name,
+                'count': item['count'],
+                'p50': samples[int(0.5 * (len(samples) - 1))] * 1000,
+                'p95': samples[int(0.95 * (len(samples) - 1))] * 1000,
+                'max': item['max'] * 1000,
+            })
+        return sorted(stats, key=lambda x: x['p95'], reverse=True)
+
+    def reset_stats(self):
+        """Reset handle() timings stats"""
+        self.timings = {}
 
     def reply(self, ctx: CtxItem):
         """
@@ -79,6 +164,8 @@ class Dispatcher:
         :param ctx: context object
         """
         if ctx is not None:
+            if self.window.controller.command.collect(ctx):
+                return  # wait for all results of scheduled commands
             self.window.ui.status("")  # Clear status
             if ctx.reply:
                 self.window.core.ctx.update_item(ctx)  # update context in db
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 class Chat:
@@ -32,25 +32,52 @@ class Chat:
         :param user_name: user name
         :return: response or stream chunks
         """
-        client = self.window.core.gpt.get_client()
         model = self.window.core.gpt.get_model('chat',  allow_change=False)
 
         # build chat messages
         messages = self.build(prompt, system_prompt=system_prompt, ai_name=ai_name, user_name=user_name)
-        msg_tokens = self.window.core.tokens.from_messages(messages, self.window.core.config.get('model'))
-        max_model_tokens = self.window.core.models.get_num_ctx(self.window.core.config.get('model'))
+        max_tokens = self.fit_tokens(messages, self.window.core.config.get('model'), max_tokens)
+        return self.create(messages, model, max_tokens, stream_mode=stream_mode)
+
+    def fit_tokens(self, messages: list, model: str, max_tokens: int) -> int:
+        """
+        Fit max output tokens to model context window
+
+        :param messages: messages list
+        :param model: model
+        :param max_tokens: max output tokens
+        :return: max output tokens
+        """
+        msg_tokens = self.window.core.tokens.from_messages(messages, model)
+        max_model_tokens = self.window.core.models.get_num_ctx(model)
 
         # check if max tokens not exceeded
         if msg_tokens + int(max_tokens) > max_model_tokens:
             max_tokens = max_model_tokens - msg_tokens - 1
             if max_tokens < 1:
                 max_tokens = 1
+        return int(max_tokens)
 
+    def create(self, messages: list, model_id: str, max_tokens: int, temperature: float = None,
+               stream_mode: bool = False):
+        """
+        Call OpenAI API for chat with messages (sampling params from config)
+
+        :param messages: messages list
+        :param model_id: model ID
+        :param max_tokens: max output tokens
+        :param temperature: temperature (optional, default from config)
+        :param stream_mode: stream mode
+        :return: response or stream chunks
+        """
+        if temperature is None:
+            temperature = self.window.core.config.get('temperature')
+        client = self.window.core.gpt.get_client()
         response = client.chat.completions.create(
             messages=messages,
-            model=model,
+            model=model_id,
             max_tokens=int(max_tokens),
-            temperature=self.window.core.config.get('temperature'),
+            temperature=temperature,
             top_p=self.window.core.config.get('top_p'),
             frequency_penalty=self.window.core.config.get('frequency_penalty'),
             presence_penalty=self.window.core.config.get('presence_penalty'),
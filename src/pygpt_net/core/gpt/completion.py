@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 class Completion:
@@ -34,24 +34,47 @@ class Completion:
         """
         # build prompt message
         message = self.build(prompt, system_prompt=system_prompt, ai_name=ai_name, user_name=user_name)
+        model = self.window.core.gpt.get_model('completion',  allow_change=False)
+        return self.create(message, model, max_tokens, stop=self.get_stop(user_name), stream_mode=stream_mode)
+
+    def get_stop(self, user_name: str = None) -> list or str:
+        """
+        Get stop sequence
 
+        :param user_name: username
+        :return: stop sequence
+        """
         # prepare stop word if user_name is set
         stop = ""
         if user_name is not None and user_name != '':
             stop = [user_name + ':']
+        return stop
 
-        client = self.window.core.gpt.get_client()
-        model = self.window.core.gpt.get_model('completion',  allow_change=False)
+    def create(self, message: str, model_id: str, max_tokens: int, stop: list or str = "", temperature: float = None,
+               stream_mode: bool = False):
+        """
+        Call OpenAI API for completion with prompt string (sampling params from config)
 
+        :param message: prompt string
+        :param model_id: model ID
+        :param max_tokens: max output tokens
+        :param stop: stop sequence
+        :param temperature: temperature (optional, default from config)
+        :param stream_mode: stream mode
+        :return: response or stream chunks
+        """
         # fix for deprecated OpenAI davinci models
-        if model.startswith('text-davinci'):
-            model = 'gpt-3.5-turbo-instruct'
+        if model_id.startswith('text-davinci'):
+            model_id = 'gpt-3.5-turbo-instruct'
 
+        if temperature is None:
+            temperature = self.window.core.config.get('temperature')
+        client = self.window.core.gpt.get_client()
         response = client.completions.create(
             prompt=message,
-            model=model,
+            model=model_id,
             max_tokens=int(max_tokens),
-            temperature=self.window.core.config.get('temperature'),
+            temperature=temperature,
             top_p=self.window.core.config.get('top_p'),
             frequency_penalty=self.window.core.config.get('frequency_penalty'),
             presence_penalty=self.window.core.config.get('presence_penalty'),
@@ -109,6 +132,23 @@ class Completion:
                         message += "\n" + item.output
 
         # append names
+        message = self.append_input(message, input_prompt, ai_name=ai_name, user_name=user_name)
+
+        # input tokens: update
+        self.input_tokens += self.window.core.tokens.from_text(message, model_id)
+
+        return message
+
+    def append_input(self, message: str, input_prompt: str, ai_name: str = None, user_name: str = None) -> str:
+        """
+        Append user input (with names if set) to completion string
+
+        :param message: message string
+        :param input_prompt: prompt (user input)
+        :param ai_name: AI name
+        :param user_name: username
+        :return: message string
+        """
         if user_name is not None \
                 and ai_name is not None \
                 and user_name != "" \
@@ -117,10 +157,6 @@ class Completion:
             message += "\n" + ai_name + ":"
         else:
             message += "\n" + str(input_prompt)
-
-        # input tokens: update
-        self.input_tokens += self.window.core.tokens.from_text(message, model_id)
-
         return message
 
     def reset_tokens(self):
@@ -6,13 +6,15 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.16 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from pygpt_net.item.ctx import CtxItem
 
 
 class Summarizer:
+    HISTORY_TOKENS = 1000  # max tokens of rolling summary
+
     def __init__(self, window=None):
         """
         Summarizer
@@ -53,3 +55,80 @@ class Summarizer:
         response = self.window.core.gpt.quick_call(text, sys_prompt, False, 500, model_id)
         if response is not None:
             return response
+
+    def summary_history(self, items: list, summary: str = None) -> (str or None, int):
+        """
+        Update rolling summary of conversation with next items (in chunks fitting summarizer context)
+
+        :param items: context items (CtxItem) to add to summary
+        :param summary: current summary
+        :return: updated summary (None if not updated), number of summarized items (from the beginning)
+        """
+        model_id = 'gpt-3.5-turbo-1106'
+        sys_prompt = "You are an expert in conversation summarization"
+        if self.window.core.config.get('ctx.compact.model') is not None \
+                and self.window.core.config.get('ctx.compact.model') != "":
+            model = self.window.core.config.get('ctx.compact.model')
+            model_id = self.window.core.models.get_id(model)
+
+        # context left for prompt: without response and margin for tokens per message
+        max_tokens = self.window.core.models.get_num_ctx(model_id) - self.HISTORY_TOKENS - 100
+        max_tokens -= self.window.core.tokens.from_text(sys_prompt, model_id)
+        num = 0
+        while num < len(items):
+            text = self.build_history_prompt(summary)
+            available = max_tokens - self.window.core.tokens.from_text(text, model_id)
+            chunk = 0
+            for item in items[num:]:
+                message = self.build_history_message(item)
+                tokens = self.window.core.tokens.from_text(message, model_id)
+                if tokens > available:
+                    if chunk == 0 and available > 0:
+                        text += message[:len(message) * available // tokens]  # too long, cut to fit
+                        chunk = 1
+                    break
+                text += message
+                available -= tokens
+                chunk += 1
+            if chunk == 0:
+                break  # summary is too long to add anything
+
+            # quick call OpenAI API
+            response = self.window.core.gpt.quick_call(text, sys_prompt, False, self.HISTORY_TOKENS, model_id)
+            if not response:
+                break  # keep summary of previous chunks
+            summary = response
+            num += chunk
+
+        if num == 0:
+            return None, 0
+        return summary, num
+
+    def build_history_prompt(self, summary: str = None) -> str:
+        """
+        Build prompt for rolling summary update (without new messages)
+
+        :param summary: current summary
+        :return: prompt text
+        """
+        text = "Update the summary of the conversation with the new messages below. Keep all facts, names, " \
+               "numbers, decisions and open tasks needed to continue the conversation. Summary must be in the " \
+               "same language as the conversation and as concise as possible. Return only the summary.\n\n"
+        if summary:
+            text += "Current summary:\n" + summary + "\n\n"
+        text += "New messages:"
+        return text
+
+    def build_history_message(self, item: CtxItem) -> str:
+        """
+        Build messages text of context item for rolling summary
+
+        :param item: context item (CtxItem)
+        :return: messages text
+        """
+        text = ""
+        if item.input:
+            text += "\nUser: " + str(item.input)
+        if item.output:
+            text += "\nAI Assistant: " + str(item.output)
+        return text
@@ -6,20 +6,17 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 21:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import datetime
+import json
 import os.path
 from packaging.version import Version
 
 from pygpt_net.item.index import IndexItem
 from pygpt_net.provider.index.json_file import JsonFileProvider
 
-from .indexing import Indexing
-from .storage import Storage
-from .chat import Chat
-
 
 class Idx:
     def __init__(self, window=None):
@@ -29,13 +26,62 @@ class Idx:
         :param window: Window instance
         """
         self.window = window
-        self.indexing = Indexing(window)
-        self.storage = Storage(window)
-        self.chat = Chat(window, self.storage)
+        self._indexing = None  # llama_index is imported on first use
+        self._storage = None
+        self._chat = None
         self.provider = JsonFileProvider(window)
         self.items = {}
+        self.files = {}  # reverse map: file_id => {idx: indexed_ts}
         self.initialized = False
 
+    @property
+    def indexing(self):
+        """
+        Get indexing core (created on first use)
+
+        :return: Indexing
+        """
+        if self._indexing is None:
+            from .indexing import Indexing
+            self._indexing = Indexing(self.window)
+        return self._indexing
+
+    @indexing.setter
+    def indexing(self, value):
+        self._indexing = value
+
+    @property
+    def storage(self):
+        """
+        Get index storage (created on first use)
+
+        :return: Storage
+        """
+        if self._storage is None:
+            from .storage import Storage
+            self._storage = Storage(self.window)
+        return self._storage
+
+    @storage.setter
+    def storage(self, value):
+        self._storage = value
+
+    @property
+    def chat(self):
+        """
+        Get index chat (created on first use)
+
+        :return: Chat
+        """
+        if self._chat is None:
+            from .chat import Chat
+            self._chat = Chat(self.window, self.storage)
+        return self._chat
+
+    @chat.setter
+    def chat(self, value):
+        self._chat = value
+
     def store_index(self, idx: str = "base"):
         """
         Store index
@@ -51,50 +97,207 @@ class Idx:
         :param idx: Index name
         :return: True if success
         """
+        self.remove_manifest(idx)
+        self.remove_manifest(idx, "db")
         return self.storage.remove(idx)
 
-    def index_files(self, idx: str = "base", path: str = None) -> tuple:
+    def index_files(self, idx: str = "base", path: str = None, progress: callable = None,
+                    is_stopped: callable = None) -> tuple:
         """
         Index file or directory of files
 
         :param idx: Index name
         :param path: Path to file or directory
+        :param progress: progress callback (receives progress data)
+        :param is_stopped: returns True if job was cancelled
         :return: dict with indexed files, errors
         """
         index = self.storage.get(idx)  # get or create index
-        files, errors = self.indexing.index_files(index, path)  # index files
+        done = self.load_manifest(idx, path)  # files indexed by interrupted job
+        files, errors = self.indexing.index_files(index, path, progress, is_stopped, skip=done)  # index files
         if len(files) > 0:
             self.storage.store(id=idx, index=index)  # store index
+        files = {**done, **files}
+        if is_stopped is not None and is_stopped():
+            self.save_manifest(idx, path, files)  # checkpoint, resume on next run
+        else:
+            self.remove_manifest(idx)
         return files, errors
 
-    def index_db_by_meta_id(self, idx: str = "base", id: int = 0) -> tuple:
+    def sync_files(self, idx: str = "base", modified: list = None, deleted: list = None,
+                   progress: callable = None, is_stopped: callable = None) -> tuple:
+        """
+        Update index with changed files (remove old documents, index new versions)
+
+        :param idx: Index name
+        :param modified: created or modified files
+        :param deleted: deleted files
+        :param progress: progress callback (receives progress data)
+        :param is_stopped: returns True if job was cancelled
+        :return: dict with indexed files, list of removed files, errors
+        """
+        modified = modified or []
+        deleted = deleted or []
+        index = self.storage.get(idx)  # get or create index
+        removed = []
+        files = {}
+        errors = []
+        for path in deleted + modified:
+            if self.indexing.remove_file(index, path, self.get_doc_id(idx, path)) > 0 or path in deleted:
+                removed.append(path)
+        for path in modified:
+            if is_stopped is not None and is_stopped():
+                break
+            indexed, errs = self.indexing.index_files(index, path, progress, is_stopped)
+            files.update(indexed)
+            errors.extend(errs)
+        if len(files) > 0 or len(removed) > 0:
+            self.storage.store(id=idx, index=index)  # store index
+        removed = [path for path in removed if path not in files]
+        return files, removed, errors
+
+    def index_db_by_meta_id(self, idx: str = "base", id: int = 0, progress: callable = None,
+                            is_stopped: callable = None) -> tuple:
         """
         Index records from db by meta id
 
         :param idx: Index name
         :param id: Meta id
+        :param progress: progress callback (receives progress data)
+        :param is_stopped: returns True if job was cancelled
         :return: dict with indexed files, errors
         """
         index = self.storage.get(idx)  # get or create index
-        num, errors = self.indexing.index_db_by_meta_id(index, id)  # index db records
+        num, errors = self.indexing.index_db_by_meta_id(index, id, progress, is_stopped)  # index db records
         if num > 0:
             self.storage.store(id=idx, index=index)  # store index
         return num, errors
 
-    def index_db_from_updated_ts(self, idx: str = "base", from_ts: int = 0) -> tuple:
+    def index_db_from_updated_ts(self, idx: str = "base", from_ts: int = 0, progress: callable = None,
+                                 is_stopped: callable = None) -> tuple:
         """
         Index records from db by meta id
 
         :param idx: Index name
         :param from_ts: From timestamp
+        :param progress: progress callback (receives progress data)
+        :param is_stopped: returns True if job was cancelled
         :return: dict with indexed files, errors
         """
         index = self.storage.get(idx)  # get or create index
-        num, errors = self.indexing.index_db_from_updated_ts(index, from_ts)  # index db records
+        updated_ts, last_id = self.load_db_checkpoint(idx, from_ts)  # last record indexed by interrupted job
+        num, errors, last = self.indexing.index_db_from_updated_ts(
+            index, updated_ts, progress, is_stopped, last_id)  # index db records
         if num > 0:
             self.storage.store(id=idx, index=index)  # store index
+        if is_stopped is not None and is_stopped():
+            if last is not None:
+                self.save_db_checkpoint(idx, from_ts, last)  # checkpoint, resume on next run
+        elif len(errors) == 0:
+            self.remove_manifest(idx, "db")
         return num, errors
 
+    def get_manifest_path(self, idx: str, name: str = "files") -> str:
+        """
+        Get indexing job manifest path (outside index dir, to not modify stored index)
+
+        :param idx: Index name
+        :param name: manifest name (files or db)
+        :return: path to manifest file
+        """
+        return os.path.join(self.window.core.config.get_user_dir('idx'), '_manifest', idx + '.' + name + '.json')
+
+    def read_manifest(self, idx: str, name: str = "files") -> dict:
+        """
+        Read indexing job manifest
+
+        :param idx: Index name
+        :param name: manifest name (files or db)
+        :return: manifest data
+        """
+        manifest = self.get_manifest_path(idx, name)
+        if not os.path.exists(manifest):
+            return {}
+        try:
+            with open(manifest, 'r', encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            self.window.core.debug.log(e)
+        return {}
+
+    def write_manifest(self, idx: str, data: dict, name: str = "files"):
+        """
+        Write indexing job manifest
+
+        :param idx: Index name
+        :param data: manifest data
+        :param name: manifest name (files or db)
+        """
+        manifest = self.get_manifest_path(idx, name)
+        try:
+            os.makedirs(os.path.dirname(manifest), exist_ok=True)
+            with open(manifest, 'w', encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+        except Exception as e:
+            self.window.core.debug.log(e)
+
+    def load_manifest(self, idx: str, path: str) -> dict:
+        """
+        Load files indexed by interrupted job for the same path
+
+        :param idx: Index name
+        :param path: Indexed path
+        :return: dict with indexed files
+        """
+        data = self.read_manifest(idx)
+        if data.get('path') == path:
+            return data.get('files', {})
+        return {}
+
+    def save_manifest(self, idx: str, path: str, files: dict):
+        """
+        Save files indexed by interrupted job
+
+        :param idx: Index name
+        :param path: Indexed path
+        :param files: dict with indexed files
+        """
+        self.write_manifest(idx, {"path": path, "files": files})
+
+    def load_db_checkpoint(self, idx: str, from_ts: int) -> tuple:
+        """
+        Load last record indexed by interrupted job for the same timestamp
+
+        :param idx: Index name
+        :param from_ts: From timestamp
+        :return: updated_ts, item ID to resume from
+        """
+        data = self.read_manifest(idx, "db")
+        if data.get('from_ts') == from_ts and data.get('updated_ts') is not None:
+            return int(data['updated_ts']), int(data.get('id', 0))
+        return from_ts, 0
+
+    def save_db_checkpoint(self, idx: str, from_ts: int, last: tuple):
+        """
+        Save last record indexed by interrupted job
+
+        :param idx: Index name
+        :param from_ts: From timestamp
+        :param last: (updated_ts, item ID) of last indexed record
+        """
+        self.write_manifest(idx, {"from_ts": from_ts, "updated_ts": last[0], "id": last[1]}, "db")
+
+    def remove_manifest(self, idx: str, name: str = "files"):
+        """
+        Remove indexing job manifest
+
+        :param idx: Index name
+        :param name: manifest name (files or db)
+        """
+        manifest = self.get_manifest_path(idx, name)
+        if os.path.exists(manifest):
+            os.remove(manifest)
+
     def sync_items(self):
         """
         Sync from config
@@ -246,43 +449,117 @@ class Idx:
         path = path.replace("\\", "/").strip(r'\/')
         return path
 
-    def append(self, idx: str, files: dict):
+    def append(self, idx: str, files: dict) -> list:
         """
         Append indexed files to index
 
         :param idx: index id
         :param files: dict of indexed files
+        :return: list of updated file ids
         """
         if idx not in self.items:
             self.items[idx] = IndexItem()
             self.items[idx].id = idx
             self.items[idx].name = idx  # use index id as name
 
+        file_ids = []
         for path in files:
             file = files[path]
             file_id = self.to_file_id(path)
+            ts = datetime.datetime.now().timestamp()
             self.items[idx].items[file_id] = {
                 "path": path,
-                "indexed_ts": datetime.datetime.now().timestamp(),
+                "indexed_ts": ts,
                 "id": file,
             }
+            if file_id not in self.files:
+                self.files[file_id] = {}
+            self.files[file_id][idx] = ts
+            file_ids.append(file_id)
         self.save()
+        return file_ids
+
+    def remove(self, idx: str, paths: list) -> list:
+        """
+        Remove files from index items
 
-    def clear(self, idx: str):
+        :param idx: index id
+        :param paths: list of removed files
+        :return: list of removed file ids
+        """
+        file_ids = []
+        if idx not in self.items:
+            return file_ids
+        for path in paths:
+            file_id = self.to_file_id(path)
+            if file_id in self.items[idx].items:
+                del self.items[idx].items[file_id]
+            if file_id in self.files:
+                self.files[file_id].pop(idx, None)
+                if len(self.files[file_id]) == 0:
+                    del self.files[file_id]
+            file_ids.append(file_id)
+        self.save()
+        return file_ids
+
+    def get_doc_id(self, idx: str, path: str) -> str or None:
+        """
+        Get stored document id of indexed file
+
+        :param idx: index id
+        :param path: file path
+        :return: document id or None
+        """
+        file_id = self.to_file_id(path)
+        if idx in self.items and file_id in self.items[idx].items:
+            return self.items[idx].items[file_id]['id']
+
+    def clear(self, idx: str) -> list:
         """
         Clear index items
 
         :param idx: index id
+        :return: list of removed file ids
         """
+        file_ids = []
         if idx in self.items:
+            file_ids = list(self.items[idx].items.keys())
+            for file_id in file_ids:
+                if file_id in self.files:
+                    self.files[file_id].pop(idx, None)
+                    if len(self.files[file_id]) == 0:
+                        del self.files[file_id]
             self.items[idx].items = {}
             self.save()
+        return file_ids
+
+    def build_files(self):
+        """Build reverse map of indexed files: file_id => {idx: indexed_ts}"""
+        self.files = {}
+        for idx in self.items:
+            items = self.items[idx].items
+            for file_id in items:
+                if file_id not in self.files:
+                    self.files[file_id] = {}
+                self.files[file_id][idx] = items[file_id]['indexed_ts']
+
+    def get_file_status(self, file_id: str) -> dict:
+        """
+        Get indexes where file is indexed
+
+        :param file_id: file id
+        :return: dict: idx => indexed_ts
+        """
+        if file_id in self.files:
+            return self.files[file_id]
+        return {}
 
     def load(self):
         """
         Load indexes
         """
         self.items = self.provider.load()
+        self.build_files()
 
     def save(self):
         """Save indexes"""
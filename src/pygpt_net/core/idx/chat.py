@@ -6,12 +6,16 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.15 10:00:00                  #
+# Updated Date: 2024.01.17 14:00:00                  #
 # ================================================== #
 
+from concurrent.futures import ThreadPoolExecutor
+
 from llama_index.llms import ChatMessage, MessageRole
 from llama_index.prompts import ChatPromptTemplate
 from llama_index.memory import ChatMemoryBuffer
+from llama_index.response_synthesizers import get_response_synthesizer
+from llama_index.schema import QueryBundle
 
 from pygpt_net.item.ctx import CtxItem
 from pygpt_net.item.model import ModelItem
@@ -90,6 +94,82 @@ class Chat:
             response = index.as_query_engine().query(query)  # query with default prompt
         return str(response)
 
+    def retrieve(self, query: str, idxs: list, model: ModelItem, top_k: int = 3) -> list:
+        """
+        Retrieve top-k nodes from multiple indexes concurrently, merged and deduplicated by score
+
+        :param query: Query string
+        :param idxs: Index names
+        :param model: Model item
+        :param top_k: Number of nodes to return
+        :return: list of NodeWithScore
+        """
+        if model is None:
+            raise Exception("Model config not provided")
+
+        indexes = []
+        for idx in idxs:
+            if not self.storage.exists(idx):
+                raise Exception("Index not prepared: {}".format(idx))
+            indexes.append(self.storage.get(idx, model=model))  # get index
+        if len(indexes) == 0:
+            return []
+
+        # embed query once and share it between indexes
+        service_context = self.storage.get_service_context(model=model)
+        bundle = QueryBundle(
+            query_str=query,
+            embedding=service_context.embed_model.get_query_embedding(query),
+        )
+
+        def retrieve_from(index):
+            return index.as_retriever(similarity_top_k=top_k).retrieve(bundle)
+
+        with ThreadPoolExecutor(max_workers=len(indexes)) as executor:
+            results = list(executor.map(retrieve_from, indexes))
+
+        # merge, keep the best score for duplicated content
+        merged = {}
+        for nodes in results:
+            for node in nodes:
+                key = node.node.hash
+                if key not in merged or (node.score or 0) > (merged[key].score or 0):
+                    merged[key] = node
+        nodes = sorted(merged.values(), key=lambda n: n.score or 0, reverse=True)
+        return nodes[:top_k]
+
+    def query_multi(self, query: str, idxs: list, model: ModelItem, sys_prompt: str = None, top_k: int = 3) -> str:
+        """
+        Query multiple indexes with one synthesis call (merged retrieval)
+
+        :param query: Query string
+        :param idxs: Index names
+        :param model: Model item
+        :param sys_prompt: System prompt
+        :param top_k: Number of nodes used in synthesis
+        :return: Response
+        """
+        is_log = False
+        if self.window.core.config.has("llama.log") and self.window.core.config.get("llama.log"):
+            is_log = True
+
+        if is_log:
+            print("[LLAMA-INDEX] Query multiple indexes (merged)...")
+            print("[LLAMA-INDEX] Idx: {}, query: {}, model: {}".format(idxs, query, model.id if model else None))
+
+        nodes = self.retrieve(query, idxs, model, top_k)
+        if len(nodes) == 0:
+            return ""
+
+        service_context = self.storage.get_service_context(model=model)
+        tpl = self.get_custom_prompt(sys_prompt)
+        if tpl is not None:
+            synthesizer = get_response_synthesizer(service_context=service_context, text_qa_template=tpl)
+        else:
+            synthesizer = get_response_synthesizer(service_context=service_context)
+        response = synthesizer.synthesize(query, nodes=nodes)
+        return str(response)
+
     def chat(self, ctx: CtxItem, idx: str, model: ModelItem, sys_prompt: str = None, stream: bool = False) -> bool:
         """
         Chat using index
@@ -6,10 +6,11 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 21:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import os.path
+import time
 from pathlib import Path
 from sqlalchemy import text
 from llama_index import (
@@ -23,6 +24,7 @@ from pygpt_net.core.idx.loaders.json.base import JSONReader
 from pygpt_net.core.idx.loaders.simple_csv.base import SimpleCSVReader
 from pygpt_net.core.idx.loaders.epub.base import EpubReader
 from pygpt_net.core.idx.loaders.pandas_excel.base import PandasExcelReader
+from pygpt_net.core.idx.vector_store import SQLiteVectorStore
 
 
 class Indexing:
@@ -92,12 +94,61 @@ class Indexing:
                     documents = reader.load_data()
         return documents
 
-    def index_files(self, index, path: str = None) -> tuple:
+    def get_progress(self, start: float, docs: int, tokens: int, **kwargs) -> dict:
+        """
+        Prepare progress data with throughput counters
+
+        :param start: start time
+        :param docs: number of indexed documents
+        :param tokens: number of embedded tokens (estimated)
+        :return: progress data
+        """
+        elapsed = time.time() - start
+        data = {
+            "docs": docs,
+            "tokens": tokens,
+            "elapsed": elapsed,
+            "docs_per_sec": docs / elapsed if elapsed > 0 else 0,
+            "tokens_per_sec": tokens / elapsed if elapsed > 0 else 0,
+        }
+        data.update(kwargs)
+        return data
+
+    def insert_documents(self, index, documents: list, progress: callable = None,
+                         is_stopped: callable = None, state: dict = None, **kwargs) -> int:
+        """
+        Insert documents into index with progress and cancellation
+
+        :param index: Index instance
+        :param documents: list of documents
+        :param progress: progress callback (receives progress data)
+        :param is_stopped: returns True if job was cancelled
+        :param state: job state (start, docs, tokens), updated in place
+        :return: number of inserted documents
+        """
+        n = 0
+        for d in documents:
+            if is_stopped is not None and is_stopped():
+                break
+            index.insert(document=d)
+            n += 1
+            if state is not None:
+                state["docs"] += 1
+                state["tokens"] += self.window.core.tokens.from_str(d.get_content(), "text-embedding-ada-002")
+                if progress is not None:
+                    progress(self.get_progress(state["start"], state["docs"], state["tokens"], **kwargs))
+        return n
+
+    def index_files(self, index, path: str = None, progress: callable = None,
+                    is_stopped: callable = None, skip: dict = None) -> tuple:
         """
         Index all files in directory
 
         :param index: Index instance
         :param path: Path to file or directory
+        :param progress: progress callback (receives progress data)
+        :param is_stopped: returns True if job was cancelled
+        :param skip: already indexed files to skip (resumed job)
         :return: dict with indexed files, errors
         """
         indexed = {}
@@ -109,12 +160,27 @@ class Indexing:
         elif os.path.isfile(path):
             files = [path]
 
-        for file in files:   # per file to allow use of multiple loaders
+        state = {"start": time.time(), "docs": 0, "tokens": 0}
+        total = len(files)
+        for i, file in enumerate(files):   # per file to allow use of multiple loaders
+            if is_stopped is not None and is_stopped():
+                break
+            if skip is not None and file in skip:
+                continue
             try:
                 documents = self.get_documents(file)
+                num = self.insert_documents(index, documents, progress, is_stopped, state,
+                                            file=file, files_done=i, files_total=total)
+                if num < len(documents):
+                    # cancelled in the middle of the file, remove partial data and index it again on resume
+                    for d in documents[:num]:
+                        index.delete_ref_doc(d.id_, delete_from_docstore=True)
+                    break
                 for d in documents:
-                    index.insert(document=d)
                     indexed[file] = d.id_  # add to index
+                if progress is not None:
+                    progress(self.get_progress(state["start"], state["docs"], state["tokens"],
+                                               file=file, files_done=i + 1, files_total=total))
             except Exception as e:
                 errors.append(str(e))
                 print(e)
@@ -124,12 +190,46 @@ class Indexing:
 
         return indexed, errors
 
-    def get_db_data_from_ts(self, updated_ts: int = 0):
+    def remove_file(self, index, path: str, doc_id: str = None) -> int:
+        """
+        Remove file documents from index
+
+        :param index: Index instance
+        :param path: Path to file
+        :param doc_id: stored document id (if known)
+        :return: number of removed documents
+        """
+        ids = []
+        store = index.vector_store
+        if isinstance(store, SQLiteVectorStore):
+            # ref_doc_info is not available for stores keeping text, find documents in store
+            ids = store.get_ref_doc_ids(path)
+            if doc_id is not None and doc_id not in ids:
+                ids.append(doc_id)
+        else:
+            for id, info in index.ref_doc_info.items():
+                if id == doc_id or (info.metadata is not None and info.metadata.get('file_path') == path):
+                    ids.append(id)
+        for id in ids:
+            index.delete_ref_doc(id, delete_from_docstore=True)
+        return len(ids)
+
+    def get_db_data_from_ts(self, updated_ts: int = 0, last_id: int = 0) -> tuple:
+        """
+        Get ctx items from DB updated since timestamp (ordered by update time)
+
+        :param updated_ts: From timestamp
+        :param last_id: skip items with ID up to this one updated at timestamp (resumed job)
+        :return: list of documents, list of (updated_ts, item ID) for each document
+        """
         db = self.window.core.db.get_db()
         documents = []
+        positions = []
         query = f"""
         SELECT
-            'User: ' || ctx_item.input || '; Assistant: ' || ctx_item.output AS text
+            'User: ' || ctx_item.input || '; Assistant: ' || ctx_item.output AS text,
+            ctx_meta.updated_ts AS updated_ts,
+            ctx_item.id AS id
         FROM 
             ctx_item
         LEFT JOIN
@@ -137,14 +237,17 @@ class Indexing:
         ON
             ctx_item.meta_id = ctx_meta.id
         WHERE
-            ctx_meta.updated_ts >= {updated_ts}
+            ctx_meta.updated_ts > {int(updated_ts)}
+            OR (ctx_meta.updated_ts = {int(updated_ts)} AND ctx_item.id > {int(last_id)})
+        ORDER BY
+            ctx_meta.updated_ts ASC, ctx_item.id ASC
         """
         with db.connect() as connection:
             result = connection.execute(text(query))
             for item in result.fetchall():
-                doc_str = ", ".join([str(entry) for entry in item])
-                documents.append(Document(text=doc_str))
-        return documents
+                documents.append(Document(text=str(item.text)))
+                positions.append((int(item.updated_ts), int(item.id)))
+        return documents, positions
 
     def get_db_data_by_id(self, id: int = 0):
         db = self.window.core.db.get_db()
@@ -162,30 +265,52 @@ class Indexing:
                 documents.append(Document(text=doc_str))
         return documents
 
-    def index_db_by_meta_id(self, index, id: int = 0):
+    def index_db_by_meta_id(self, index, id: int = 0, progress: callable = None,
+                            is_stopped: callable = None) -> tuple:
+        """
+        Index records from db by meta id
+
+        :param index: Index instance
+        :param id: Meta id
+        :param progress: progress callback (receives progress data)
+        :param is_stopped: returns True if job was cancelled
+        :return: number of indexed records, errors
+        """
         errors = []
         n = 0
         try:
             documents = self.get_db_data_by_id(id)
-            for d in documents:
-                index.insert(document=d)
-                n += 1
+            state = {"start": time.time(), "docs": 0, "tokens": 0}
+            n = self.insert_documents(index, documents, progress, is_stopped, state, docs_total=len(documents))
         except Exception as e:
             errors.append(str(e))
             print(e)
             self.window.core.debug.log(e)
         return n, errors
 
-    def index_db_from_updated_ts(self, index, updated_ts: int = 0):
+    def index_db_from_updated_ts(self, index, updated_ts: int = 0, progress: callable = None,
+                                 is_stopped: callable = None, last_id: int = 0) -> tuple:
+        """
+        Index records from db by updated timestamp
+
+        :param index: Index instance
+        :param updated_ts: From timestamp
+        :param progress: progress callback (receives progress data)
+        :param is_stopped: returns True if job was cancelled
+        :param last_id: skip items with ID up to this one updated at timestamp (resumed job)
+        :return: number of indexed records, errors, (updated_ts, item ID) of last indexed record or None
+        """
         errors = []
         n = 0
+        last = None
         try:
-            documents = self.get_db_data_from_ts(updated_ts)
-            for d in documents:
-                index.insert(document=d)
-                n += 1
+            documents, positions = self.get_db_data_from_ts(updated_ts, last_id)
+            state = {"start": time.time(), "docs": 0, "tokens": 0}
+            n = self.insert_documents(index, documents, progress, is_stopped, state, docs_total=len(documents))
+            if n > 0:
+                last = positions[n - 1]
         except Exception as e:
             errors.append(str(e))
             print(e)
             self.window.core.debug.log(e)
-        return n, errors
+        return n, errors, last
@@ -6,10 +6,13 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 10:00:00                  #
+# Updated Date: 2024.01.17 12:00:00                  #
 # ================================================== #
 
+import json
 import os.path
+from collections import OrderedDict
+
 from llama_index import (
     VectorStoreIndex,
     ServiceContext,
@@ -19,9 +22,12 @@ from llama_index import (
 from llama_index.llms import OpenAI
 
 from pygpt_net.item.model import ModelItem
+from .vector_store import SQLiteVectorStore
 
 
 class Storage:
+    DEFAULT_CACHE_SIZE = 512  # MB
+
     def __init__(self, window=None):
         """
         Index storage core
@@ -29,7 +35,17 @@ class Storage:
         :param window: Window instance
         """
         self.window = window
-        self.indexes = {}
+        self.indexes = OrderedDict()  # loaded indexes, LRU order (oldest first)
+        self.meta = {}  # loaded indexes meta: mtime, size, service context key
+        self.contexts = {}  # service contexts cache, per model
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "contexts_hits": 0,
+            "contexts_misses": 0,
+        }
 
     def get_llm(self, model: ModelItem = None):
         """
@@ -59,27 +75,215 @@ class Storage:
             llm = OpenAI(temperature=0.0, model="gpt-3.5-turbo")
         return llm
 
+    def get_context_key(self, model: ModelItem = None) -> str:
+        """
+        Get service context cache key
+
+        :param model: Model item
+        :return: cache key
+        """
+        api_key = self.window.core.config.get('api_key')
+        if model is None:
+            return json.dumps(["__default__", api_key])
+        return json.dumps([model.id, model.llama_index, api_key], sort_keys=True, default=str)
+
     def get_service_context(self, model: ModelItem = None):
         """
-        Get service context
+        Get service context (cached per model)
 
         :param model: Model item
         :return: Service context
         """
+        key = self.get_context_key(model)
+        if key in self.contexts:
+            self.stats["contexts_hits"] += 1
+            self.prepare_env(model)  # restore env vars used by provider
+            return self.contexts[key]
+
+        self.stats["contexts_misses"] += 1
         llm = self.get_llm(model=model)
         if llm is None:
-            return ServiceContext.from_defaults()
-        return ServiceContext.from_defaults(llm=llm)
+            context = ServiceContext.from_defaults()
+        else:
+            context = ServiceContext.from_defaults(llm=llm)
+        self.contexts[key] = context
+        return context
+
+    def prepare_env(self, model: ModelItem = None):
+        """
+        Prepare ENV vars for cached service context
+
+        :param model: Model item
+        """
+        if model is not None and 'provider' in model.llama_index:
+            provider = model.llama_index['provider']
+            if provider in self.window.core.llm.llms:
+                try:
+                    self.window.core.llm.llms[provider].init(
+                        self.window, model, "llama_index", "")
+                    return
+                except Exception as e:
+                    print(e)
+        os.environ['OPENAI_API_KEY'] = self.window.core.config.get('api_key')
+
+    def get_path(self, id: str) -> str:
+        """
+        Get index directory path
+
+        :param id: Index name
+        :return: path
+        """
+        return os.path.join(self.window.core.config.get_user_dir('idx'), id)
+
+    def get_dir_info(self, id: str) -> tuple:
+        """
+        Get index directory last modification time and size on disk
+
+        :param id: Index name
+        :return: tuple (mtime, size in bytes)
+        """
+        mtime = 0
+        size = 0
+        path = self.get_path(id)
+        if os.path.exists(path):
+            for entry in os.scandir(path):
+                if entry.is_file():
+                    stat = entry.stat()
+                    size += stat.st_size
+                    if stat.st_mtime > mtime:
+                        mtime = stat.st_mtime
+        return mtime, size
+
+    def get_version(self, id: str) -> float:
+        """
+        Get index version (last modification time of index files)
+
+        :param id: Index name
+        :return: version
+        """
+        mtime, size = self.get_dir_info(id)
+        return mtime
+
+    def get_cache_limit(self) -> int:
+        """
+        Get memory budget for loaded indexes
+
+        :return: max size in bytes
+        """
+        limit = self.DEFAULT_CACHE_SIZE
+        if self.window.core.config.has('llama.idx.cache.max_size'):
+            limit = int(self.window.core.config.get('llama.idx.cache.max_size'))
+        return limit * 1024 * 1024
+
+    def get_cache_size(self) -> int:
+        """
+        Get estimated memory used by loaded indexes
+
+        :return: size in bytes
+        """
+        return sum(self.meta[id]['size'] for id in self.indexes if id in self.meta)
+
+    def is_valid(self, id: str) -> bool:
+        """
+        Check if cached index is still valid (not modified on disk)
+
+        :param id: Index name
+        :return: True if valid
+        """
+        if id not in self.indexes or id not in self.meta:
+            return False
+        mtime, size = self.get_dir_info(id)
+        return mtime == self.meta[id]['mtime']
+
+    def invalidate(self, id: str = None):
+        """
+        Remove index (or all indexes) from cache
+
+        :param id: Index name, None for all
+        """
+        if id is None:
+            ids = list(self.indexes.keys())
+        else:
+            ids = [id]
+        for key in ids:
+            if key in self.indexes:
+                del self.indexes[key]
+                self.stats["invalidations"] += 1
+            if key in self.meta:
+                del self.meta[key]
+
+    def clear_cache(self):
+        """Clear loaded indexes and service contexts cache"""
+        self.invalidate()
+        self.contexts = {}
+
+    def cache(self, id: str, index, context_key: str = None):
+        """
+        Put index into cache and evict least recently used indexes above the budget
+
+        :param id: Index name
+        :param index: Index
+        :param context_key: service context key
+        """
+        mtime, size = self.get_dir_info(id)
+        self.indexes[id] = index
+        self.indexes.move_to_end(id)
+        self.meta[id] = {
+            "mtime": mtime,
+            "size": size,
+            "context": context_key,
+        }
+        limit = self.get_cache_limit()
+        while len(self.indexes) > 1 and self.get_cache_size() > limit:
+            key = next(iter(self.indexes))
+            del self.indexes[key]
+            if key in self.meta:
+                del self.meta[key]
+            self.stats["evictions"] += 1
 
-    def exists(self, id: str = None):
+    def get_backend(self) -> str:
+        """
+        Get configured backend for new indexes
+
+        :return: backend name (simple, sqlite)
+        """
+        if self.window.core.config.has('llama.idx.storage'):
+            return self.window.core.config.get('llama.idx.storage')
+        return "simple"
+
+    def get_vector_store(self, id: str, create: bool = False) -> SQLiteVectorStore or None:
+        """
+        Get local vector store for index, None for default (SimpleVectorStore)
+
+        :param id: Index name
+        :param create: True if creating new index
+        :return: vector store or None
+        """
+        path = self.get_path(id)
+        if SQLiteVectorStore.is_store(path) or (create and self.get_backend() == "sqlite"):
+            return SQLiteVectorStore(path)
+
+    def get_storage_context(self, id: str, create: bool = False) -> StorageContext:
+        """
+        Get storage context for index
+
+        :param id: Index name
+        :param create: True if creating new index
+        :return: storage context
+        """
+        vector_store = self.get_vector_store(id, create=create)
+        if create:
+            return StorageContext.from_defaults(vector_store=vector_store)
+        return StorageContext.from_defaults(persist_dir=self.get_path(id), vector_store=vector_store)
+
+    def exists(self, id: str = None) -> bool:
         """
         Check if index exists
 
         :param id: Index name
         :return: True if exists
         """
-        path = os.path.join(self.window.core.config.get_user_dir('idx'), id)
-        return os.path.exists(path)
+        return os.path.exists(self.get_path(id))
 
     def create(self, id: str, model: str = None):
         """
@@ -89,14 +293,15 @@ class Storage:
         :param model: Model key
         """
         self.get_service_context()  # set env vars if needed
-        path = os.path.join(self.window.core.config.get_user_dir('idx'), id)
+        path = self.get_path(id)
         if not os.path.exists(path):
-            index = VectorStoreIndex([])  # create empty index
+            storage_context = self.get_storage_context(id, create=True)
+            index = VectorStoreIndex([], storage_context=storage_context)  # create empty index
             self.store(id=id, index=index)
 
     def get(self, id: str, model: ModelItem = None):
         """
-        Get index
+        Get index (from cache if loaded and not modified on disk)
 
         :param id: Index name
         :param model: Model item
@@ -105,10 +310,26 @@ class Storage:
         if not self.exists(id=id):
             self.create(id=id)
         service_context = self.get_service_context(model=model)
-        path = os.path.join(self.window.core.config.get_user_dir('idx'), id)
-        storage_context = StorageContext.from_defaults(persist_dir=path)
-        self.indexes[id] = load_index_from_storage(storage_context, service_context=service_context)
-        return self.indexes[id]
+        context_key = self.get_context_key(model)
+
+        if self.is_valid(id):
+            self.stats["hits"] += 1
+            index = self.indexes[id]
+            self.indexes.move_to_end(id)
+            if self.meta[id]['context'] != context_key:
+                # rebind in-memory storage to another model, without reading from disk
+                index = load_index_from_storage(index.storage_context, service_context=service_context)
+                self.indexes[id] = index
+                self.meta[id]['context'] = context_key
+            return index
+
+        if id in self.indexes:
+            self.invalidate(id)  # modified on disk
+        self.stats["misses"] += 1
+        storage_context = self.get_storage_context(id)
+        index = load_index_from_storage(storage_context, service_context=service_context)
+        self.cache(id, index, context_key)
+        return index
 
     def store(self, id: str, index=None):
         """
@@ -117,11 +338,13 @@ class Storage:
         :param id: Index name
         :param index: Index
         """
+        context_key = None
         if index is None:
             index = self.indexes[id]
-        path = os.path.join(self.window.core.config.get_user_dir('idx'), id)
-        index.storage_context.persist(persist_dir=path)
-        self.indexes[id] = index
+        if id in self.meta:
+            context_key = self.meta[id]['context']
+        index.storage_context.persist(persist_dir=self.get_path(id))
+        self.cache(id, index, context_key)  # refresh mtime
 
     def remove(self, id: str) -> bool:
         """
@@ -130,8 +353,12 @@ class Storage:
         :param id: Index name
         :return: True if success
         """
-        self.indexes[id] = None
-        path = os.path.join(self.window.core.config.get_user_dir('idx'), id)
+        if id in self.indexes:
+            vector_store = self.indexes[id].vector_store
+            if isinstance(vector_store, SQLiteVectorStore):
+                vector_store.close()  # release db and mapped vectors before removing files
+        self.invalidate(id)
+        path = self.get_path(id)
         if os.path.exists(path):
             for f in os.listdir(path):
                 os.remove(os.path.join(path, f))
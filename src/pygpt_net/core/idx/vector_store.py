@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, List
+
+import numpy as np
+from llama_index.schema import BaseNode
+from llama_index.vector_stores.types import (
+    VectorStoreQuery,
+    VectorStoreQueryResult,
+    FilterOperator,
+    FilterCondition,
+)
+from llama_index.vector_stores.utils import node_to_metadata_dict, metadata_dict_to_node
+
+
+class SQLiteVectorStore:
+    """
+    Local vector store: nodes and metadata in sqlite, normalized float32 vectors
+    appended to a flat file and memory-mapped for search.
+    """
+    DB_FILE = "nodes.db"
+    VECTORS_FILE = "vectors.f32"
+    CHUNK_SIZE = 65536  # rows per similarity batch
+
+    stores_text = True
+    is_embedding_query = True
+    flat_metadata = False
+
+    def __init__(self, path: str):
+        """
+        SQLite vector store
+
+        :param path: index directory
+        """
+        self.path = path
+        self.db_path = os.path.join(path, self.DB_FILE)
+        self.vectors_path = os.path.join(path, self.VECTORS_FILE)
+        self.lock = threading.RLock()
+        self.conn = None
+        self.dim = None
+        self.count = 0  # number of rows in vectors file
+        self.matrix = None  # memory-mapped vectors
+        self.deleted = None  # deleted rows mask, loaded on first query
+
+    @classmethod
+    def is_store(cls, path: str) -> bool:
+        """
+        Check if directory contains SQLite vector store
+
+        :param path: index directory
+        :return: True if exists
+        """
+        return os.path.exists(os.path.join(path, cls.DB_FILE))
+
+    @property
+    def client(self) -> Any:
+        """Get client."""
+        return self.get_conn()
+
+    def get_conn(self) -> sqlite3.Connection:
+        """
+        Get (or open) database connection
+
+        :return: sqlite connection
+        """
+        if self.conn is None:
+            os.makedirs(self.path, exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS nodes ("
+                "row INTEGER PRIMARY KEY, "
+                "node_id TEXT UNIQUE, "
+                "ref_doc_id TEXT, "
+                "metadata TEXT, "
+                "data TEXT, "
+                "deleted INTEGER DEFAULT 0)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_ref_doc_id ON nodes (ref_doc_id)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.conn.commit()
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+            if row is not None:
+                self.dim = int(row[0])
+                self.count = os.path.getsize(self.vectors_path) // (self.dim * 4)
+        return self.conn
+
+    def close(self):
+        """Close database connection and release mapped vectors"""
+        with self.lock:
+            self.matrix = None
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def add(self, nodes: List[BaseNode], **add_kwargs: Any) -> List[str]:
+        """
+        Add nodes with embeddings, vectors are appended (O(delta))
+
+        :param nodes: nodes with embeddings
+        :return: list of node ids
+        """
+        if not nodes:
+            return []
+        with self.lock:
+            conn = self.get_conn()
+            vectors = np.asarray([node.get_embedding() for node in nodes], dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors /= norms
+
+            dim = self.dim
+            if dim is None:
+                dim = vectors.shape[1]
+            elif vectors.shape[1] != dim:
+                raise Exception("Embedding dimension mismatch: {} != {}".format(vectors.shape[1], dim))
+
+            # row offsets from vectors file (rows without vector are not referenced)
+            size = 0
+            if os.path.exists(self.vectors_path):
+                size = os.path.getsize(self.vectors_path)
+            start = size // (dim * 4)
+            ids = []
+            try:
+                if size != start * dim * 4:
+                    self.truncate_vectors(start * dim * 4)  # incomplete row from interrupted write
+                if self.dim is None:
+                    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+                rows = []
+                for i, node in enumerate(nodes):
+                    data = node_to_metadata_dict(node, remove_text=False, flat_metadata=self.flat_metadata)
+                    # mark previous version of node as deleted
+                    conn.execute("UPDATE nodes SET deleted = 1, node_id = NULL WHERE node_id = ?", (node.node_id,))
+                    rows.append((
+                        start + i,
+                        node.node_id,
+                        node.ref_doc_id,
+                        json.dumps(node.metadata, default=str),
+                        json.dumps(data, default=str),
+                    ))
+                    ids.append(node.node_id)
+                conn.executemany(
+                    "INSERT INTO nodes (row, node_id, ref_doc_id, metadata, data) VALUES (?, ?, ?, ?, ?)", rows)
+                with open(self.vectors_path, "ab") as f:
+                    f.write(vectors.tobytes())
+                conn.commit()
+            except Exception:
+                # keep rows and vectors consistent: nothing from this batch is stored
+                conn.rollback()
+                self.truncate_vectors(start * dim * 4)
+                raise
+            self.dim = dim
+            self.count = start + len(nodes)
+            self.deleted = None  # reload on next query
+        return ids
+
+    def truncate_vectors(self, size: int):
+        """
+        Truncate vectors file to size (remove vectors of not committed rows)
+
+        :param size: size in bytes
+        """
+        if not os.path.exists(self.vectors_path) or os.path.getsize(self.vectors_path) <= size:
+            return
+        self.matrix = None  # release mapping
+        os.truncate(self.vectors_path, size)
+
+    def delete(self, ref_doc_id: str, **delete_kwargs: Any) -> None:
+        """
+        Delete nodes by ref_doc_id (rows are marked as deleted)
+
+        :param ref_doc_id: document id
+        """
+        with self.lock:
+            conn = self.get_conn()
+            conn.execute("UPDATE nodes SET deleted = 1, node_id = NULL WHERE ref_doc_id = ?", (ref_doc_id,))
+            conn.commit()
+            self.deleted = None
+
+    def get_ref_doc_ids(self, file_path: str) -> List[str]:
+        """
+        Return ids of documents stored from file
+
+        :param file_path: file path (file_path metadata)
+        :return: list of document ids
+        """
+        with self.lock:
+            conn = self.get_conn()
+            rows = conn.execute(
+                "SELECT DISTINCT ref_doc_id FROM nodes "
+                "WHERE deleted = 0 AND json_extract(metadata, '$.file_path') = ?", (file_path,)).fetchall()
+        return [row[0] for row in rows if row[0] is not None]
+
+    def get_matrix(self) -> np.ndarray or None:
+        """
+        Get memory-mapped vectors matrix
+
+        :return: matrix (rows x dim)
+        """
+        if self.count == 0 or self.dim is None:
+            return None
+        if self.matrix is None or self.matrix.shape[0] != self.count:
+            self.matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.count, self.dim))
+        return self.matrix
+
+    def get_deleted(self) -> np.ndarray:
+        """
+        Get deleted rows mask
+
+        :return: bool array
+        """
+        if self.deleted is None or self.deleted.shape[0] != self.count:
+            self.deleted = np.zeros(self.count, dtype=bool)
+            rows = [r[0] for r in self.get_conn().execute("SELECT row FROM nodes WHERE deleted = 1")]
+            if rows:
+                self.deleted[np.asarray(rows, dtype=np.int64)] = True
+        return self.deleted
+
+    def get_allowed(self, query: VectorStoreQuery) -> np.ndarray or None:
+        """
+        Get allowed rows mask from query filters (doc_ids, node_ids, metadata)
+
+        :param query: vector store query
+        :return: bool array or None if no filters
+        """
+        where = []
+        params = []
+        if query.doc_ids:
+            where.append("ref_doc_id IN ({})".format(",".join("?" * len(query.doc_ids))))
+            params.extend(query.doc_ids)
+        if query.node_ids:
+            where.append("node_id IN ({})".format(",".join("?" * len(query.node_ids))))
+            params.extend(query.node_ids)
+        if query.filters is not None and query.filters.filters:
+            ops = {
+                FilterOperator.EQ: "=",
+                FilterOperator.NE: "!=",
+                FilterOperator.GT: ">",
+                FilterOperator.LT: "<",
+                FilterOperator.GTE: ">=",
+                FilterOperator.LTE: "<=",
+            }
+            conditions = []
+            for item in query.filters.filters:
+                if item.operator not in ops:
+                    raise Exception("Unsupported filter operator: {}".format(item.operator))
+                conditions.append("json_extract(metadata, ?) {} ?".format(ops[item.operator]))
+                params.extend(["$." + json.dumps(item.key), item.value])
+            glue = " OR " if query.filters.condition == FilterCondition.OR else " AND "
+            where.append("(" + glue.join(conditions) + ")")
+        if not where:
+            return None
+        allowed = np.zeros(self.count, dtype=bool)
+        sql = "SELECT row FROM nodes WHERE " + " AND ".join(where)
+        rows = [r[0] for r in self.get_conn().execute(sql, params)]
+        if rows:
+            allowed[np.asarray(rows, dtype=np.int64)] = True
+        return allowed
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        """
+        Query top-k nodes by cosine similarity
+
+        :param query: vector store query
+        :return: query result
+        """
+        with self.lock:
+            self.get_conn()
+            matrix = self.get_matrix()
+            if matrix is None or query.query_embedding is None:
+                return VectorStoreQueryResult(nodes=[], similarities=[], ids=[])
+
+            q = np.asarray(query.query_embedding, dtype=np.float32)
+            norm = np.linalg.norm(q)
+            if norm > 0:
+                q /= norm
+
+            # vectorized similarity, in batches to limit memory usage of large indexes
+            scores = np.empty(self.count, dtype=np.float32)
+            for start in range(0, self.count, self.CHUNK_SIZE):
+                end = min(start + self.CHUNK_SIZE, self.count)
+                scores[start:end] = matrix[start:end] @ q
+
+            scores[self.get_deleted()] = -np.inf
+            allowed = self.get_allowed(query)
+            if allowed is not None:
+                scores[~allowed] = -np.inf
+
+            k = min(query.similarity_top_k, self.count)
+            if k <= 0:
+                return VectorStoreQueryResult(nodes=[], similarities=[], ids=[])
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            top = [int(row) for row in top if np.isfinite(scores[row])]
+
+            nodes = []
+            similarities = []
+            ids = []
+            if top:
+                sql = "SELECT row, node_id, data FROM nodes WHERE row IN ({})".format(",".join("?" * len(top)))
+                found = {r[0]: r for r in self.get_conn().execute(sql, top)}
+                for row in top:
+                    if row not in found:
+                        continue
+                    node = metadata_dict_to_node(json.loads(found[row][2]))
+                    nodes.append(node)
+                    similarities.append(float(scores[row]))
+                    ids.append(found[row][1])
+        return VectorStoreQueryResult(nodes=nodes, similarities=similarities, ids=ids)
+
+    def persist(self, persist_path: str = None, fs: Any = None) -> None:
+        """
+        Persist store (data is written on add, only commit pending changes)
+
+        :param persist_path: ignored, store is persisted in its own directory
+        :param fs: ignored
+        """
+        with self.lock:
+            if self.conn is not None:
+                self.conn.commit()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.18 22:00:00                  #
+# ================================================== #
+
+import os
+import signal
+import subprocess
+import threading
+import time
+
+
+class Process:
+    CHUNK_SIZE = 4096
+
+    def __init__(self, cmd: str, timeout: int = 0, max_bytes: int = 65536, cwd: str = None, callback=None):
+        """
+        Shell command with streamed output, timeout and limited capture
+
+        :param cmd: shell command
+        :param timeout: wall-clock timeout in seconds, 0 = no timeout
+        :param max_bytes: max captured bytes per stream (tail is kept)
+        :param cwd: working directory
+        :param callback: called with (stream name, decoded chunk) on every read
+        """
+        self.cmd = cmd
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.cwd = cwd
+        self.callback = callback
+        self.process = None
+        self.buffers = {"stdout": bytearray(), "stderr": bytearray()}
+        self.sizes = {"stdout": 0, "stderr": 0}  # total bytes read
+        self.code = None
+        self.timed_out = False
+        self.time = 0
+
+    def run(self) -> 'Process':
+        """
+        Run command and wait for exit (or timeout)
+
+        :return: self
+        """
+        start = time.time()
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True  # kill whole process group on timeout
+        self.process = subprocess.Popen(self.cmd, shell=True, cwd=self.cwd, stdin=subprocess.DEVNULL,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+        readers = [
+            threading.Thread(target=self.read, args=("stdout", self.process.stdout), daemon=True),
+            threading.Thread(target=self.read, args=("stderr", self.process.stderr), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            self.code = self.process.wait(timeout=self.timeout if self.timeout else None)
+        except subprocess.TimeoutExpired:
+            self.timed_out = True
+            self.kill()
+            self.code = self.process.wait()
+        for reader in readers:
+            reader.join(timeout=1)  # detached children may still hold pipes open
+        self.time = time.time() - start
+        return self
+
+    def read(self, name: str, stream):
+        """
+        Read stream incrementally (in reader thread)
+
+        :param name: stream name
+        :param stream: stream
+        """
+        buffer = self.buffers[name]
+        try:
+            while True:
+                chunk = stream.read1(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.sizes[name] += len(chunk)
+                buffer += chunk
+                if len(buffer) > self.max_bytes:
+                    del buffer[:len(buffer) - self.max_bytes]
+                if self.callback is not None:
+                    self.callback(name, chunk.decode("utf-8", errors="replace"))
+        except (OSError, ValueError):
+            pass
+
+    def kill(self):
+        """Kill process (with children)"""
+        try:
+            if os.name == 'nt':
+                subprocess.call(["taskkill", "/F", "/T", "/PID", str(self.process.pid)],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                os.killpg(self.process.pid, signal.SIGKILL)
+        except Exception:
+            self.process.kill()
+
+    def get_stdout(self) -> str:
+        """
+        Get captured stdout (tail)
+
+        :return: stdout
+        """
+        return self.buffers["stdout"].decode("utf-8", errors="replace")
+
+    def get_stderr(self) -> str:
+        """
+        Get captured stderr (tail)
+
+        :return: stderr
+        """
+        return self.buffers["stderr"].decode("utf-8", errors="replace")
+
+    def is_truncated(self) -> bool:
+        """
+        Check if output was truncated
+
+        :return: True if any stream exceeded max bytes
+        """
+        return any(self.sizes[name] > self.max_bytes for name in self.sizes)
+
+    def get_result(self) -> str:
+        """
+        Get result for model: captured output with truncation and timeout notes
+
+        :return: result
+        """
+        result = ""
+        if self.is_truncated():
+            result += "[output truncated, showing last {} bytes]\n".format(self.max_bytes)
+        result += self.get_stdout()
+        stderr = self.get_stderr()
+        if stderr:
+            if result and not result.endswith("\n"):
+                result += "\n"
+            result += stderr
+        if self.timed_out:
+            if result and not result.endswith("\n"):
+                result += "\n"
+            result += "[timeout after {} s, process killed]".format(self.timeout)
+        if not result:
+            result = "No result (STDOUT/STDERR empty)"
+        return result
@@ -6,11 +6,10 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.05 12:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import markdown
-from bs4 import BeautifulSoup
 
 
 class Parser:
@@ -38,6 +37,7 @@ class Parser:
         :param text: markdown text
         :return: html formatted text
         """
+        from bs4 import BeautifulSoup  # imported on first use
         self.init()
         try:
             html = self.md.convert(text.strip())
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.07 10:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import datetime
@@ -154,3 +154,5 @@ class CtxMeta:
         self.important = False
         self.archived = False
         self.label = 0  # label color
+        self.summary = None  # rolling summary of items dropped from prompt
+        self.summary_count = 0  # number of summarized items (from the beginning)
@@ -6,12 +6,9 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.14 11:00:00                  #
+# Updated Date: 2024.01.18 14:00:00                  #
 # ================================================== #
 
-from langchain_community.llms import Anthropic
-from langchain_community.chat_models import ChatAnthropic
-
 from pygpt_net.core.llm.base import BaseLLM
 from pygpt_net.item.model import ModelItem
 
@@ -31,6 +28,7 @@ class AnthropicLLM(BaseLLM):
         :param stream: stream mode
         :return: LLM provider instance
         """
+        from langchain_community.llms import Anthropic
         args = self.parse_args(model.langchain)
         return Anthropic(**args)
 
@@ -43,5 +41,6 @@ class AnthropicLLM(BaseLLM):
         :param stream: stream mode
         :return: LLM provider instance
         """
+        from langchain_community.chat_models import ChatAnthropic
         args = self.parse_args(model.langchain)
         return ChatAnthropic(**args)
@@ -6,12 +6,9 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.14 11:00:00                  #
+# Updated Date: 2024.01.18 14:00:00                  #
 # ================================================== #
 
-from langchain_community.llms import HuggingFaceTextGenInference
-from langchain_experimental.chat_models import Llama2Chat
-
 from pygpt_net.core.llm.base import BaseLLM
 from pygpt_net.item.model import ModelItem
 
@@ -42,6 +39,8 @@ class Llama2LLM(BaseLLM):
         :param stream: stream mode
         :return: LLM provider instance
         """
+        from langchain_community.llms import HuggingFaceTextGenInference
+        from langchain_experimental.chat_models import Llama2Chat
         args = self.parse_args(model.langchain)
         textgen = HuggingFaceTextGenInference(args)
         return Llama2Chat(llm=textgen)
@@ -6,14 +6,9 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.14 11:00:00                  #
+# Updated Date: 2024.01.18 14:00:00                  #
 # ================================================== #
 
-from langchain_community.llms import OpenAI
-from langchain_openai import ChatOpenAI
-from llama_index.llms import OpenAI as LlamaOpenAI
-
-
 from pygpt_net.core.llm.base import BaseLLM
 from pygpt_net.item.model import ModelItem
 
@@ -33,6 +28,7 @@ class OpenAILLM(BaseLLM):
         :param stream: stream mode
         :return: LLM provider instance
         """
+        from langchain_community.llms import OpenAI
         args = self.parse_args(model.langchain)
         return OpenAI(**args)
 
@@ -45,6 +41,7 @@ class OpenAILLM(BaseLLM):
         :param stream: stream mode
         :return: LLM provider instance
         """
+        from langchain_openai import ChatOpenAI
         args = self.parse_args(model.langchain)
         return ChatOpenAI(**args)
 
@@ -57,5 +54,6 @@ class OpenAILLM(BaseLLM):
         :param stream: stream mode
         :return: LLM provider instance
         """
+        from llama_index.llms import OpenAI as LlamaOpenAI
         args = self.parse_args(model.llama_index)
         return LlamaOpenAI(**args)
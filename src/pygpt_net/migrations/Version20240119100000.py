@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 10:00:00                  #
+# ================================================== #
+
+from sqlalchemy import text
+
+from .base import BaseMigration
+
+
+class Version20240119100000(BaseMigration):
+    def __init__(self, window=None):
+        super(Version20240119100000, self).__init__(window)
+        self.window = window
+
+    def up(self, conn):
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS cron_run (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            crontab TEXT,
+            prompt TEXT,
+            priority INTEGER,
+            coalesced INTEGER,
+            is_isolated BOOLEAN NOT NULL CHECK (is_isolated IN (0, 1)),
+            status TEXT,
+            error TEXT,
+            ctx_id INTEGER,
+            queued_ts REAL,
+            started_ts REAL,
+            finished_ts REAL,
+            duration REAL
+        );"""))
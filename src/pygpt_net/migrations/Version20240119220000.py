@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+from sqlalchemy import text
+
+from .base import BaseMigration
+
+
+class Version20240119220000(BaseMigration):
+    def __init__(self, window=None):
+        super(Version20240119220000, self).__init__(window)
+        self.window = window
+
+    def up(self, conn):
+        conn.execute(text("""
+        ALTER TABLE ctx_meta ADD COLUMN summary TEXT;"""))
+        conn.execute(text("""
+        ALTER TABLE ctx_meta ADD COLUMN summary_count INTEGER NOT NULL DEFAULT 0;"""))
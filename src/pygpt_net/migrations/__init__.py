@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.07 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from .Version20231227152900 import Version20231227152900  # 2.0.59
@@ -14,6 +14,8 @@ from .Version20231230095000 import Version20231230095000  # 2.0.66
 from .Version20231231230000 import Version20231231230000  # 2.0.71
 from .Version20240106060000 import Version20240106060000  # 2.0.84
 from .Version20240107060000 import Version20240107060000  # 2.0.88
+from .Version20240119100000 import Version20240119100000  # 2.0.109
+from .Version20240119220000 import Version20240119220000  # 2.0.109
 
 
 class Migrations:
@@ -33,4 +35,6 @@ class Migrations:
             Version20231231230000(),  # 2.0.71
             Version20240106060000(),  # 2.0.84
             Version20240107060000(),  # 2.0.88
+            Version20240119100000(),  # 2.0.109
+            Version20240119220000(),  # 2.0.109
         ]
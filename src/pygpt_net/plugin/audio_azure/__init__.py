@@ -6,14 +6,13 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.04 06:00:00                  #
+# Updated Date: 2024.01.19 20:00:00                  #
 # ================================================== #
 
-import os
+import queue
 
 from PySide6.QtCore import Slot
 
-from .worker import Worker
 from pygpt_net.plugin.base import BasePlugin
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
@@ -25,12 +24,13 @@ class Plugin(BasePlugin):
         self.id = "audio_azure"
         self.name = "Audio Output (MS Azure)"
         self.type = ['audio.output']
+        self.events = ['audio.output.stop', 'audio.output.stream', 'ctx.after', 'input.before']
         self.description = "Enables audio/voice output (speech synthesis) using Microsoft Azure API"
         self.input_text = None
         self.playback = None
+        self.stream = None  # queue of sentences of streamed output
         self.order = 9999
         self.use_locale = True
-        self.output_file = "output.mp3"
         self.init_options()
 
     def init_options(self):
@@ -85,7 +85,10 @@ class Plugin(BasePlugin):
         if name == 'input.before':
             self.on_input_before(data['value'])
         elif name == 'ctx.after':
-            self.on_ctx_after(ctx)
+            if data is None or not data.get('streamed'):  # not spoken while streaming
+                self.on_ctx_after(ctx)
+        elif name == 'audio.output.stream':
+            self.on_stream(data['text'], data['end'])
         elif name == 'audio.output.stop':
             self.stop_audio()
 
@@ -103,6 +106,49 @@ class Plugin(BasePlugin):
 
         :param ctx: CtxItem
         """
+        text = ctx.output
+        try:
+            worker = self.create_worker()
+            if worker is not None and text is not None and len(text) > 0:
+                worker.text = self.window.core.audio.clean_text(text)
+                self.window.threadpool.start(worker)
+
+        except Exception as e:
+            self.error(e)
+
+    def on_stream(self, text: str, end: bool = False):
+        """
+        Event: Sentence of streamed output
+
+        :param text: sentence (cleaned)
+        :param end: True if last sentence
+        """
+        try:
+            if self.stream is None:
+                if text == "":
+                    return
+                worker = self.create_worker()
+                if worker is None:
+                    return
+                worker.stream = queue.Queue()
+                self.stream = worker.stream
+                self.window.threadpool.start(worker)
+
+            if text != "":
+                self.stream.put(text)
+            if end:
+                self.stream.put(None)  # end of stream
+                self.stream = None
+
+        except Exception as e:
+            self.error(e)
+
+    def create_worker(self):
+        """
+        Create speech synthesis worker
+
+        :return: Worker or None if API is not configured
+        """
         # Check if api key is set
         api_key = self.get_option_value("azure_api_key")
         region = self.get_option_value("azure_region")
@@ -114,36 +160,26 @@ class Plugin(BasePlugin):
             self.window.ui.dialogs.alert("Azure Region is not set. Please set it in plugin settings.")
             return
 
-        text = ctx.output
-        path = os.path.join(self.window.core.config.path, self.output_file)
-        try:
-            if text is not None and len(text) > 0:
-                lang = self.window.core.config.get('lang')
-                if lang == "en":
-                    voice = self.get_option_value("voice_en")
-                else:
-                    voice = self.get_option_value("voice_pl")
-
-                # worker
-                worker = Worker()
-                worker.plugin = self
-                worker.api_key = api_key
-                worker.region = region
-                worker.voice = voice
-                worker.text = self.window.core.audio.clean_text(text)
-                worker.path = path
-
-                # signals
-                worker.signals.playback.connect(self.handle_playback)
-                worker.signals.stop.connect(self.handle_stop)
-                worker.signals.status.connect(self.handle_status)  # base handler
-                worker.signals.error.connect(self.handle_error)  # base handler
-
-                # start
-                self.window.threadpool.start(worker)
-
-        except Exception as e:
-            self.error(e)
+        lang = self.window.core.config.get('lang')
+        if lang == "en":
+            voice = self.get_option_value("voice_en")
+        else:
+            voice = self.get_option_value("voice_pl")
+
+        # worker
+        from .worker import Worker  # imported on first use
+        worker = Worker()
+        worker.plugin = self
+        worker.api_key = api_key
+        worker.region = region
+        worker.voice = voice
+
+        # signals
+        worker.signals.playback.connect(self.handle_playback)
+        worker.signals.stop.connect(self.handle_stop)
+        worker.signals.status.connect(self.handle_status)  # base handler
+        worker.signals.error.connect(self.handle_error)  # base handler
+        return worker
 
     def set_status(self, status: str):
         """
@@ -169,6 +205,17 @@ class Plugin(BasePlugin):
 
     def stop_audio(self):
         """Stop playing the audio"""
+        self.stop_stream()
+        self.stop_playback()
+
+    def stop_stream(self):
+        """Stop speaking of streamed output (remaining sentences are dropped)"""
+        if self.stream is not None:
+            self.stream.put(None)
+            self.stream = None
+
+    def stop_playback(self):
+        """Stop current playback"""
         if self.playback is not None:
             self.playback.stop()
             self.playback = None
@@ -185,4 +232,4 @@ class Plugin(BasePlugin):
     @Slot()
     def handle_stop(self):
         """Handle thread playback stop"""
-        self.stop_audio()
+        self.stop_playback()  # previous playback only
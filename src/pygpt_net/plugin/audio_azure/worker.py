@@ -6,10 +6,11 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
-import pygame
+import queue
+
 import requests
 
 from PySide6.QtCore import Slot, Signal
@@ -23,6 +24,8 @@ class WorkerSignals(BaseSignals):
 
 
 class Worker(BaseWorker):
+    STREAM_TIMEOUT = 120  # max seconds to wait for next sentence
+
     def __init__(self, *args, **kwargs):
         super(Worker, self).__init__()
         self.signals = WorkerSignals()
@@ -33,33 +36,60 @@ class Worker(BaseWorker):
         self.region = None
         self.text = None
         self.voice = None
-        self.path = None
+        self.stream = None  # queue of sentences, ends with None
 
     @Slot()
     def run(self):
         try:
-            url = f"https://{self.region}.tts.speech.microsoft.com/cognitiveservices/v1"
-            headers = {
-                "Ocp-Apim-Subscription-Key": self.api_key,
-                "Content-Type": "application/ssml+xml",
-                "X-Microsoft-OutputFormat": "audio-16khz-128kbitrate-mono-mp3"
-            }
-            body = f"<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' " \
-                   f"xml:lang='en-US'><voice name='{self.voice}'>{self.text}</voice></speak>"
-            response = requests.post(url, headers=headers, data=body.encode('utf-8'))
+            playback = self.plugin.window.core.audio.output.create()
+            self.stop_playback()  # stop previous playback
+            self.send(playback)  # send playback object to main thread
+
+            if self.stream is None:
+                self.speak(playback, self.text)
+                return
+
+            # next sentence is synthesized while previous one is playing
+            while not playback.stopped:
+                text = self.stream.get(timeout=self.STREAM_TIMEOUT)
+                if text is None:
+                    break
+                self.speak(playback, text)
+        except queue.Empty:
+            pass  # stream was abandoned
+        except Exception as e:
+            self.error(e)
+
+    def speak(self, playback, text: str):
+        """
+        Synthesize and play text (from cache if available)
+
+        :param playback: Playback
+        :param text: text to speak
+        """
+        audio = self.plugin.window.core.audio
+        data = audio.cache.get(self.plugin.id, self.voice, text)
+        if data is not None:
+            audio.output.play(playback, [data])
+            return
+
+        url = f"https://{self.region}.tts.speech.microsoft.com/cognitiveservices/v1"
+        headers = {
+            "Ocp-Apim-Subscription-Key": self.api_key,
+            "Content-Type": "application/ssml+xml",
+            "X-Microsoft-OutputFormat": "raw-24khz-16bit-mono-pcm"  # playable before the end of response
+        }
+        body = f"<speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' " \
+               f"xml:lang='en-US'><voice name='{self.voice}'>{text}</voice></speak>"
+        # streamed response, closed on exit (also if playback is stopped before the end)
+        with requests.post(url, headers=headers, data=body.encode('utf-8'), stream=True) as response:
             if response.status_code == 200:
-                with open(self.path, "wb") as file:
-                    file.write(response.content)
-                pygame.mixer.init()
-                playback = pygame.mixer.Sound(self.path)
-                self.stop_playback()  # stop previous playback
-                playback.play()
-                self.send(playback)  # send playback object to main thread
+                data = audio.output.play(playback, response.iter_content(4096))
+                if data is not None:
+                    audio.cache.put(self.plugin.id, self.voice, text, data)
             else:
                 msg = "Error: {} - {}".format(response.status_code, response.text)
                 self.error(msg)
-        except Exception as e:
-            self.error(e)
 
     def send(self, playback):
         """Send playback object to main thread"""
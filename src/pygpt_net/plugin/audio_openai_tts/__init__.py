@@ -6,17 +6,16 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.04 06:00:00                  #
+# Updated Date: 2024.01.19 20:00:00                  #
 # ================================================== #
 
-import os
+import queue
 
 from PySide6.QtCore import Slot
 
 from pygpt_net.plugin.base import BasePlugin
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
-from .worker import Worker
 
 
 class Plugin(BasePlugin):
@@ -25,14 +24,15 @@ class Plugin(BasePlugin):
         self.id = "audio_openai_tts"
         self.name = "Audio Output (OpenAI TTS)"
         self.type = ['audio.output']
+        self.events = ['audio.output.stop', 'audio.output.stream', 'audio.read_text', 'ctx.after', 'input.before']
         self.description = "Enables audio/voice output (speech synthesis) using OpenAI TTS (Text-To-Speech) API"
         self.allowed_voices = ['alloy', 'echo', 'fable', 'onyx', 'nova', 'shimmer']
         self.allowed_models = ['tts-1', 'tts-1-hd']
         self.input_text = None
         self.playback = None
+        self.stream = None  # queue of sentences of streamed output
         self.order = 1
         self.use_locale = True
-        self.output_file = "output.mp3"
         self.init_options()
 
     def init_options(self):
@@ -79,7 +79,10 @@ class Plugin(BasePlugin):
         if name == 'input.before':
             self.on_input_before(data['value'])
         elif name == 'ctx.after':
-            self.on_ctx_after(ctx)
+            if data is None or not data.get('streamed'):  # not spoken while streaming
+                self.on_ctx_after(ctx)
+        elif name == 'audio.output.stream':
+            self.on_stream(data['text'], data['end'])
         elif name == 'audio.read_text':
             self.on_ctx_after(ctx)
         elif name == 'audio.output.stop':
@@ -102,35 +105,67 @@ class Plugin(BasePlugin):
         text = ctx.output
         try:
             if text is not None and len(text) > 0:
-                # get config
-                voice = self.get_option_value('voice')
-                model = self.get_option_value('model')
-                if model not in self.allowed_models:
-                    model = 'tts-1'
-                if voice not in self.allowed_voices:
-                    voice = 'alloy'
-
-                # worker
-                worker = Worker()
-                worker.plugin = self
-                worker.client = self.window.core.gpt.get_client()
-                worker.model = model
-                worker.path = os.path.join(self.window.core.config.path, self.output_file)
-                worker.voice = voice
+                worker = self.create_worker()
                 worker.text = self.window.core.audio.clean_text(text)
+                self.window.threadpool.start(worker)
 
-                # signals
-                worker.signals.playback.connect(self.handle_playback)
-                worker.signals.stop.connect(self.handle_stop)
-                worker.signals.status.connect(self.handle_status)  # base handler
-                worker.signals.error.connect(self.handle_error)  # base handler
+        except Exception as e:
+            self.error(e)
 
-                # start
+    def on_stream(self, text: str, end: bool = False):
+        """
+        Event: Sentence of streamed output
+
+        :param text: sentence (cleaned)
+        :param end: True if last sentence
+        """
+        try:
+            if self.stream is None:
+                if text == "":
+                    return
+                worker = self.create_worker()
+                worker.stream = queue.Queue()
+                self.stream = worker.stream
                 self.window.threadpool.start(worker)
 
+            if text != "":
+                self.stream.put(text)
+            if end:
+                self.stream.put(None)  # end of stream
+                self.stream = None
+
         except Exception as e:
             self.error(e)
 
+    def create_worker(self):
+        """
+        Create speech synthesis worker
+
+        :return: Worker
+        """
+        # get config
+        voice = self.get_option_value('voice')
+        model = self.get_option_value('model')
+        if model not in self.allowed_models:
+            model = 'tts-1'
+        if voice not in self.allowed_voices:
+            voice = 'alloy'
+
+        # worker
+        from .worker import Worker  # imported on first use
+        worker = Worker()
+        worker.plugin = self
+        worker.client = self.window.core.gpt.get_client()
+        worker.model = model
+        worker.voice = voice
+
+        # signals
+        worker.signals.playback.connect(self.handle_playback)
+        worker.signals.stop.connect(self.handle_stop)
+        worker.signals.status.connect(self.handle_status)  # base handler
+        worker.signals.error.connect(self.handle_error)  # base handler
+        return worker
+
     def destroy(self):
         """Destroy thread"""
         pass
@@ -159,6 +194,17 @@ class Plugin(BasePlugin):
 
     def stop_audio(self):
         """Stop playing the audio"""
+        self.stop_stream()
+        self.stop_playback()
+
+    def stop_stream(self):
+        """Stop speaking of streamed output (remaining sentences are dropped)"""
+        if self.stream is not None:
+            self.stream.put(None)
+            self.stream = None
+
+    def stop_playback(self):
+        """Stop current playback"""
         if self.playback is not None:
             self.playback.stop()
             self.playback = None
@@ -175,4 +221,4 @@ class Plugin(BasePlugin):
     @Slot()
     def handle_stop(self):
         """Handle thread playback stop"""
-        self.stop_audio()
+        self.stop_playback()  # previous playback only
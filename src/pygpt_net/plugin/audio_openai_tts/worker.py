@@ -6,10 +6,10 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
-import pygame
+import queue
 
 from PySide6.QtCore import Slot, Signal
 from pygpt_net.plugin.base import BaseWorker, BaseSignals
@@ -21,6 +21,8 @@ class WorkerSignals(BaseSignals):
 
 
 class Worker(BaseWorker):
+    STREAM_TIMEOUT = 120  # max seconds to wait for next sentence
+
     def __init__(self, *args, **kwargs):
         super(Worker, self).__init__()
         self.signals = WorkerSignals()
@@ -29,27 +31,57 @@ class Worker(BaseWorker):
         self.plugin = None
         self.client = None
         self.model = None
-        self.path = None
         self.text = None
         self.voice = None
+        self.stream = None  # queue of sentences, ends with None
 
     @Slot()
     def run(self):
         try:
-            response = self.client.audio.speech.create(
-                model=self.model,
-                voice=self.voice,
-                input=self.text
-            )
-            response.stream_to_file(self.path)
-            pygame.mixer.init()
-            playback = pygame.mixer.Sound(self.path)
+            playback = self.plugin.window.core.audio.output.create()
             self.stop_playback()  # stop previous playback
-            playback.play()
             self.send(playback)  # send playback object to main thread
+
+            if self.stream is None:
+                self.speak(playback, self.text)
+                return
+
+            # next sentence is synthesized while previous one is playing
+            while not playback.stopped:
+                text = self.stream.get(timeout=self.STREAM_TIMEOUT)
+                if text is None:
+                    break
+                self.speak(playback, text)
+        except queue.Empty:
+            pass  # stream was abandoned
         except Exception as e:
             self.error(e)
 
+    def speak(self, playback, text: str):
+        """
+        Synthesize and play text (from cache if available)
+
+        :param playback: Playback
+        :param text: text to speak
+        """
+        audio = self.plugin.window.core.audio
+        voice = "{}.{}".format(self.model, self.voice)
+        data = audio.cache.get(self.plugin.id, voice, text)
+        if data is not None:
+            audio.output.play(playback, [data])
+            return
+
+        # streamed response, closed on exit (also if playback is stopped before the end)
+        with self.client.audio.speech.with_streaming_response.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="pcm",  # raw 24kHz 16-bit mono, playable before the end of response
+        ) as response:
+            data = audio.output.play(playback, response.iter_bytes(4096))
+        if data is not None:
+            audio.cache.put(self.plugin.id, voice, text, data)
+
     def send(self, playback):
         """Send playback object to main thread"""
         self.signals.playback.emit(playback)
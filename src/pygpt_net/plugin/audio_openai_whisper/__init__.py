@@ -6,18 +6,15 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.04 06:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
-import os
-
 from PySide6.QtCore import Slot
 
 from pygpt_net.plugin.base import BasePlugin
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
 from pygpt_net.utils import trans
-from .worker import Worker
 
 
 class Plugin(BasePlugin):
@@ -26,6 +23,15 @@ class Plugin(BasePlugin):
         self.id = "audio_openai_whisper"
         self.name = "Audio Input (OpenAI Whisper)"
         self.type = ['audio.input']
+        self.events = [
+            'audio.input.stop',
+            'audio.input.toggle',
+            'ctx.begin',
+            'ctx.end',
+            'disable',
+            'enable',
+            'input.before',
+        ]
         self.description = "Enables speech recognition using OpenAI Whisper API"
         self.input_text = None
         self.speech_enabled = False
@@ -38,7 +44,6 @@ class Plugin(BasePlugin):
         self.empty_phrases = ['Thank you for watching']  # phrases to ignore (fix for empty phrases)
         self.order = 1
         self.use_locale = True
-        self.input_file = "input.wav"
         self.init_options()
 
     def init_options(self):
@@ -122,6 +127,11 @@ class Plugin(BasePlugin):
                         "Represents approximately the fraction of the current energy threshold that "
                         "is retained after one second of dynamic threshold adjustment. Default: 0.15", min=0, max=100,
                         slider=True, multiplier=100, advanced=True)
+        self.add_option("recognition_dynamic_energy_ratio", "float", 1.5,
+                        "dynamic_energy_ratio",
+                        "Represents the ratio of the energy threshold to the ambient noise level "
+                        "when the threshold is adjusted dynamically. Default: 1.5", min=1, max=10,
+                        slider=True, multiplier=10, advanced=True)
         self.add_option("recognition_pause_threshold", "float", 0.8,
                         "pause_threshold",
                         "Represents the minimum length of silence (in seconds) that will "
@@ -273,10 +283,10 @@ class Plugin(BasePlugin):
 
         try:
             # worker
+            from .worker import Worker  # imported on first use
             worker = Worker()
             worker.plugin = self
             worker.client = self.window.core.gpt.get_client()
-            worker.path = os.path.join(self.window.core.config.path, self.input_file)
 
             # signals
             worker.signals.finished.connect(self.handle_input)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 16:00:00                  #
+# ================================================== #
+
+import io
+import wave
+from collections import deque
+
+import numpy as np
+
+
+def rms(data: bytes, width: int = 2) -> float:
+    """
+    Return RMS (energy) of PCM audio data
+
+    :param data: raw PCM data
+    :param width: sample width in bytes
+    :return: RMS
+    """
+    dtype = {1: np.int8, 2: np.int16, 4: np.int32}[width]
+    samples = np.frombuffer(data[:len(data) - len(data) % width], dtype=dtype)
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
+
+
+def to_wav(data: bytes, rate: int, width: int = 2, name: str = "audio.wav") -> io.BytesIO:
+    """
+    Pack raw PCM data into in-memory WAV file (ready to upload)
+
+    :param data: raw PCM data (mono)
+    :param rate: sample rate
+    :param width: sample width in bytes
+    :param name: file name (used by API to detect format)
+    :return: WAV file object
+    """
+    file = io.BytesIO()
+    with wave.open(file, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(width)
+        wav.setframerate(rate)
+        wav.writeframes(data)
+    file.seek(0)
+    file.name = name
+    return file
+
+
+class Listener:
+    def __init__(self, rate: int, width: int = 2, chunk: int = 1024):
+        """
+        Voice activity detector: segments audio stream into phrases by energy (calibrated once)
+
+        :param rate: sample rate
+        :param width: sample width in bytes
+        :param chunk: samples per chunk
+        """
+        self.rate = rate
+        self.width = width
+        self.chunk = chunk
+        self.energy_threshold = 300
+        self.dynamic_energy_threshold = True
+        self.dynamic_energy_adjustment_damping = 0.15
+        self.dynamic_energy_ratio = 1.5
+        self.pause_threshold = 0.8  # seconds of silence that ends the phrase
+        self.non_speaking_duration = 0.5  # seconds of silence kept before the phrase
+        self.calibrated = False
+
+    def get_chunk_duration(self) -> float:
+        """
+        Return duration of one chunk in seconds
+
+        :return: seconds
+        """
+        return float(self.chunk) / self.rate
+
+    def adjust(self, energy: float):
+        """
+        Adjust energy threshold to ambient noise (asymmetric weighted average)
+
+        :param energy: chunk energy
+        """
+        damping = self.dynamic_energy_adjustment_damping ** self.get_chunk_duration()
+        target = energy * self.dynamic_energy_ratio
+        self.energy_threshold = self.energy_threshold * damping + target * (1 - damping)
+
+    def calibrate(self, read: callable, duration: float = 1.0):
+        """
+        Calibrate energy threshold to ambient noise
+
+        :param read: callable returning next chunk of audio data
+        :param duration: calibration duration in seconds
+        """
+        for _ in range(max(1, int(duration / self.get_chunk_duration()))):
+            self.adjust(rms(read(), self.width))
+        self.calibrated = True
+
+    def listen(self, read: callable, timeout: float = 0, phrase_limit: float = 0,
+               is_stopped: callable = None) -> bytes or None:
+        """
+        Read audio stream until phrase is spoken
+
+        :param read: callable returning next chunk of audio data
+        :param timeout: max seconds to wait for phrase start, 0 = no limit
+        :param phrase_limit: max phrase length in seconds, 0 = no limit
+        :param is_stopped: callable returning True if listening should be aborted
+        :return: raw PCM data of phrase or None if timeout or stopped
+        """
+        seconds = self.get_chunk_duration()
+        pause_chunks = int(np.ceil(self.pause_threshold / seconds))
+        before_chunks = int(np.ceil(self.non_speaking_duration / seconds))
+        limit_chunks = int(np.ceil(phrase_limit / seconds)) if phrase_limit > 0 else 0
+
+        # wait for phrase start, keep last silent chunks as phrase beginning
+        frames = deque(maxlen=before_chunks + 1)
+        elapsed = 0.0
+        while True:
+            if is_stopped is not None and is_stopped():
+                return None
+            if timeout > 0 and elapsed > timeout:
+                return None
+            data = read()
+            elapsed += seconds
+            frames.append(data)
+            energy = rms(data, self.width)
+            if energy > self.energy_threshold:
+                break
+            if self.dynamic_energy_threshold:
+                self.adjust(energy)
+
+        # read phrase until pause or limit
+        phrase = list(frames)
+        spoken = 1
+        silent = 0
+        while True:
+            if is_stopped is not None and is_stopped():
+                return None
+            if limit_chunks and spoken >= limit_chunks:
+                break
+            data = read()
+            phrase.append(data)
+            spoken += 1
+            if rms(data, self.width) > self.energy_threshold:
+                silent = 0
+            else:
+                silent += 1
+                if silent > pause_chunks:
+                    break
+
+        # remove trailing silence, but keep part of it
+        trim = max(0, silent - before_chunks)
+        if trim:
+            phrase = phrase[:-trim]
+        return b"".join(phrase)
@@ -6,17 +6,17 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import time
 import speech_recognition as sr
-import audioop
 
 from PySide6.QtCore import Slot
 
 from pygpt_net.utils import trans
 from pygpt_net.plugin.base import BaseWorker, BaseSignals
+from .capture import Listener, rms, to_wav
 
 
 class WorkerSignals(BaseSignals):
@@ -31,7 +31,6 @@ class Worker(BaseWorker):
         self.kwargs = kwargs
         self.plugin = None
         self.client = None
-        self.path = None
 
     @Slot()
     def run(self):
@@ -45,6 +44,15 @@ class Worker(BaseWorker):
             self.status('')
 
             with sr.Microphone() as source:
+                # one listener for all phrases, calibrated once
+                listener = Listener(source.SAMPLE_RATE, source.SAMPLE_WIDTH, source.CHUNK)
+
+                def read():
+                    return source.stream.read(source.CHUNK)
+
+                def is_stopped():
+                    return not self.plugin.listening or self.plugin.stop or self.plugin.window.is_closing
+
                 while self.plugin.listening and not self.plugin.window.is_closing:
                     self.status('')
 
@@ -58,23 +66,27 @@ class Worker(BaseWorker):
                         continue
 
                     try:
-                        recognizer = sr.Recognizer()
-
-                        # set recognizer options
-                        recognizer.energy_threshold = self.plugin.get_option_value('recognition_energy_threshold')
-                        recognizer.dynamic_energy_threshold = \
+                        # set listener options
+                        listener.dynamic_energy_threshold = \
                             self.plugin.get_option_value('recognition_dynamic_energy_threshold')
-                        recognizer.dynamic_energy_adjustment_damping = \
+                        listener.dynamic_energy_adjustment_damping = \
                             self.plugin.get_option_value('recognition_dynamic_energy_adjustment_damping')
-                        recognizer.dynamic_energy_adjustment_ratio = \
-                            self.plugin.get_option_value('recognition_dynamic_energy_adjustment_ratio')
-                        recognizer.pause_threshold = self.plugin.get_option_value('recognition_pause_threshold')
-                        adjust_duration = self.plugin.get_option_value('recognition_adjust_for_ambient_noise_duration')
-
-                        # adjust for ambient noise
-                        if self.plugin.get_option_value('adjust_noise'):
-                            recognizer.adjust_for_ambient_noise(source, duration=adjust_duration)
-                            self.plugin.is_first_adjust = False
+                        listener.dynamic_energy_ratio = \
+                            self.plugin.get_option_value('recognition_dynamic_energy_ratio')
+                        listener.pause_threshold = self.plugin.get_option_value('recognition_pause_threshold')
+                        listener.non_speaking_duration = min(listener.non_speaking_duration,
+                                                             listener.pause_threshold)
+
+                        # adjust for ambient noise (only once, then adjusted dynamically while waiting for phrase)
+                        if not listener.calibrated:
+                            listener.energy_threshold = \
+                                self.plugin.get_option_value('recognition_energy_threshold')
+                            if self.plugin.get_option_value('adjust_noise'):
+                                adjust_duration = \
+                                    self.plugin.get_option_value('recognition_adjust_for_ambient_noise_duration')
+                                listener.calibrate(read, adjust_duration)
+                                self.plugin.is_first_adjust = False
+                            listener.calibrated = True
 
                         timeout = self.plugin.get_option_value('timeout')
                         phrase_length = self.plugin.get_option_value('phrase_length')
@@ -96,65 +108,55 @@ class Worker(BaseWorker):
                                 self.status(trans('audio.speak.now'))
 
                         min_energy = self.plugin.get_option_value('min_energy')
-                        ambient_noise_energy = min_energy * recognizer.energy_threshold
+                        ambient_noise_energy = min_energy * listener.energy_threshold
 
-                        if timeout > 0 and phrase_length > 0:
-                            audio_data = recognizer.listen(source, timeout, phrase_length)
-                        elif timeout > 0:
-                            audio_data = recognizer.listen(source, timeout)
-                        else:
-                            audio_data = recognizer.listen(source)
+                        raw_data = listener.listen(read, timeout, phrase_length, is_stopped)
 
-                        if not self.plugin.can_listen():
+                        if raw_data is None or not self.plugin.can_listen():
                             continue
 
                         # transcript audio
-                        raw_data = audio_data.get_wav_data()
                         is_stop_word = False
 
                         if raw_data:
                             # check RMS / energy
-                            rms = audioop.rms(raw_data, 2)
+                            energy = int(rms(raw_data, listener.width))
                             if min_energy > 0:
                                 self.status("{}: {} / {} (x{})".
                                             format(trans('audio.speak.energy'),
-                                                   rms, int(ambient_noise_energy), min_energy))
-                            if rms < ambient_noise_energy:
+                                                   energy, int(ambient_noise_energy), min_energy))
+                            if energy < ambient_noise_energy:
                                 continue
 
-                            # save audio file
-                            with open(self.path, "wb") as audio_file:
-                                audio_file.write(raw_data)
-
-                            # transcribe
-                            with open(self.path, "rb") as audio_file:
-                                self.status(trans('audio.speak.wait'))
-                                transcript = self.client.audio.transcriptions.create(
-                                    model=self.plugin.get_option_value('model'),
-                                    file=audio_file,
-                                    response_format="text"
-                                )
-                                # handle transcript
-                                if transcript is not None and transcript.strip() != '':
-                                    # fix if empty phrase
-                                    is_empty_phrase = False
-                                    transcript_check = transcript.strip().lower()
-                                    for phrase in self.plugin.empty_phrases:
-                                        phrase_check = phrase.strip().lower()
-                                        if phrase_check in transcript_check:
-                                            is_empty_phrase = True
-                                            break
-
-                                    if is_empty_phrase:
-                                        continue
-
-                                    if self.plugin.can_listen():
-                                        self.response(transcript)
-
-                                    # stop listening if not continuous mode or stop word detected
-                                    stop_words = self.plugin.get_words('stop_words')
-                                    if len(stop_words) > 0:
-                                        is_stop_word = transcript.replace('.', '').strip().lower() in stop_words
+                            # transcribe (in-memory WAV file)
+                            audio_file = to_wav(raw_data, listener.rate, listener.width)
+                            self.status(trans('audio.speak.wait'))
+                            transcript = self.client.audio.transcriptions.create(
+                                model=self.plugin.get_option_value('model'),
+                                file=audio_file,
+                                response_format="text"
+                            )
+                            # handle transcript
+                            if transcript is not None and transcript.strip() != '':
+                                # fix if empty phrase
+                                is_empty_phrase = False
+                                transcript_check = transcript.strip().lower()
+                                for phrase in self.plugin.empty_phrases:
+                                    phrase_check = phrase.strip().lower()
+                                    if phrase_check in transcript_check:
+                                        is_empty_phrase = True
+                                        break
+
+                                if is_empty_phrase:
+                                    continue
+
+                                if self.plugin.can_listen():
+                                    self.response(transcript)
+
+                                # stop listening if not continuous mode or stop word detected
+                                stop_words = self.plugin.get_words('stop_words')
+                                if len(stop_words) > 0:
+                                    is_stop_word = transcript.replace('.', '').strip().lower() in stop_words
 
                         if not self.plugin.get_option_value('continuous_listen') or is_stop_word:
                             self.stopped()
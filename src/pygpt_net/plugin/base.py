@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.08 17:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from PySide6.QtCore import QObject, Signal, QRunnable, Slot
@@ -22,6 +22,7 @@ class BasePlugin:
         self.id = ""
         self.name = ""
         self.type = []  # audio.input, audio.output, text.input, text.output, image.input, image.output
+        self.events = None  # handled events names, None = all events
         self.description = ""
         self.urls = {}
         self.options = {}
@@ -136,6 +137,58 @@ class BasePlugin:
         if self.has_option(name):
             return self.options[name]["value"]
 
+    def has_cmd(self, cmd: str) -> bool:
+        """
+        Check if plugin executes command and returns its result (used by command scheduler)
+
+        :param cmd: command name
+        :return: True if plugin returns result of command
+        """
+        return False
+
+    def is_cmd_independent(self, cmd: str) -> bool:
+        """
+        Check if command has no side effects and can be executed concurrently with other commands
+
+        :param cmd: command name
+        :return: True if command is independent
+        """
+        return False
+
+    def prepare_request(self, item: dict) -> dict:
+        """
+        Prepare request item for command result
+
+        :param item: command item
+        :return: request item (with job tag of command scheduled by command controller)
+        """
+        request = {"cmd": item["cmd"]}
+        if "job" in item:
+            request["job"] = item["job"]  # used to match result with scheduled command
+        return request
+
+    def is_scheduled(self, cmds: list) -> bool:
+        """
+        Check if commands are scheduled by command controller (batch collects results and owns the reply)
+
+        :param cmds: commands list
+        :return: True if scheduled
+        """
+        return any("job" in item for item in cmds)
+
+    def handle_cmd_error(self, ctx: CtxItem, cmds: list, err: any):
+        """
+        Return error as result of commands not executed (command scheduler waits for result of every command)
+
+        :param ctx: context (CtxItem)
+        :param cmds: commands not executed
+        :param err: error
+        """
+        self.error(err)
+        for item in cmds:
+            ctx.results.append({"request": self.prepare_request(item), "result": "Error: {}".format(err)})
+            ctx.reply = True
+
     def attach(self, window):
         """
         Attach window to plugin
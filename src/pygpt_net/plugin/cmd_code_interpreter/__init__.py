@@ -6,15 +6,16 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.06 23:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
+from PySide6.QtCore import Slot
+
 from pygpt_net.plugin.base import BasePlugin
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
 
 from .runner import Runner
-from .worker import Worker
 
 
 class Plugin(BasePlugin):
@@ -22,6 +23,7 @@ class Plugin(BasePlugin):
         super(Plugin, self).__init__(*args, **kwargs)
         self.id = "cmd_code_interpreter"
         self.name = "Command: Code Interpreter"
+        self.events = ['cmd.execute', 'cmd.syntax']
         self.description = "Provides Python code execution"
         self.order = 100
         self.allowed_cmds = [
@@ -32,6 +34,7 @@ class Plugin(BasePlugin):
         self.use_locale = True
         self.init_options()
         self.runner = Runner(self)
+        self.output_ctx = None  # ctx with streamed command output
 
     def init_options(self):
         """Initialize options"""
@@ -48,12 +51,59 @@ class Plugin(BasePlugin):
         self.add_option("cmd_sys_exec", "bool", True,
                         "Enable: System Command Execute",
                         "Allows system commands execution")
+        self.add_option("timeout", "int", 120,
+                        "Execution timeout (seconds)",
+                        "Host process is killed after this time, 0 = no timeout",
+                        min=0, max=86400, advanced=True)
+        self.add_option("max_output", "int", 65536,
+                        "Max captured output (bytes)",
+                        "Only the last bytes of STDOUT/STDERR of host process or kept sandbox container "
+                        "are kept and returned",
+                        min=1, max=10000000, advanced=True)
+        self.add_option("kernel", "bool", False,
+                        "Persistent Python kernel (host)",
+                        "Executes generated code in a persistent Python process (one per conversation), "
+                        "variables and imports are kept between executions")
+        self.add_option("kernel_timeout", "int", 60,
+                        "Kernel execution timeout (seconds)",
+                        "Kernel is restarted if execution takes longer, 0 = no timeout",
+                        min=0, max=86400, advanced=True)
+        self.add_option("kernel_max_output", "int", 65536,
+                        "Kernel max output (chars)",
+                        "Max number of captured characters of STDOUT/STDERR returned from kernel",
+                        min=1, max=10000000, advanced=True)
         self.add_option("sandbox_docker", "bool", False,
                         "Sandbox (docker container)",
                         "Executes commands in sandbox (docker container). Docker must be installed and running.")
         self.add_option("sandbox_docker_image", "text", 'python:3.8-alpine',
                         "Docker image",
                         "Docker image to use for sandbox")
+        self.add_option("sandbox_docker_keep", "bool", True,
+                        "Keep sandbox container running",
+                        "Reuses one long-lived sandbox container between commands instead of starting "
+                        "a new container for every command", advanced=True)
+        self.add_option("sandbox_docker_timeout", "int", 120,
+                        "Sandbox execution timeout (seconds)",
+                        "Command in kept sandbox container is killed after this time (with timeout utility "
+                        "from image), 0 = no timeout", min=0, max=86400, advanced=True)
+        self.add_option("sandbox_docker_idle_timeout", "int", 300,
+                        "Sandbox idle timeout (seconds)",
+                        "Removes kept sandbox container after this many seconds of inactivity, 0 = never",
+                        min=0, max=86400, advanced=True)
+        self.add_option("sandbox_docker_mem_limit", "text", '512m',
+                        "Sandbox memory limit",
+                        "Memory limit for sandbox container, e.g. 512m, 1g, empty = no limit", advanced=True)
+        self.add_option("sandbox_docker_cpus", "float", 1.0,
+                        "Sandbox CPUs limit",
+                        "Number of CPUs available for sandbox container, 0 = no limit",
+                        min=0, max=64, advanced=True)
+        self.add_option("sandbox_docker_pids_limit", "int", 256,
+                        "Sandbox processes limit",
+                        "Max number of processes in sandbox container, 0 = no limit",
+                        min=0, max=65536, advanced=True)
+        self.add_option("sandbox_docker_network", "bool", True,
+                        "Sandbox network access",
+                        "Allows network access from sandbox container", advanced=True)
 
         # cmd syntax (prompt/instruction)
         self.add_option("syntax_code_execute", "textarea", '"code_execute": create and execute Python code, params: '
@@ -85,6 +135,15 @@ class Plugin(BasePlugin):
         """
         self.window = window
 
+    def on_post_update(self):
+        """On post update hook"""
+        self.runner.sandbox.check_idle()
+
+    def destroy(self):
+        """Remove sandbox container and stop kernels"""
+        self.runner.sandbox.stop()
+        self.runner.kernels.stop()
+
     def handle(self, event: Event, *args, **kwargs):
         """
         Handle dispatched event
@@ -113,6 +172,27 @@ class Plugin(BasePlugin):
             return True
         return False
 
+    def has_cmd(self, cmd: str) -> bool:
+        """
+        Check if plugin executes command and returns its result
+
+        :param cmd: command name
+        :return: True if plugin returns result of command
+        """
+        return cmd in self.allowed_cmds and self.is_cmd_allowed(cmd)
+
+    @Slot(object, str)
+    def handle_output(self, ctx: CtxItem, data: str):
+        """
+        Handle streamed command output (append to chat output)
+
+        :param ctx: CtxItem
+        :param data: output chunk
+        """
+        begin = ctx is not self.output_ctx
+        self.output_ctx = ctx
+        self.window.controller.chat.render.append_chunk(ctx, data, begin)
+
     def log(self, msg):
         """
         Log message to console
@@ -155,6 +235,7 @@ class Plugin(BasePlugin):
 
         try:
             # worker
+            from .worker import Worker  # imported on first use
             worker = Worker()
             worker.plugin = self
             worker.cmds = my_commands
@@ -166,13 +247,15 @@ class Plugin(BasePlugin):
             worker.signals.debug.connect(self.handle_debug)
             worker.signals.status.connect(self.handle_status)
             worker.signals.error.connect(self.handle_error)
+            worker.signals.output.connect(self.handle_output)
 
             # connect signals
             self.runner.signals = worker.signals
 
             # INTERNAL MODE (sync)
-            # if internal (autonomous) call then use synchronous call
-            if ctx.internal:
+            # if internal (autonomous) call then use synchronous call,
+            # scheduled commands (with job tags) are executed in worker, batch collects results and replies once
+            if ctx.internal and not self.is_scheduled(my_commands):
                 worker.run()
                 return
 
@@ -180,4 +263,4 @@ class Plugin(BasePlugin):
             self.window.threadpool.start(worker)
 
         except Exception as e:
-            self.error(e)
+            self.handle_cmd_error(ctx, my_commands, e)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.18 20:00:00                  #
+# ================================================== #
+
+import json
+import os
+import queue
+import shlex
+import subprocess
+import threading
+from collections import OrderedDict
+
+# Kernel process source, written to config dir and started with python command template.
+# Protocol (both directions): "<length>\n" header followed by JSON payload of <length> bytes.
+KERNEL_SOURCE = '''import io
+import json
+import os
+import sys
+import traceback
+
+
+class Capture(io.TextIOBase):
+    def __init__(self, limit):
+        self.limit = limit
+        self.size = 0
+        self.parts = []
+        self.truncated = False
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        left = self.limit - self.size
+        if left > 0:
+            self.parts.append(s[:left])
+        if len(s) > left:
+            self.truncated = True
+        self.size += len(s)
+        return len(s)
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+def main():
+    proto_in = os.fdopen(os.dup(0), "rb")
+    proto_out = os.fdopen(os.dup(1), "wb")
+    null = os.open(os.devnull, os.O_RDWR)
+    os.dup2(null, 0)  # user code must not read or write protocol streams
+    os.dup2(null, 1)
+    scope = {"__name__": "__main__"}
+    while True:
+        header = proto_in.readline()
+        if not header:
+            break
+        request = json.loads(proto_in.read(int(header)).decode("utf-8"))
+        out = Capture(request["max_output"])
+        err = Capture(request["max_output"])
+        sys.stdout, sys.stderr = out, err
+        try:
+            exec(compile(request["code"], request["filename"], "exec"), scope)
+        except SystemExit:
+            pass
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        response = json.dumps({
+            "stdout": out.getvalue(),
+            "stderr": err.getvalue(),
+            "truncated": out.truncated or err.truncated,
+        }).encode("utf-8")
+        proto_out.write(str(len(response)).encode("utf-8") + b"\\n" + response)
+        proto_out.flush()
+
+
+main()
+'''
+
+
+class Kernel:
+    def __init__(self, cmd: str or list, cwd: str = None):
+        """
+        Persistent Python interpreter process
+
+        :param cmd: command to start kernel process
+        :param cwd: working directory
+        """
+        self.cmd = cmd
+        self.cwd = cwd
+        self.process = None
+        self.responses = None
+        self.lock = threading.Lock()
+
+    def is_alive(self) -> bool:
+        """
+        Check if kernel process is running
+
+        :return: True if running
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Start kernel process"""
+        self.process = subprocess.Popen(self.cmd, cwd=self.cwd, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.responses = queue.Queue()
+        threading.Thread(target=self.read, args=(self.process.stdout, self.responses), daemon=True).start()
+
+    def read(self, stream, responses: queue.Queue):
+        """
+        Read response frames from kernel (in reader thread)
+
+        :param stream: kernel stdout
+        :param responses: responses queue
+        """
+        try:
+            while True:
+                header = stream.readline()
+                if not header:
+                    break
+                responses.put(json.loads(stream.read(int(header)).decode("utf-8")))
+        except Exception:
+            pass
+        responses.put(None)  # EOF, process exited
+
+    def execute(self, code: str, filename: str = "<code>", timeout: int = 0, max_output: int = 65536) -> dict:
+        """
+        Execute code in kernel (state is kept between calls)
+
+        :param code: Python code
+        :param filename: filename used in tracebacks
+        :param timeout: timeout in seconds, 0 = no timeout
+        :param max_output: max captured chars per stream
+        :return: response dict: stdout, stderr, truncated, error
+        """
+        with self.lock:
+            if not self.is_alive():
+                self.start()
+            request = json.dumps({
+                "code": code,
+                "filename": filename,
+                "max_output": max_output,
+            }).encode("utf-8")
+            try:
+                self.process.stdin.write(str(len(request)).encode("utf-8") + b"\n" + request)
+                self.process.stdin.flush()
+                response = self.responses.get(timeout=timeout if timeout else None)
+            except queue.Empty:
+                self.stop()
+                return {"error": "Execution timeout after {} s, kernel restarted".format(timeout)}
+            except OSError:
+                response = None
+            if response is None:
+                try:
+                    exit_code = self.process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    exit_code = None
+                self.stop()
+                return {"error": "Kernel process exited (code: {}), kernel restarted".format(exit_code)}
+            return response
+
+    def stop(self):
+        """Kill kernel process"""
+        if self.process is not None:
+            try:
+                self.process.kill()
+                self.process.wait(timeout=5)
+            except Exception:
+                pass
+        self.process = None
+
+
+class Kernels:
+    LIMIT = 5  # max running kernels
+    SCRIPT = "kernel.py"
+
+    def __init__(self, runner=None):
+        """
+        Persistent kernels (one per conversation)
+
+        :param runner: Runner instance
+        """
+        self.runner = runner
+        self.plugin = runner.plugin
+        self.kernels = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_script(self) -> str:
+        """
+        Get kernel script path (write script if changed)
+
+        :return: script path
+        """
+        path = os.path.join(self.plugin.window.core.config.path, self.SCRIPT)
+        if os.path.exists(path):
+            with open(path, 'r', encoding="utf-8") as file:
+                if file.read() == KERNEL_SOURCE:
+                    return path
+        with open(path, 'w', encoding="utf-8") as file:
+            file.write(KERNEL_SOURCE)
+        return path
+
+    def get_cmd(self) -> str or list:
+        """
+        Get kernel start command from python command template
+
+        :return: command
+        """
+        path = self.get_script()
+        tpl = self.plugin.get_option_value('python_cmd_tpl')
+        if os.name == 'nt':
+            return tpl.format(filename='"{}"'.format(path))
+        return shlex.split(tpl.format(filename=shlex.quote(path)))
+
+    def get(self, key: any) -> Kernel:
+        """
+        Get kernel for conversation (the least recently used is stopped if limit is reached)
+
+        :param key: conversation key
+        :return: Kernel instance
+        """
+        with self.lock:
+            if key not in self.kernels:
+                while len(self.kernels) >= self.LIMIT:
+                    _, kernel = self.kernels.popitem(last=False)
+                    kernel.stop()
+                self.kernels[key] = Kernel(self.get_cmd(), self.plugin.window.core.config.get_user_dir('data'))
+            self.kernels.move_to_end(key)
+            return self.kernels[key]
+
+    def execute(self, key: any, code: str, filename: str) -> dict:
+        """
+        Execute code in conversation kernel
+
+        :param key: conversation key
+        :param code: Python code
+        :param filename: filename used in tracebacks
+        :return: response dict
+        """
+        kernel = self.get(key)
+        return kernel.execute(
+            code,
+            filename,
+            timeout=int(self.plugin.get_option_value('kernel_timeout')),
+            max_output=int(self.plugin.get_option_value('kernel_max_output')),
+        )
+
+    def stop(self):
+        """Stop all kernels"""
+        with self.lock:
+            for kernel in self.kernels.values():
+                kernel.stop()
+            self.kernels.clear()
@@ -6,12 +6,14 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 10:00:00                  #
+# Updated Date: 2024.01.18 22:00:00                  #
 # ================================================== #
 
 import os.path
-import subprocess
-import docker
+
+from pygpt_net.core.process import Process
+from .kernel import Kernels
+from .sandbox import Sandbox
 
 
 class Runner:
@@ -23,27 +25,40 @@ class Runner:
         """
         self.plugin = plugin
         self.signals = None
+        self.sandbox = Sandbox(self)
+        self.kernels = Kernels(self)
 
-    def handle_result(self, stdout, stderr):
+    def run_process(self, cmd: str, ctx=None) -> str:
         """
-        Handle result from subprocess
+        Run command on host with streamed output, timeout and output limit
 
-        :param stdout: stdout
-        :param stderr: stderr
+        :param cmd: command to run
+        :param ctx: CtxItem (streamed output is sent to it)
         :return: result
         """
-        result = None
-        if stdout:
-            result = stdout.decode("utf-8")
-            self.log("STDOUT: {}".format(result))
-        if stderr:
-            result = stderr.decode("utf-8")
-            self.log("STDERR: {}".format(result))
-        if result is None:
-            result = "No result (STDOUT/STDERR empty)"
-            self.log(result)
+        process = Process(
+            cmd,
+            timeout=int(self.plugin.get_option_value('timeout')),
+            max_bytes=int(self.plugin.get_option_value('max_output')),
+            callback=lambda name, data: self.handle_output(name, data, ctx),
+        )
+        process.run()
+        result = process.get_result()
+        self.log("Finished with code: {} ({:.2f} s)".format(process.code, process.time))
         return result
 
+    def handle_output(self, name: str, data: str, ctx=None):
+        """
+        Handle streamed output from process
+
+        :param name: stream name (stdout or stderr)
+        :param data: output chunk
+        :param ctx: CtxItem (output chunk is sent to it)
+        """
+        self.log("{}: {}".format(name.upper(), data.rstrip()))
+        if ctx is not None and self.signals is not None and hasattr(self.signals, "output"):
+            self.signals.output.emit(ctx, data)
+
     def handle_result_docker(self, response):
         """
         Handle result from docker container
@@ -51,10 +66,43 @@ class Runner:
         :param response: response
         :return: result
         """
-        result = response.decode('utf-8')
+        result = response
+        if isinstance(response, bytes):
+            result = response.decode('utf-8')  # one-shot container
         self.log("Result: {}".format(result), sandbox=True)
         return result
 
+    def handle_result_kernel(self, response: dict) -> str:
+        """
+        Handle result from persistent kernel
+
+        :param response: kernel response
+        :return: result
+        """
+        if "error" in response:
+            self.log(response["error"])
+            return response["error"]
+        result = response["stdout"]
+        if response["stderr"]:
+            result += response["stderr"]
+            self.log("STDERR: {}".format(response["stderr"]))
+        if response["stdout"]:
+            self.log("STDOUT: {}".format(response["stdout"]))
+        if response["truncated"]:
+            result += "\n[output truncated]"
+        if not result:
+            result = "No result (STDOUT/STDERR empty)"
+            self.log(result)
+        return result
+
+    def is_kernel(self) -> bool:
+        """
+        Check if persistent kernel is enabled
+
+        :return: True if kernel is enabled
+        """
+        return self.plugin.get_option_value('kernel')
+
     def is_sandbox(self):
         """
         Check if sandbox is enabled
@@ -71,6 +119,7 @@ class Runner:
         :return: docker client
         :rtype: docker.client.DockerClient
         """
+        import docker  # imported on first use in sandbox mode
         return docker.from_env()
 
     def get_docker_image(self):
@@ -97,13 +146,18 @@ class Runner:
         }
         return mapping
 
-    def run_docker(self, cmd):
+    def run_docker(self, cmd, ctx=None):
         """
-        Run docker container with command and return response
+        Run command in docker container and return response
 
         :param cmd: command to run
+        :param ctx: CtxItem (streamed output is sent to it, kept container only)
         :return: response
         """
+        if self.plugin.get_option_value('sandbox_docker_keep'):
+            # reuse warm container
+            return self.sandbox.execute(cmd, lambda name, data: self.handle_output(name, data, ctx))
+
         client = self.get_docker()
         mapping = self.get_volumes()
         return client.containers.run(self.get_docker_image(), cmd,
@@ -121,7 +175,7 @@ class Runner:
         self.log(msg, sandbox=True)
         cmd = self.plugin.get_option_value('python_cmd_tpl').format(filename=item["params"]['filename'])
         self.log("Running command: {}".format(cmd), sandbox=True)
-        response = self.run_docker(cmd)
+        response = self.run_docker(cmd, ctx)
         result = self.handle_result_docker(response)
         return {"request": request_item, "result": result}
 
@@ -146,7 +200,7 @@ class Runner:
         self.log(msg, sandbox=True)
         cmd = self.plugin.get_option_value('python_cmd_tpl').format(filename=item["params"]['filename'])
         self.log("Running command: {}".format(cmd), sandbox=True)
-        response = self.run_docker(cmd)
+        response = self.run_docker(cmd, ctx)
         result = self.handle_result_docker(response)
         return {"request": request_item, "result": result}
 
@@ -161,7 +215,7 @@ class Runner:
         msg = "Executing system command: {}".format(item["params"]['command'])
         self.log(msg, sandbox=True)
         self.log("Running command: {}".format(item["params"]['command']), sandbox=True)
-        response = self.run_docker(item["params"]['command'])
+        response = self.run_docker(item["params"]['command'], ctx)
         result = self.handle_result_docker(response)
         return {"request": request_item, "result": result}
 
@@ -186,10 +240,7 @@ class Runner:
         # run code
         cmd = self.plugin.get_option_value('python_cmd_tpl').format(filename=path)
         self.log("Running command: {}".format(cmd))
-        process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
-                                   stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
-        result = self.handle_result(stdout, stderr)
+        result = self.run_process(cmd, ctx)
         return {"request": request_item, "result": result}
 
     def code_execute_host(self, ctx, item, request_item):
@@ -209,13 +260,17 @@ class Runner:
             file.write(data)
             file.close()
 
+        # run code in persistent kernel (state is kept between calls in conversation)
+        if self.is_kernel():
+            self.log("Running code in kernel: {}".format(path))
+            response = self.kernels.execute(ctx.meta_id, data, path)
+            result = self.handle_result_kernel(response)
+            return {"request": request_item, "result": result}
+
         # run code
         cmd = self.plugin.get_option_value('python_cmd_tpl').format(filename=path)
         self.log("Running command: {}".format(cmd))
-        process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
-                                   stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
-        result = self.handle_result(stdout, stderr)
+        result = self.run_process(cmd, ctx)
         return {"request": request_item, "result": result}
 
     def sys_exec_host(self, ctx, item, request_item):
@@ -229,10 +284,7 @@ class Runner:
         msg = "Executing system command: {}".format(item["params"]['command'])
         self.log(msg)
         self.log("Running command: {}".format(item["params"]['command']))
-        process = subprocess.Popen(item["params"]['command'], shell=True, stdout=subprocess.PIPE,
-                                   stderr=subprocess.PIPE)
-        stdout, stderr = process.communicate()
-        result = self.handle_result(stdout, stderr)
+        result = self.run_process(item["params"]['command'], ctx)
         return {"request": request_item, "result": result}
 
     def error(self, err):
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import threading
+import time
+
+
+class Sandbox:
+    LABEL = "pygpt.sandbox"
+
+    def __init__(self, runner=None):
+        """
+        Long-lived docker sandbox container (reused between commands)
+
+        :param runner: Runner instance
+        """
+        self.runner = runner
+        self.plugin = runner.plugin
+        self.container = None
+        self.config = None  # container config used to create current container
+        self.last_used = 0
+        self.running = 0  # number of executions in progress
+        self.lock = threading.RLock()
+
+    def get_config(self) -> dict:
+        """
+        Get container config (image, volumes, limits)
+
+        :return: container config
+        """
+        config = {
+            "image": self.runner.get_docker_image(),
+            "volumes": self.runner.get_volumes(),
+            "network_disabled": not self.plugin.get_option_value('sandbox_docker_network'),
+        }
+        mem = self.plugin.get_option_value('sandbox_docker_mem_limit')
+        if mem:
+            config["mem_limit"] = str(mem)
+        cpus = self.plugin.get_option_value('sandbox_docker_cpus')
+        if cpus:
+            config["nano_cpus"] = int(float(cpus) * 1e9)
+        pids = self.plugin.get_option_value('sandbox_docker_pids_limit')
+        if pids:
+            config["pids_limit"] = int(pids)
+        return config
+
+    def is_running(self) -> bool:
+        """
+        Check if sandbox container is running
+
+        :return: True if running
+        """
+        if self.container is None:
+            return False
+        try:
+            self.container.reload()
+            return self.container.status == "running"
+        except Exception:
+            return False
+
+    def get_container(self):
+        """
+        Get running sandbox container (create if not exists or config changed)
+
+        :return: docker container
+        """
+        with self.lock:
+            config = self.get_config()
+            if self.config != config or not self.is_running():
+                self.stop()
+                client = self.runner.get_docker()
+                self.runner.log("Starting sandbox container: {}".format(config["image"]), sandbox=True)
+                self.container = client.containers.run(
+                    command=["tail", "-f", "/dev/null"],  # keep alive, commands are executed with exec_run
+                    working_dir="/data",
+                    detach=True,
+                    auto_remove=True,
+                    labels={self.LABEL: "1"},
+                    **config,
+                )
+                self.config = config
+            self.last_used = time.time()
+            return self.container
+
+    def get_exec_cmd(self, cmd: str, timeout: int) -> list:
+        """
+        Get command to execute in container (killed by timeout utility after timeout)
+
+        :param cmd: command to execute
+        :param timeout: timeout in seconds, 0 = no timeout
+        :return: exec command
+        """
+        if timeout:
+            return ["timeout", "-s", "KILL", str(timeout), "sh", "-c", cmd]
+        return ["sh", "-c", cmd]
+
+    def execute(self, cmd: str, callback: callable = None) -> str:
+        """
+        Execute command in sandbox container with streamed output, timeout and limited capture
+
+        :param cmd: command to execute
+        :param callback: called with (stream name, decoded chunk) on every read
+        :return: result: captured output (tail) with exit code, truncation and timeout notes
+        """
+        timeout = int(self.plugin.get_option_value('sandbox_docker_timeout') or 0)
+        max_bytes = int(self.plugin.get_option_value('max_output'))
+        with self.lock:
+            container = self.get_container()
+            self.running += 1
+        buffer = bytearray()
+        state = {"size": 0}
+        start = time.time()
+
+        def read(output):
+            for stdout, stderr in output:
+                for name, chunk in (("stdout", stdout), ("stderr", stderr)):
+                    if not chunk:
+                        continue
+                    state["size"] += len(chunk)
+                    buffer.extend(chunk)
+                    if len(buffer) > max_bytes:
+                        del buffer[:len(buffer) - max_bytes]
+                    if callback is not None:
+                        callback(name, chunk.decode("utf-8", errors="replace"))
+
+        try:
+            api = container.client.api
+            exec_id = api.exec_create(container.id, self.get_exec_cmd(cmd, timeout), workdir="/data")["Id"]
+            output = api.exec_start(exec_id, stream=True, demux=True)
+            reader = threading.Thread(target=read, args=(output,), daemon=True)
+            reader.start()
+            reader.join(timeout + 10 if timeout else None)  # exec is killed in container after timeout
+            code = None
+            if not reader.is_alive():
+                code = api.exec_inspect(exec_id).get("ExitCode")
+            timed_out = reader.is_alive() or (bool(timeout) and code == 137 and time.time() - start >= timeout)
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.last_used = time.time()
+
+        result = ""
+        if state["size"] > max_bytes:
+            result += "[output truncated, showing last {} bytes]\n".format(max_bytes)
+        result += buffer.decode("utf-8", errors="replace")
+        if result and not result.endswith("\n"):
+            result += "\n"
+        if timed_out:
+            result += "[timeout after {} s, process killed]".format(timeout)
+        elif code:
+            result += "[error: command returned non-zero exit code {}]".format(code)
+        elif not result:
+            result = "No result (STDOUT/STDERR empty)"
+        self.runner.log("Finished with code: {} ({:.2f} s)".format(code, time.time() - start), sandbox=True)
+        return result
+
+    def check_idle(self):
+        """Stop sandbox container after idle timeout (not while command is executed)"""
+        timeout = self.plugin.get_option_value('sandbox_docker_idle_timeout')
+        if not timeout:
+            return
+        with self.lock:
+            if self.container is None or self.running > 0:
+                return
+            if time.time() - self.last_used <= int(timeout):
+                return
+            container = self.container
+            self.container = None
+            self.config = None
+        # remove in background, do not block UI
+        threading.Thread(target=self.remove, args=(container,), daemon=True).start()
+
+    def remove(self, container):
+        """
+        Remove container
+
+        :param container: docker container
+        """
+        try:
+            container.remove(force=True)
+            self.runner.log("Sandbox container removed", sandbox=True)
+        except Exception as e:
+            print("Error removing sandbox container: {}".format(e))
+
+    def stop(self):
+        """Stop and remove sandbox container"""
+        with self.lock:
+            if self.container is not None:
+                self.remove(self.container)
+            self.container = None
+            self.config = None
@@ -6,16 +6,16 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Slot, Signal
 
 from pygpt_net.plugin.base import BaseWorker, BaseSignals
 
 
 class WorkerSignals(BaseSignals):
-    pass  # add custom signals here
+    output = Signal(object, str)  # ctx, streamed output chunk
 
 
 class Worker(BaseWorker):
@@ -30,10 +30,19 @@ class Worker(BaseWorker):
 
     @Slot()
     def run(self):
+        watcher = self.plugin.window.controller.idx.watcher
+        watcher.pause()  # scripts and outputs written to data dir are not indexed
+        try:
+            self.execute()
+        finally:
+            watcher.resume()
+
+    def execute(self):
+        """Execute commands"""
         msg = None
         for item in self.cmds:
             try:
-                request = {"cmd": item["cmd"]}  # prepare request item for result
+                request = self.plugin.prepare_request(item)  # prepare request item for result
 
                 # code_execute (from existing file)
                 if item["cmd"] == "code_execute_file" and self.plugin.is_cmd_allowed("code_execute_file"):
@@ -6,21 +6,20 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.06 23:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from pygpt_net.plugin.base import BasePlugin
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
 
-from .worker import Worker
-
 
 class Plugin(BasePlugin):
     def __init__(self, *args, **kwargs):
         super(Plugin, self).__init__(*args, **kwargs)
         self.id = "cmd_custom"
         self.name = "Command: Custom Commands"
+        self.events = ['cmd.execute', 'cmd.syntax']
         self.description = "Provides availability to create and execute custom commands"
         self.order = 100
         self.use_locale = True
@@ -48,6 +47,14 @@ class Plugin(BasePlugin):
         tooltip = "See the documentation for more details about examples, usage and list of predefined placeholders"
         self.add_option("cmds", "dict", value,
                         "Your custom commands", desc, tooltip, keys=keys)
+        self.add_option("timeout", "int", 120,
+                        "Execution timeout (seconds)",
+                        "Command process is killed after this time, 0 = no timeout",
+                        min=0, max=86400, advanced=True)
+        self.add_option("max_output", "int", 65536,
+                        "Max captured output (bytes)",
+                        "Only the last bytes of STDOUT/STDERR of command are kept and returned",
+                        min=1, max=10000000, advanced=True)
 
     def setup(self) -> dict:
         """
@@ -80,6 +87,15 @@ class Plugin(BasePlugin):
         elif name == 'cmd.execute':
             self.cmd(ctx, data['commands'])
 
+    def has_cmd(self, cmd: str) -> bool:
+        """
+        Check if plugin executes command and returns its result
+
+        :param cmd: command name
+        :return: True if plugin returns result of command
+        """
+        return any(item["name"] == cmd for item in self.get_option_value("cmds"))
+
     def log(self, msg: str):
         """
         Log message to console
@@ -149,6 +165,7 @@ class Plugin(BasePlugin):
 
         try:
             # worker
+            from .worker import Worker  # imported on first use
             worker = Worker()
             worker.plugin = self
             worker.cmds = my_commands
@@ -162,8 +179,9 @@ class Plugin(BasePlugin):
             worker.signals.error.connect(self.handle_error)
 
             # INTERNAL MODE (sync)
-            # if internal (autonomous) call then use synchronous call
-            if ctx.internal:
+            # if internal (autonomous) call then use synchronous call,
+            # scheduled commands (with job tags) are executed in worker, batch collects results and replies once
+            if ctx.internal and not self.is_scheduled(my_commands):
                 worker.run()
                 return
 
@@ -171,4 +189,4 @@ class Plugin(BasePlugin):
             self.window.threadpool.start(worker)
 
         except Exception as e:
-            self.error(e)
+            self.handle_cmd_error(ctx, my_commands, e)
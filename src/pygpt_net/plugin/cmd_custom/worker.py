@@ -6,14 +6,14 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.04 10:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import os.path
-import subprocess
 from datetime import datetime
 from PySide6.QtCore import Slot
 
+from pygpt_net.core.process import Process
 from pygpt_net.plugin.base import BaseWorker, BaseSignals
 
 
@@ -36,7 +36,7 @@ class Worker(BaseWorker):
         msg = None
         for item in self.cmds:
             for my_cmd in self.plugin.get_option_value("cmds"):
-                request = {"cmd": item["cmd"]}  # prepare request item for result
+                request = self.plugin.prepare_request(item)  # prepare request item for result
                 if my_cmd["name"] == item["cmd"]:
                     try:
                         # prepare cmd
@@ -65,19 +65,15 @@ class Worker(BaseWorker):
                         # execute custom cmd
                         msg = "Running custom cmd: {}".format(cmd)
                         self.log(msg)
-                        process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
-                                                   stderr=subprocess.PIPE)
-                        stdout, stderr = process.communicate()
-                        result = None
-                        if stdout:
-                            result = stdout.decode("utf-8")
-                            self.log("STDOUT: {}".format(result))
-                        if stderr:
-                            result = stderr.decode("utf-8")
-                            self.log("STDERR: {}".format(result))
-                        if result is None:
-                            result = "No result (STDOUT/STDERR empty)"
-                            self.log(result)
+                        process = Process(
+                            cmd,
+                            timeout=int(self.plugin.get_option_value("timeout")),
+                            max_bytes=int(self.plugin.get_option_value("max_output")),
+                            callback=self.handle_output,
+                        )
+                        process.run()
+                        result = process.get_result()
+                        self.log("Finished with code: {} ({:.2f} s)".format(process.code, process.time))
                         response = {"request": request, "result": result}
 
                     except Exception as e:
@@ -90,3 +86,12 @@ class Worker(BaseWorker):
         # update status
         if msg is not None:
             self.status(msg)
+
+    def handle_output(self, name: str, data: str):
+        """
+        Handle streamed output from process
+
+        :param name: stream name (stdout or stderr)
+        :param data: output chunk
+        """
+        self.log("{}: {}".format(name.upper(), data.rstrip()))
@@ -6,14 +6,14 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.06 23:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from pygpt_net.plugin.base import BasePlugin
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
 
-from .worker import Worker
+from .search import Search
 
 
 class Plugin(BasePlugin):
@@ -21,6 +21,7 @@ class Plugin(BasePlugin):
         super(Plugin, self).__init__(*args, **kwargs)
         self.id = "cmd_files"
         self.name = "Command: Files I/O"
+        self.events = ['cmd.execute', 'cmd.syntax']
         self.description = "Provides commands to read and write files"
         self.order = 100
         self.allowed_cmds = [
@@ -40,9 +41,21 @@ class Plugin(BasePlugin):
             "file_exists",
             "file_size",
             "file_info",
+            "search_files",
         ]
+        self.independent_cmds = [
+            "read_file",
+            "list_dir",
+            "is_dir",
+            "is_file",
+            "file_exists",
+            "file_size",
+            "file_info",
+            "search_files",
+        ]  # read-only, executed concurrently by scheduler
         self.use_locale = True
         self.init_options()
+        self.search = Search()
 
     def init_options(self):
         """Initialize options"""
@@ -79,9 +92,25 @@ class Plugin(BasePlugin):
                         "Enable: Get file size", "Allows `file_size` command execution")
         self.add_option("cmd_file_info", "bool", True,
                         "Enable: Get file info", "Allows `file_info` command execution")
+        self.add_option("cmd_search_files", "bool", True,
+                        "Enable: Search in files", "Allows `search_files` command execution")
+
+        self.add_option("read_max_bytes", "int", 100000,
+                        "Max bytes per read",
+                        "Max bytes returned by `read_file` at once, larger files are returned in parts, 0 = no limit",
+                        min=0, max=100000000, advanced=True)
+        self.add_option("search_limit", "int", 50,
+                        "Max search results",
+                        "Max number of matched lines returned by `search_files`",
+                        min=1, max=10000, advanced=True)
 
         # cmd syntax (prompt/instruction)
-        self.add_option("syntax_read_file", "textarea", '"read_file": read data from file, params: "filename"',
+        self.add_option("syntax_read_file", "textarea", '"read_file": read data from file, params: "filename", '
+                                                        'optional: "offset" and "max_bytes" (bytes range), '
+                                                        '"line_start" and "line_end" (lines range), "head" or "tail" '
+                                                        '(number of first or last lines); for large files result '
+                                                        'contains total "size" and "next_offset" or "next_line" '
+                                                        'to read next part',
                         "Syntax: read_file",
                         "Syntax for reading files", advanced=True)
         self.add_option("syntax_save_file", "textarea", '"save_file": save data to file, params: "filename", "data"',
@@ -131,6 +160,11 @@ class Plugin(BasePlugin):
         self.add_option("syntax_file_info", "textarea", '"file_info": get file info, params: "path"',
                         "Syntax: file_info",
                         "Syntax for getting file info", advanced=True)
+        self.add_option("syntax_search_files", "textarea", '"search_files": find text in files (case-insensitive), '
+                                                           'returns paths, line numbers and snippets, params: '
+                                                           '"query", optional: "path" (dir to search in), "limit"',
+                        "Syntax: search_files",
+                        "Syntax for searching in files", advanced=True)
 
     def setup(self) -> dict:
         """
@@ -175,6 +209,24 @@ class Plugin(BasePlugin):
             return True
         return False
 
+    def has_cmd(self, cmd: str) -> bool:
+        """
+        Check if plugin executes command and returns its result
+
+        :param cmd: command name
+        :return: True if plugin returns result of command
+        """
+        return cmd in self.allowed_cmds and self.is_cmd_allowed(cmd)
+
+    def is_cmd_independent(self, cmd: str) -> bool:
+        """
+        Check if command has no side effects and can be executed concurrently with other commands
+
+        :param cmd: command name
+        :return: True if command is independent
+        """
+        return cmd in self.independent_cmds
+
     def log(self, msg: str):
         """
         Log message to console
@@ -217,6 +269,7 @@ class Plugin(BasePlugin):
 
         try:
             # worker
+            from .worker import Worker  # imported on first use
             worker = Worker()
             worker.plugin = self
             worker.cmds = my_commands
@@ -230,8 +283,9 @@ class Plugin(BasePlugin):
             worker.signals.error.connect(self.handle_error)
 
             # INTERNAL MODE (sync)
-            # if internal (autonomous) call then use synchronous call
-            if ctx.internal:
+            # if internal (autonomous) call then use synchronous call,
+            # scheduled commands (with job tags) are executed in worker, batch collects results and replies once
+            if ctx.internal and not self.is_scheduled(my_commands):
                 worker.run()
                 return
 
@@ -239,4 +293,4 @@ class Plugin(BasePlugin):
             self.window.threadpool.start(worker)
 
         except Exception as e:
-            self.error(e)
+            self.handle_cmd_error(ctx, my_commands, e)
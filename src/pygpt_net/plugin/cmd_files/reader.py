@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import mmap
+import os
+
+
+class Reader:
+    PARAMS = ["offset", "max_bytes", "line_start", "line_end", "head", "tail"]
+
+    def __init__(self, max_bytes: int = 0):
+        """
+        Ranged file reader (reads only requested part of file)
+
+        :param max_bytes: default max bytes to read, 0 = no limit
+        """
+        self.max_bytes = max_bytes
+
+    def is_ranged(self, params: dict) -> bool:
+        """
+        Check if range params are in command params
+
+        :param params: command params
+        :return: True if ranged read is requested
+        """
+        return any(params.get(key) not in (None, "") for key in self.PARAMS)
+
+    def read(self, path: str, params: dict) -> str or dict:
+        """
+        Read file (whole file or range)
+
+        :param path: file path
+        :param params: command params: offset, max_bytes, line_start, line_end, head, tail
+        :return: file content or dict with content and range info if ranged or truncated
+        """
+        size = os.path.getsize(path)
+        max_bytes = int(params.get("max_bytes") or self.max_bytes or 0)
+        if not self.is_ranged(params) and (not max_bytes or size <= max_bytes):
+            with open(path, 'r', encoding="utf-8") as file:
+                return file.read()  # whole file, as before
+
+        if params.get("tail"):
+            result = self.read_tail(path, int(params["tail"]), max_bytes)
+        elif params.get("head"):
+            result = self.read_lines(path, 1, int(params["head"]), max_bytes)
+        elif params.get("line_start") or params.get("line_end"):
+            start = int(params.get("line_start") or 1)
+            end = int(params["line_end"]) if params.get("line_end") else None
+            result = self.read_lines(path, start, end, max_bytes)
+        else:
+            result = self.read_bytes(path, int(params.get("offset") or 0), max_bytes)
+        result["size"] = size
+        return result
+
+    def read_bytes(self, path: str, offset: int, max_bytes: int) -> dict:
+        """
+        Read bytes range
+
+        :param path: file path
+        :param offset: start offset
+        :param max_bytes: max bytes to read, 0 = to the end
+        :return: dict with data and range
+        """
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            data = file.read(max_bytes if max_bytes else -1)
+            end = offset + len(data)
+            more = file.read(1) != b""
+        result = {
+            "data": data.decode("utf-8", errors="ignore"),  # cut multibyte chars at range edges
+            "offset": offset,
+            "end": end,
+        }
+        if more:
+            result["next_offset"] = end
+        return result
+
+    def read_lines(self, path: str, start: int, end: int or None, max_bytes: int) -> dict:
+        """
+        Read lines range (streamed, file is read only to the last requested line)
+
+        :param path: file path
+        :param start: first line (1-based)
+        :param end: last line (inclusive), None = to the end
+        :param max_bytes: max bytes to return, 0 = no limit
+        :return: dict with data and lines range
+        """
+        lines = []
+        length = 0
+        last = start - 1
+        truncated = False
+        pos = 0  # byte offset of current line
+        with open(path, 'rb') as file:
+            for i, line in enumerate(file, 1):
+                if i < start:
+                    pos += len(line)
+                    continue
+                if end is not None and i > end:
+                    break
+                if max_bytes and length + len(line) > max_bytes:
+                    if not lines:
+                        # first line is longer than limit, return its part to continue by offset
+                        return {
+                            "data": line[:max_bytes].decode("utf-8", errors="ignore"),
+                            "lines": "{}-{}".format(i, i),
+                            "offset": pos,
+                            "end": pos + max_bytes,
+                            "next_offset": pos + max_bytes,
+                            "next_line": i + 1,
+                        }
+                    truncated = True
+                    break
+                lines.append(line)
+                length += len(line)
+                pos += len(line)
+                last = i
+        result = {
+            "data": b"".join(lines).decode("utf-8", errors="replace"),
+            "lines": "{}-{}".format(start, last),
+        }
+        if truncated:
+            result["next_line"] = last + 1
+        return result
+
+    def read_tail(self, path: str, count: int, max_bytes: int) -> dict:
+        """
+        Read last lines (file is mapped and searched backwards)
+
+        :param path: file path
+        :param count: number of lines
+        :param max_bytes: max bytes to return, 0 = no limit
+        :return: dict with data
+        """
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return {"data": "", "offset": 0}
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                end = len(data)
+                pos = end - 1 if data[end - 1:end] == b"\n" else end  # skip trailing newline
+                for _ in range(count):
+                    pos = data.rfind(b"\n", 0, pos)
+                    if pos == -1:
+                        break
+                start = pos + 1
+                if max_bytes and end - start > max_bytes:
+                    start = end - max_bytes
+                return {
+                    "data": data[start:end].decode("utf-8", errors="ignore"),
+                    "offset": start,
+                }
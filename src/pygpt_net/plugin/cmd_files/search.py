@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import os
+import threading
+import time
+
+
+class Search:
+    MAX_FILE_SIZE = 5 * 1024 * 1024  # larger files are not indexed
+    SNIPPET_LENGTH = 200
+    RESCAN_INTERVAL = 60  # seconds, full rescan (files modified in place do not change directory mtime)
+
+    def __init__(self):
+        """
+        Trigram index of files in directory (updated incrementally by mtime)
+        """
+        self.root = None
+        self.files = {}  # path => (mtime, size, trigrams)
+        self.postings = {}  # trigram => set of paths
+        self.dirs = {}  # dir path => (mtime, files: name => (mtime, size), subdirs names)
+        self.skipped = {}  # path => size (files too large to index)
+        self.last_scan = 0  # time of last full scan
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_trigrams(text: str) -> set:
+        """
+        Get trigrams of text (case-insensitive)
+
+        :param text: text
+        :return: set of trigrams
+        """
+        text = text.lower()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def read(self, path: str) -> str or None:
+        """
+        Read text file
+
+        :param path: file path
+        :return: file content or None if binary
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        if b"\0" in data[:8192]:
+            return None  # binary
+        return data.decode("utf-8", errors="replace")
+
+    def invalidate(self):
+        """Force full rescan on next search (after files are modified by commands)"""
+        self.last_scan = 0
+
+    def get_mtime(self, path: str) -> float or None:
+        """
+        Get directory modification time
+
+        :param path: directory path
+        :return: mtime or None if not exists
+        """
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def scan_dir(self, path: str) -> (dict, list):
+        """
+        List directory (not recursive)
+
+        :param path: directory path
+        :return: files: name => (mtime, size), subdirectories names
+        """
+        files = {}
+        dirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith('.'):
+                                dirs.append(entry.name)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[entry.name] = (stat.st_mtime, stat.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return files, dirs
+
+    def scan(self, root: str, full: bool = False) -> dict:
+        """
+        Scan directory recursively, directories not modified since last scan are not listed again
+
+        :param root: directory path
+        :param full: list all directories
+        :return: dict: path => (mtime, size)
+        """
+        found = {}
+        dirs = {}
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            mtime = self.get_mtime(path)
+            if mtime is None:
+                continue
+            item = self.dirs.get(path)
+            if full or item is None or item[0] != mtime:
+                files, subdirs = self.scan_dir(path)
+                item = (mtime, files, subdirs)
+            dirs[path] = item
+            for name, stat in item[1].items():
+                found[os.path.join(path, name)] = stat
+            stack.extend(os.path.join(path, name) for name in item[2])
+        self.dirs = dirs
+        return found
+
+    def remove(self, path: str):
+        """
+        Remove file from index
+
+        :param path: file path
+        """
+        _, _, trigrams = self.files.pop(path)
+        for trigram in trigrams:
+            paths = self.postings.get(trigram)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self.postings[trigram]
+
+    def add(self, path: str, mtime: float, size: int):
+        """
+        Add file to index
+
+        :param path: file path
+        :param mtime: modification time
+        :param size: file size
+        """
+        try:
+            text = self.read(path)
+        except OSError:
+            return
+        trigrams = self.get_trigrams(text) if text is not None else set()
+        self.files[path] = (mtime, size, trigrams)
+        for trigram in trigrams:
+            self.postings.setdefault(trigram, set()).add(path)
+
+    def update(self, root: str) -> int:
+        """
+        Update index: re-index new and modified files, remove deleted files
+
+        :param root: directory path
+        :return: number of re-indexed files
+        """
+        root = os.path.normpath(root)
+        if root != self.root:
+            self.root = root
+            self.files = {}
+            self.postings = {}
+            self.dirs = {}
+            self.last_scan = 0
+        now = time.time()
+        full = now - self.last_scan >= self.RESCAN_INTERVAL
+        if full:
+            self.last_scan = now
+        found = self.scan(root, full)
+        self.skipped = {p: item[1] for p, item in found.items() if item[1] > self.MAX_FILE_SIZE}
+        found = {p: item for p, item in found.items() if p not in self.skipped}
+        for path in [p for p in self.files if p not in found]:
+            self.remove(path)
+        updated = 0
+        for path, (mtime, size) in found.items():
+            current = self.files.get(path)
+            if current is not None and current[0] == mtime and current[1] == size:
+                continue
+            if current is not None:
+                self.remove(path)
+            self.add(path, mtime, size)
+            updated += 1
+        return updated
+
+    def search(self, root: str, query: str, path: str = None, limit: int = 50) -> dict:
+        """
+        Search files content
+
+        :param root: directory path
+        :param query: text to find (case-insensitive)
+        :param path: subdirectory or file to search in (relative to root)
+        :param limit: max number of matched lines
+        :return: dict with results (path, line, snippet), number of matched lines and files, skipped large files
+        """
+        with self.lock:
+            self.update(root)
+            needle = query.lower()
+            trigrams = self.get_trigrams(needle)
+            if trigrams:
+                candidates = None
+                for trigram in sorted(trigrams, key=lambda t: len(self.postings.get(t, ()))):
+                    paths = self.postings.get(trigram, set())
+                    candidates = set(paths) if candidates is None else candidates & paths
+                    if not candidates:
+                        break
+            else:
+                candidates = {p for p, item in self.files.items() if item[2]}  # short query, all text files
+            skipped = set(self.skipped)
+            if path:
+                prefix = os.path.normpath(os.path.join(self.root, path))
+                candidates = {p for p in candidates if p == prefix or p.startswith(prefix + os.sep)}
+                skipped = {p for p in skipped if p == prefix or p.startswith(prefix + os.sep)}
+
+        results = []
+        matched = 0
+        total = 0
+        for file_path in sorted(candidates):
+            try:
+                text = self.read(file_path)
+            except OSError:
+                continue
+            if text is None:
+                continue
+            found = False
+            for i, line in enumerate(text.splitlines(), 1):
+                if needle in line.lower():
+                    found = True
+                    total += 1
+                    if len(results) < limit:
+                        results.append({
+                            "path": os.path.relpath(file_path, self.root),
+                            "line": i,
+                            "snippet": line.strip()[:self.SNIPPET_LENGTH],
+                        })
+            if found:
+                matched += 1
+        result = {
+            "results": results,
+            "matches": total,
+            "files": matched,
+        }
+        if total > limit:
+            result["truncated"] = True
+        if skipped:
+            result["skipped"] = {
+                "info": "Files larger than {} MB are not searched".format(self.MAX_FILE_SIZE // (1024 * 1024)),
+                "paths": [os.path.relpath(p, self.root) for p in sorted(skipped)],
+            }
+        return result
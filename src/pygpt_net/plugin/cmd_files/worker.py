@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.04 10:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import mimetypes
@@ -17,6 +17,7 @@ from urllib.request import Request, urlopen
 from PySide6.QtCore import Slot
 
 from pygpt_net.plugin.base import BaseWorker, BaseSignals
+from .reader import Reader
 
 
 class WorkerSignals(BaseSignals):
@@ -39,7 +40,7 @@ class Worker(BaseWorker):
         for item in self.cmds:
             try:
                 if item["cmd"] in self.plugin.allowed_cmds and self.plugin.is_cmd_allowed(item["cmd"]):
-                    request = {"cmd": item["cmd"]}  # prepare request item for result
+                    request = self.plugin.prepare_request(item)  # prepare request item for result
 
                     # save file
                     if item["cmd"] == "save_file":
@@ -87,11 +88,10 @@ class Worker(BaseWorker):
                             path = os.path.join(self.plugin.window.core.config.get_user_dir('data'),
                                                 item["params"]['filename'])
                             if os.path.exists(path):
-                                with open(path, 'r', encoding="utf-8") as file:
-                                    data = file.read()
-                                    response = {"request": request, "result": data}
-                                    file.close()
-                                    self.log("File read: {}".format(path))
+                                reader = Reader(int(self.plugin.get_option_value("read_max_bytes")))
+                                data = reader.read(path, item["params"])
+                                response = {"request": request, "result": data}
+                                self.log("File read: {}".format(path))
                             else:
                                 response = {"request": request, "result": "File not found"}
                                 self.log("File not found: {}".format(path))
@@ -376,10 +376,35 @@ class Worker(BaseWorker):
                             self.log("Error: {}".format(e))
                         self.response(response)
 
+                    # search files
+                    elif item["cmd"] == "search_files" and self.plugin.is_cmd_allowed("search_files"):
+                        try:
+                            msg = "Searching files: {}".format(item["params"]['query'])
+                            self.log(msg)
+                            limit = item["params"].get('limit') or self.plugin.get_option_value("search_limit")
+                            data = self.plugin.search.search(
+                                self.plugin.window.core.config.get_user_dir('data'),
+                                item["params"]['query'],
+                                path=item["params"].get('path'),
+                                limit=min(int(limit), int(self.plugin.get_option_value("search_limit"))),
+                            )
+                            response = {"request": request, "result": data}
+                            self.log("Found: {} matches in {} files".format(data["matches"], data["files"]))
+                            if "skipped" in data:
+                                self.log("Skipped large files: {}".format(len(data["skipped"]["paths"])))
+                        except Exception as e:
+                            response = {"request": request, "result": "Error: {}".format(e)}
+                            self.error(e)
+                            self.log("Error: {}".format(e))
+                        self.response(response)
+
             except Exception as e:
                 self.response({"request": item, "result": "Error: {}".format(e)})
                 self.error(e)
                 self.log("Error: {}".format(e))
 
+            if not self.plugin.is_cmd_independent(item["cmd"]):
+                self.plugin.search.invalidate()  # files may be modified, rescan all on next search
+
         if msg is not None:
             self.status(msg)
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.06 23:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from pygpt_net.plugin.base import BasePlugin
@@ -14,7 +14,6 @@ from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
 
 from .websearch import WebSearch
-from .worker import Worker
 
 
 class Plugin(BasePlugin):
@@ -22,6 +21,7 @@ class Plugin(BasePlugin):
         super(Plugin, self).__init__(*args, **kwargs)
         self.id = "cmd_web_google"
         self.name = "Command: Google Web Search"
+        self.events = ['cmd.execute', 'cmd.syntax', 'input.before']
         self.description = "Allows to connect to the Web and search web pages for actual data."
         self.urls = {}
         self.input_text = None
@@ -155,6 +155,24 @@ class Plugin(BasePlugin):
         """
         self.input_text = text
 
+    def has_cmd(self, cmd: str) -> bool:
+        """
+        Check if plugin executes command and returns its result
+
+        :param cmd: command name
+        :return: True if plugin returns result of command
+        """
+        return cmd in self.allowed_cmds
+
+    def is_cmd_independent(self, cmd: str) -> bool:
+        """
+        Check if command has no side effects and can be executed concurrently with other commands
+
+        :param cmd: command name
+        :return: True if command is independent
+        """
+        return cmd in self.allowed_cmds  # read-only web requests
+
     def log(self, msg: str):
         """
         Log message to console
@@ -208,6 +226,7 @@ class Plugin(BasePlugin):
 
         try:
             # worker
+            from .worker import Worker  # imported on first use
             worker = Worker()
             worker.plugin = self
             worker.cmds = my_commands
@@ -222,8 +241,9 @@ class Plugin(BasePlugin):
             worker.signals.error.connect(self.handle_error)
 
             # INTERNAL MODE (sync)
-            # if internal (autonomous) call then use synchronous call
-            if ctx.internal:
+            # if internal (autonomous) call then use synchronous call,
+            # scheduled commands (with job tags) are executed in worker, batch collects results and replies once
+            if ctx.internal and not self.is_scheduled(my_commands):
                 worker.run()
                 return
 
@@ -231,7 +251,7 @@ class Plugin(BasePlugin):
             self.window.threadpool.start(worker)
 
         except Exception as e:
-            self.error(e)
+            self.handle_cmd_error(ctx, my_commands, e)
 
     def gen_api_key_response(self, ctx: CtxItem, cmds: list):
         """
@@ -241,7 +261,7 @@ class Plugin(BasePlugin):
         :param cmds: commands dict
         """
         for item in cmds:
-            request = {"cmd": item["cmd"]}
+            request = self.prepare_request(item)
             err = "Google API key or CX is not set. Please set credentials in plugin settings."
             self.log(err)
             self.window.ui.status(err)
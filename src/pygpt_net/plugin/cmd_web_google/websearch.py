@@ -13,7 +13,6 @@ import json
 import ssl
 
 import re
-from bs4 import BeautifulSoup
 from urllib.request import Request, urlopen
 from urllib.parse import quote
 
@@ -107,6 +106,7 @@ class WebSearch:
                 pass
 
             if html:
+                from bs4 import BeautifulSoup
                 soup = BeautifulSoup(html, "html.parser")
                 for element in soup.find_all('html'):
                     text += element.text
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2023.12.31 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from PySide6.QtCore import Slot
@@ -34,7 +34,7 @@ class Worker(BaseWorker):
 
         msg = None
         for item in self.cmds:
-            request = {"cmd": item["cmd"]}  # prepare request item for result
+            request = self.plugin.prepare_request(item)  # prepare request item for result
 
             try:
                 # cmd: web_search
@@ -6,14 +6,21 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.09 02:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
+from collections import deque
+
+from PySide6.QtCore import QTimer
+
 from pygpt_net.plugin.base import BasePlugin
 from pygpt_net.core.dispatcher import Event
+from pygpt_net.item.ctx import CtxItem
+from .queue import Queue
+from .runs import Runs
+from .scheduler import Scheduler
 
 from datetime import datetime
-from croniter import croniter
 
 
 class Plugin(BasePlugin):
@@ -22,11 +29,19 @@ class Plugin(BasePlugin):
         self.id = "crontab"
         self.name = "Crontab / Task scheduler"
         self.type = ['schedule']
+        self.events = [
+            'ctx.end',
+        ]
         self.description = "Plugin provides cron-based job scheduling - " \
                            "you can schedule prompts to be sent at any time using cron-based syntax for task setup."
         self.order = 100
         self.use_locale = True
-        self.timers = []
+        self.scheduler = Scheduler()
+        self.queue = Queue()
+        self.runs = Runs(self.window)
+        self.finished = deque()  # results of isolated jobs (from workers)
+        self.current = None  # job sent to current chat, waiting for response end
+        self.timer = None
         self.init_options()
 
     def init_options(self):
@@ -40,6 +55,7 @@ class Plugin(BasePlugin):
                 "use": "presets",
                 "keys": []
             },
+            "priority": "int",
         }
         value = [
             {
@@ -47,6 +63,7 @@ class Plugin(BasePlugin):
                 "crontab": "30 9 * * *",
                 "prompt": "Hi! This prompt should be sent at 9:30 every day. What time is it?",
                 "preset": "_",
+                "priority": 0,
             },
         ]
         desc = "Add your cron-style tasks here. They will be executed automatically at the times you specify in " \
@@ -58,6 +75,28 @@ class Plugin(BasePlugin):
         self.add_option("new_ctx", "bool", True,
                         "Create a new context on job run",
                         "If enabled, then a new context will be created on every run of the job")
+        self.add_option("missed", "combo", Scheduler.POLICY_ONCE,
+                        "Missed runs",
+                        "What to do with runs missed while the computer was asleep or hibernated: skip them, "
+                        "run once or run every missed run (catch up)",
+                        keys=[
+                            {Scheduler.POLICY_SKIP: "Skip"},
+                            {Scheduler.POLICY_ONCE: "Run once"},
+                            {Scheduler.POLICY_CATCH_UP: "Catch up"},
+                        ])
+        self.add_option("coalesce", "bool", True,
+                        "Coalesce pending runs",
+                        "If enabled, then a run of the task is not queued again while the previous run "
+                        "is still waiting in the queue")
+        self.add_option("isolated", "bool", False,
+                        "Run in isolated context",
+                        "If enabled, then jobs are executed in the background, each in its own new context, "
+                        "without using the current chat and its input (jobs may run concurrently)")
+        self.add_option("max_concurrency", "int", 1,
+                        "Max concurrent jobs",
+                        "Max number of isolated jobs running at once, jobs sent to the current chat "
+                        "are always executed one at a time, after the current response is finished",
+                        min=1, max=10)
 
     def setup(self) -> dict:
         """
@@ -74,6 +113,7 @@ class Plugin(BasePlugin):
         :param window: Window instance
         """
         self.window = window
+        self.runs.window = window
 
     def on_update(self):
         pass
@@ -82,7 +122,24 @@ class Plugin(BasePlugin):
         """
         On post update hook
         """
-        self.schedule_tasks()
+        crontab = self.get_option_value("crontab")
+        if self.scheduler.is_changed(crontab):
+            self.schedule_tasks()
+        elif self.timer is None or not self.timer.isActive():
+            self.arm()  # re-enabled
+        if self.finished:
+            self.handle_finished_jobs()
+        if self.current is not None and not self.is_busy():
+            # input unlocked without ctx end (e.g. prompt not sent)
+            self.finish_job(self.current, "Response not received")
+        if self.queue.count() > 0:
+            self.process_queue()
+
+    def destroy(self):
+        """Stop timer on app exit"""
+        if self.timer is not None:
+            self.timer.stop()
+        self.queue.clear()
 
     def handle(self, event: Event, *args, **kwargs):
         """
@@ -90,7 +147,24 @@ class Plugin(BasePlugin):
 
         :param event: event object
         """
-        pass
+        name = event.name
+        ctx = event.ctx
+
+        if name == 'ctx.end':
+            self.on_ctx_end(ctx)
+
+    def on_ctx_end(self, ctx: CtxItem):
+        """
+        Event: On ctx end (finish job sent to current chat)
+
+        :param ctx: CtxItem
+        """
+        if self.current is None:
+            return
+        error = None
+        if ctx is None or not ctx.output:
+            error = "Empty response"
+        self.finish_job(self.current, error, self.window.core.ctx.current)
 
     def job(self, item):
         """
@@ -120,59 +194,202 @@ class Plugin(BasePlugin):
         self.window.controller.chat.input.send(item["prompt"], force=True)
 
     def schedule_tasks(self):
-        """Schedule tasks based on crontab"""
-        crontab = self.get_option_value("crontab")
-        # remove unused or inactive items
-        for timer in self.timers:
-            if not timer["item"]["enabled"] or timer["item"] not in crontab:
-                self.timers.remove(timer)
-
-        for item in crontab:
-            try:
-                if not item["enabled"]:
-                    continue
-                cron = item["crontab"]
-                base_time = datetime.now()
-                iter = croniter(cron, base_time)
-
-                is_timer = False
-                timer = None
-                for timer in self.timers:
-                    if item == timer["item"]:
-                        is_timer = True
-                        break
-
-                # add to timers if not exists
-                if not is_timer:
-                    timer = {"item": item, "next_time": None}
-                    self.timers.append(timer)
-
-                next_time = timer["next_time"]
-
-                # if first run
-                if next_time is None:
-                    next_time = iter.get_next(datetime)
-                    timer["next_time"] = next_time
-                    continue
-
-                if datetime.now() >= next_time:
-                    next_time = iter.get_next(datetime)
-                    timer["next_time"] = next_time
-                    self.job(item)
-
-                timer["next_time"] = iter.get_next(datetime)
-            except Exception as e:
-                self.log("Error: {}".format(e))
+        """Schedule tasks based on crontab (called only when tasks are changed)"""
+        self.scheduler.load(self.get_option_value("crontab"), datetime.now())
+        for error in self.scheduler.errors:
+            self.log("Error: {}".format(error))
+        self.arm()
 
         # show number of scheduled jobs
-        num_jobs = len(self.timers)
+        num_jobs = self.scheduler.count()
         if num_jobs > 0:
             self.window.ui.plugin_addon['schedule'].setVisible(True)
-            self.window.ui.plugin_addon['schedule'].setText("+ Cron: {} job(s)".format(len(self.timers)))
+            self.window.ui.plugin_addon['schedule'].setText("+ Cron: {} job(s)".format(num_jobs))
         else:
             self.window.ui.plugin_addon['schedule'].setVisible(False)
             self.window.ui.plugin_addon['schedule'].setText("")
 
+    def arm(self):
+        """Arm single-shot timer for the nearest run"""
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.run_tasks)
+        next_time = self.scheduler.get_next_time()
+        if next_time is None:
+            self.timer.stop()
+            return
+        # wake up at least every minute to detect missed runs after sleep
+        delay = (next_time - datetime.now()).total_seconds()
+        self.timer.start(int(min(max(delay, 0), Scheduler.GRACE) * 1000))
+
+    def run_tasks(self):
+        """Execute due tasks and arm timer for the next run"""
+        if not self.window.controller.plugins.is_enabled(self.id):
+            return  # timer is armed again on enable
+        policy = self.get_option_value("missed")
+        coalesce = self.get_option_value("coalesce")
+        for item, runs in self.scheduler.get_due(datetime.now(), policy):
+            key = "{}|{}".format(item["crontab"], item["prompt"])
+            for _ in range(runs):
+                if not self.queue.add(key, item, self.get_priority(item), coalesce):
+                    self.log("Task is already queued, skipping run: {}".format(item["prompt"]))
+        self.process_queue()
+        self.arm()
+
+    def get_priority(self, item: dict) -> int:
+        """
+        Return task priority
+
+        :param item: task item
+        :return: priority (higher first)
+        """
+        try:
+            return int(item.get("priority") or 0)
+        except ValueError:
+            return 0
+
+    def is_busy(self) -> bool:
+        """
+        Check if chat is busy (response is generated or input is locked)
+
+        :return: True if busy
+        """
+        return self.window.controller.chat.input.generating or self.window.controller.chat.input.locked
+
+    def process_queue(self):
+        """Start queued jobs (as many as allowed)"""
+        isolated = self.get_option_value("isolated")
+        max_running = max(1, int(self.get_option_value("max_concurrency") or 1)) if isolated else 1
+        while True:
+            if not isolated and self.is_busy():
+                return  # wait for current response
+            job = self.queue.next(max_running)
+            if job is None:
+                return
+            job["isolated"] = isolated
+            if isolated:
+                self.start_worker(job)
+            else:
+                self.run_job(job)
+
+    def run_job(self, job: dict):
+        """
+        Execute job in current chat
+
+        :param job: job
+        """
+        self.current = job  # finished on ctx end
+        try:
+            self.job(job["item"])
+        except Exception as e:
+            self.log("Error: {}".format(e))
+            if self.current is job:
+                self.finish_job(job, str(e))
+            return
+        if self.current is job and not self.is_busy():
+            self.finish_job(job, "Prompt not sent")  # ctx end will not be dispatched
+
+    def finish_job(self, job: dict, error: str = None, ctx_id: int = None):
+        """
+        Finish job executed in current chat and store its run
+
+        :param job: job
+        :param error: error message
+        :param ctx_id: ctx meta ID
+        """
+        self.current = None
+        self.queue.finish(job)
+        self.store_run(job, error, ctx_id)
+
+    def start_worker(self, job: dict):
+        """
+        Execute job in background, in isolated context
+
+        :param job: job
+        """
+        item = job["item"]
+        if item["prompt"] == "" or item["prompt"] is None:
+            self.log("Prompt is empty, skipping task")
+            self.queue.finish(job)
+            return
+
+        self.log("Executing task (isolated): {}: {}".format(datetime.now(), item["prompt"]))
+        sys_prompt = self.window.core.config.get('prompt')
+        model = self.window.core.config.get('model')
+        if item["preset"] != "_" and item["preset"] is not None and self.window.core.presets.exists(item["preset"]):
+            preset = self.window.core.presets.items[item["preset"]]
+            sys_prompt = preset.prompt
+            if preset.model is not None:
+                model = preset.model
+
+        from .worker import Worker  # imported on first use
+        worker = Worker()
+        worker.plugin = self
+        worker.job = job
+        worker.sys_prompt = sys_prompt
+        worker.model = self.window.core.models.get_id(model)
+        worker.max_tokens = self.window.core.config.get('max_output_tokens')
+        worker.signals.finished.connect(self.handle_job_finished)
+        self.window.threadpool.start(worker)
+
+    def handle_job_finished(self, response: dict, ctx: CtxItem = None):
+        """
+        Handle finished isolated job (called from worker, handled on next update)
+
+        :param response: response with job and output or error
+        :param ctx: context (not used)
+        """
+        self.finished.append(response)
+
+    def handle_finished_jobs(self):
+        """Store results of finished isolated jobs"""
+        while self.finished:
+            response = self.finished.popleft()
+            job = response["job"]
+            self.queue.finish(job)
+            ctx_id = None
+            if "output" in response:
+                ctx_id = self.store_ctx(job, response["output"])
+            else:
+                self.log("Error: {}".format(response.get("error")))
+            self.store_run(job, response.get("error"), ctx_id)
+
+    def store_ctx(self, job: dict, output: str) -> int:
+        """
+        Store isolated job result in new context
+
+        :param job: job
+        :param output: response
+        :return: ctx meta ID
+        """
+        meta = self.window.core.ctx.build()
+        meta.name = "[CRON] {}".format(job["item"]["prompt"])[:100]
+        meta.initialized = True
+        meta.id = self.window.core.ctx.provider.create(meta)
+        self.window.core.ctx.meta[meta.id] = meta
+
+        item = CtxItem()
+        item.set_input(job["item"]["prompt"])
+        item.set_output(output)
+        if not self.window.core.ctx.provider.append_item(meta, item):
+            self.window.core.ctx.provider.save(meta.id, meta, [item])
+        self.window.controller.ctx.update(reload=True, all=False)  # refresh list, current ctx is not changed
+        return meta.id
+
+    def store_run(self, job: dict, error: str = None, ctx_id: int = None):
+        """
+        Store job run in runs log
+
+        :param job: job
+        :param error: error message
+        :param ctx_id: ctx meta ID
+        """
+        try:
+            self.runs.add(job, "error" if error else "success", error, ctx_id)
+        except Exception as e:
+            self.log("Error: {}".format(e))
+
     def log(self, msg: str):
         """
         Log message to console
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 10:00:00                  #
+# ================================================== #
+
+import heapq
+import time
+
+
+class Queue:
+    def __init__(self):
+        """
+        Jobs queue (by priority, then by order of adding)
+        """
+        self.heap = []  # (-priority, id)
+        self.pending = {}  # id => job
+        self.running = {}  # id => job
+        self.seq = 0
+
+    def add(self, key: str, item: dict, priority: int = 0, coalesce: bool = True) -> bool:
+        """
+        Add job to queue
+
+        :param key: job key (the same key for runs of the same task)
+        :param item: task item
+        :param priority: job priority (higher first)
+        :param coalesce: merge with pending run of the same task
+        :return: True if added, False if merged with pending run
+        """
+        if coalesce:
+            for job in self.pending.values():
+                if job["key"] == key:
+                    job["coalesced"] += 1
+                    if priority > job["priority"]:
+                        job["priority"] = priority
+                        heapq.heappush(self.heap, (-priority, job["id"]))
+                    return False
+        self.seq += 1
+        job = {
+            "id": self.seq,
+            "key": key,
+            "item": item,
+            "priority": priority,
+            "coalesced": 0,  # number of merged runs
+            "queued_ts": time.time(),
+            "started_ts": None,
+        }
+        self.pending[job["id"]] = job
+        heapq.heappush(self.heap, (-priority, job["id"]))
+        return True
+
+    def next(self, max_running: int = 1) -> dict or None:
+        """
+        Pop next job to run (runs of the same task never overlap)
+
+        :param max_running: max number of running jobs
+        :return: job or None if no job can be started now
+        """
+        if len(self.running) >= max_running:
+            return None
+        running = {job["key"] for job in self.running.values()}
+        skipped = []
+        found = None
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            job = self.pending.get(entry[1])
+            if job is None or -entry[0] != job["priority"]:
+                continue  # outdated entry (priority raised on coalesce)
+            if job["key"] in running:
+                skipped.append(entry)
+                continue
+            found = job
+            break
+        for entry in skipped:
+            heapq.heappush(self.heap, entry)
+        if found is None:
+            return None
+        del self.pending[found["id"]]
+        found["started_ts"] = time.time()
+        self.running[found["id"]] = found
+        return found
+
+    def finish(self, job: dict):
+        """
+        Remove finished job
+
+        :param job: job
+        """
+        self.running.pop(job["id"], None)
+
+    def count(self) -> int:
+        """
+        Return number of pending jobs
+
+        :return: number of pending jobs
+        """
+        return len(self.pending)
+
+    def clear(self):
+        """Remove all pending jobs"""
+        self.heap = []
+        self.pending = {}
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import time
+
+from sqlalchemy import text
+
+
+class Runs:
+    def __init__(self, window=None):
+        """
+        Jobs runs log (database)
+
+        :param window: Window instance
+        """
+        self.window = window
+
+    def add(self, job: dict, status: str, error: str = None, ctx_id: int = None) -> int:
+        """
+        Insert finished job run
+
+        :param job: job
+        :param status: run status (success, error)
+        :param error: error message
+        :param ctx_id: ctx meta ID
+        :return: inserted record ID
+        """
+        finished_ts = time.time()
+        started_ts = job["started_ts"] or finished_ts
+        stmt = text("""
+            INSERT INTO cron_run
+            (
+                crontab,
+                prompt,
+                priority,
+                coalesced,
+                is_isolated,
+                status,
+                error,
+                ctx_id,
+                queued_ts,
+                started_ts,
+                finished_ts,
+                duration
+            )
+            VALUES
+            (
+                :crontab,
+                :prompt,
+                :priority,
+                :coalesced,
+                :is_isolated,
+                :status,
+                :error,
+                :ctx_id,
+                :queued_ts,
+                :started_ts,
+                :finished_ts,
+                :duration
+            )
+        """).bindparams(
+            crontab=job["item"].get("crontab"),
+            prompt=job["item"].get("prompt"),
+            priority=job["priority"],
+            coalesced=job["coalesced"],
+            is_isolated=int(bool(job.get("isolated"))),
+            status=status,
+            error=error,
+            ctx_id=ctx_id,
+            queued_ts=job["queued_ts"],
+            started_ts=started_ts,
+            finished_ts=finished_ts,
+            duration=finished_ts - started_ts,
+        )
+        db = self.window.core.db.get_db()
+        with db.begin() as conn:
+            result = conn.execute(stmt)
+            return result.lastrowid
+
+    def get_last(self, limit: int = 100) -> list:
+        """
+        Return last runs
+
+        :param limit: max number of runs
+        :return: list of runs (dicts)
+        """
+        stmt = text("""
+            SELECT * FROM cron_run ORDER BY id DESC LIMIT :limit
+        """).bindparams(limit=limit)
+        runs = []
+        db = self.window.core.db.get_db()
+        with db.connect() as conn:
+            result = conn.execute(stmt)
+            for row in result:
+                runs.append(row._asdict())
+        return runs
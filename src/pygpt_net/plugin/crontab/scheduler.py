@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 08:00:00                  #
+# ================================================== #
+
+import copy
+import heapq
+from datetime import datetime
+
+from croniter import croniter
+
+
+class Scheduler:
+    POLICY_SKIP = "skip"  # missed runs are skipped
+    POLICY_ONCE = "once"  # missed runs are executed once
+    POLICY_CATCH_UP = "catch_up"  # every missed run is executed
+    GRACE = 60  # max delay (in seconds) of on-time run
+    MAX_CATCH_UP = 100  # max number of missed runs executed at once
+
+    def __init__(self):
+        """
+        Cron tasks scheduler (priority queue of next run times)
+        """
+        self.crontab = None  # copy of loaded tasks
+        self.queue = []  # heap: (next_time, idx)
+        self.iters = {}  # idx => croniter
+        self.items = {}  # idx => task item
+        self.errors = []
+
+    def is_changed(self, crontab: list) -> bool:
+        """
+        Check if tasks are changed since last load
+
+        :param crontab: tasks list
+        :return: True if changed
+        """
+        return crontab != self.crontab
+
+    def load(self, crontab: list, now: datetime) -> bool:
+        """
+        Build queue from tasks (only if tasks are changed)
+
+        :param crontab: tasks list
+        :param now: current time
+        :return: True if queue was rebuilt
+        """
+        if not self.is_changed(crontab):
+            return False
+        self.crontab = copy.deepcopy(crontab)
+        self.queue = []
+        self.iters = {}
+        self.items = {}
+        self.errors = []
+        for idx, item in enumerate(self.crontab):
+            if not item.get("enabled"):
+                continue
+            try:
+                iter = croniter(item["crontab"], now)
+                next_time = iter.get_next(datetime)
+            except Exception as e:
+                self.errors.append("{}: {}".format(item.get("crontab"), e))
+                continue
+            self.iters[idx] = iter
+            self.items[idx] = item
+            self.queue.append((next_time, idx))
+        heapq.heapify(self.queue)
+        return True
+
+    def count(self) -> int:
+        """
+        Return number of scheduled tasks
+
+        :return: number of tasks
+        """
+        return len(self.queue)
+
+    def get_next_time(self) -> datetime or None:
+        """
+        Return time of the nearest run
+
+        :return: next run time or None if no tasks
+        """
+        if not self.queue:
+            return None
+        return self.queue[0][0]
+
+    def get_runs(self, policy: str, missed: int, delay: float) -> int:
+        """
+        Return number of runs to execute
+
+        :param policy: missed runs policy
+        :param missed: number of run times passed since last check
+        :param delay: delay of the first passed run (in seconds)
+        :return: number of runs
+        """
+        if missed == 1 and delay <= self.GRACE:
+            return 1  # on time
+        if policy == self.POLICY_SKIP:
+            return 0
+        if policy == self.POLICY_CATCH_UP:
+            return min(missed, self.MAX_CATCH_UP)
+        return 1
+
+    def get_due(self, now: datetime, policy: str = POLICY_ONCE) -> list:
+        """
+        Pop tasks due to run and schedule their next runs
+
+        :param now: current time
+        :param policy: missed runs policy (after sleep, hibernate, etc.)
+        :return: list of (task item, number of runs)
+        """
+        due = []
+        while self.queue and self.queue[0][0] <= now:
+            run_time, idx = heapq.heappop(self.queue)
+            iter = self.iters[idx]
+            missed = 1
+            next_time = iter.get_next(datetime)
+            while next_time <= now:
+                missed += 1
+                if missed > self.MAX_CATCH_UP:
+                    iter = self.iters[idx] = croniter(self.items[idx]["crontab"], now)  # skip the rest
+                    next_time = iter.get_next(datetime)
+                    break
+                next_time = iter.get_next(datetime)
+            heapq.heappush(self.queue, (next_time, idx))
+            runs = self.get_runs(policy, missed, (now - run_time).total_seconds())
+            if runs > 0:
+                due.append((self.items[idx], runs))
+        return due
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 10:00:00                  #
+# ================================================== #
+
+from PySide6.QtCore import Slot
+from pygpt_net.plugin.base import BaseWorker, BaseSignals
+
+
+class WorkerSignals(BaseSignals):
+    pass  # add custom signals here
+
+
+class Worker(BaseWorker):
+    def __init__(self, *args, **kwargs):
+        super(Worker, self).__init__()
+        self.signals = WorkerSignals()
+        self.args = args
+        self.kwargs = kwargs
+        self.plugin = None
+        self.job = None
+        self.sys_prompt = None
+        self.model = None
+        self.max_tokens = None
+
+    @Slot()
+    def run(self):
+        """Run job in isolated context (current chat context is not used)"""
+        try:
+            output = self.plugin.window.core.gpt.quick_call(
+                prompt=self.job["item"]["prompt"],
+                sys_prompt=self.sys_prompt,
+                max_tokens=self.max_tokens,
+                model=self.model,
+                temp=1.0,
+            )
+            if output is None:
+                self.signals.finished.emit({"job": self.job, "error": "No response"}, None)
+            else:
+                self.signals.finished.emit({"job": self.job, "output": output}, None)
+        except Exception as e:
+            self.signals.finished.emit({"job": self.job, "error": str(e)}, None)
+            self.error(e)
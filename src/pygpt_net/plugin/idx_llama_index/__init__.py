@@ -6,9 +6,12 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.11 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
+import re
+import time
+
 from pygpt_net.plugin.base import BasePlugin
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
@@ -19,6 +22,7 @@ class Plugin(BasePlugin):
         super(Plugin, self).__init__(*args, **kwargs)
         self.id = "idx_llama_index"
         self.name = "Llama-index (inline)"
+        self.events = ['cmd.execute', 'cmd.only', 'input.before', 'post.prompt', 'system.prompt']
         self.description = "Integrates Llama-index storage in any chat"
         self.allowed_cmds = [
             "get_knowledge"
@@ -26,6 +30,7 @@ class Plugin(BasePlugin):
         self.order = 100
         self.use_locale = True
         self.mode = None  # current mode
+        self.cache = {}  # retrieval results cache: key => (timestamp, nodes)
         self.init_options()
 
     def init_options(self):
@@ -55,6 +60,27 @@ class Plugin(BasePlugin):
                         "Model",
                         "Model used for querying Llama-index, default: gpt-3.5-turbo",
                         tooltip="Query model", use="models")
+        self.add_option("merge", "bool", False,
+                        "Merge results from multiple indexes",
+                        "When enabled and more than one index is used, then nodes are retrieved from all indexes "
+                        "at once, merged by score and answered with a single query to the model.")
+        self.add_option("top_k", "int", 3,
+                        "Top-k nodes",
+                        "Number of nodes retrieved from indexes in merge and retrieval only modes, default: 3",
+                        min=1, max=100)
+        self.add_option("retrieve_only", "bool", False,
+                        "Retrieval only (ask first)",
+                        "When enabled, then in \"Ask Llama-index first\" mode only the retrieved top-k chunks are "
+                        "added to the prompt, without asking the model for an answer first.")
+        self.add_option("max_tokens", "int", 1000,
+                        "Max tokens (retrieval only)",
+                        "Token budget for retrieved chunks added to the prompt, default: 1000",
+                        min=1, max=100000)
+        self.add_option("cache_ttl", "int", 60,
+                        "Retrieval cache TTL",
+                        "Time in seconds to reuse retrieval results for the same query and index version, "
+                        "0 to disable, default: 60",
+                        min=0, max=3600)
 
     def setup(self) -> dict:
         """
@@ -99,6 +125,15 @@ class Plugin(BasePlugin):
                 return
             self.cmd(ctx, data['commands'])
 
+    def has_cmd(self, cmd: str) -> bool:
+        """
+        Check if plugin executes command and returns its result
+
+        :param cmd: command name
+        :return: True if plugin returns result of command
+        """
+        return cmd in self.allowed_cmds and self.mode != "llama_index"
+
     def log(self, msg: str):
         """
         Log message to console
@@ -131,13 +166,34 @@ class Plugin(BasePlugin):
         if not self.get_option_value("ask_llama_first"):
             return prompt
 
-        response = self.query(ctx.input)
+        if self.get_option_value("retrieve_only"):
+            response = self.get_context(ctx.input)
+        else:
+            response = self.query(ctx.input)
         if response is None or len(response) == 0:
             return prompt
 
         prompt += "\nADDITIONAL KNOWLEDGE: " + response
         return prompt
 
+    def get_indexes(self) -> list:
+        """
+        Get indexes to use
+
+        :return: list of index names
+        """
+        idx = self.get_option_value("idx")
+        return [index.strip() for index in idx.split(",") if index.strip() != ""]
+
+    def get_model(self):
+        """
+        Get model used for querying
+
+        :return: ModelItem or None
+        """
+        if self.get_option_value("model_query") is not None:
+            return self.window.core.models.get(self.get_option_value("model_query"))
+
     def query(self, question: str):
         """
         Query Llama-index
@@ -146,19 +202,87 @@ class Plugin(BasePlugin):
         :return: response
         """
         idx = self.get_option_value("idx")
-        model = None
-        if self.get_option_value("model_query") is not None:
-            model = self.window.core.models.get(self.get_option_value("model_query"))
-        indexes = idx.split(",")
-        if len(indexes) > 1:
+        model = self.get_model()
+        indexes = self.get_indexes()
+        if len(indexes) > 1 and self.get_option_value("merge"):
+            top_k = int(self.get_option_value("top_k"))
+            return self.window.core.idx.chat.query_multi(question, idxs=indexes, model=model, top_k=top_k)
+        elif len(indexes) > 1:
             responses = []
             for index in indexes:
-                answer = self.window.core.idx.chat.query(question, idx=index.strip(), model=model)
+                answer = self.window.core.idx.chat.query(question, idx=index, model=model)
                 responses.append(answer)
             return "\n".join(responses)
         else:
             return self.window.core.idx.chat.query(question, idx=idx, model=model)
 
+    def get_cache_key(self, question: str, indexes: list, model) -> tuple:
+        """
+        Get retrieval cache key: normalized query and indexes versions
+
+        :param question: question
+        :param indexes: index names
+        :param model: ModelItem
+        :return: cache key
+        """
+        query = re.sub(r'\s+', ' ', question).strip().lower()
+        versions = tuple((idx, self.window.core.idx.storage.get_version(idx)) for idx in indexes)
+        model_id = model.id if model is not None else None
+        return query, versions, model_id, int(self.get_option_value("top_k"))
+
+    def retrieve(self, question: str) -> list:
+        """
+        Retrieve nodes from indexes (cached for a short time)
+
+        :param question: question
+        :return: list of NodeWithScore
+        """
+        indexes = self.get_indexes()
+        model = self.get_model()
+        ttl = int(self.get_option_value("cache_ttl"))
+        now = time.time()
+
+        # remove expired entries
+        for key in list(self.cache.keys()):
+            if now - self.cache[key][0] > ttl:
+                del self.cache[key]
+
+        key = self.get_cache_key(question, indexes, model)
+        if key in self.cache:
+            return self.cache[key][1]
+
+        top_k = int(self.get_option_value("top_k"))
+        nodes = self.window.core.idx.chat.retrieve(question, indexes, model, top_k)
+        if ttl > 0:
+            self.cache[key] = (now, nodes)
+        return nodes
+
+    def get_context(self, question: str) -> str:
+        """
+        Get retrieved chunks as additional context, limited by token budget
+
+        :param question: question
+        :return: context string
+        """
+        nodes = self.retrieve(question)
+        model = self.window.core.config.get('model')
+        max_tokens = int(self.get_option_value("max_tokens"))
+        used_tokens = 0
+        chunks = []
+        for node in nodes:
+            text = node.node.get_content().strip()
+            if text == "":
+                continue
+            tokens = self.window.core.tokens.from_str(text, model)
+            if used_tokens + tokens > max_tokens:
+                available = max_tokens - used_tokens
+                if available > 0:
+                    chunks.append(text[:len(text) * available // tokens].strip())  # too long, cut to fit
+                break
+            used_tokens += tokens
+            chunks.append(text)
+        return "\n\n".join(chunks)
+
     def cmd(self, ctx: CtxItem, cmds: list):
         """
         Event: On command
@@ -177,14 +301,16 @@ class Plugin(BasePlugin):
             return
 
         for item in my_commands:
+            request = self.prepare_request(item)
             try:
                 if item["cmd"] == "get_knowledge":
                     question = item["params"]["question"]
-                    request = {"cmd": item["cmd"]}
                     data = self.query(question)  # send question to Llama-index
                     response = {"request": request, "result": data}
                     ctx.results.append(response)
                     ctx.reply = True
             except Exception as e:
                 self.log("Error: " + str(e))
-                return
+                # return error as result, command scheduler waits for result of every command
+                ctx.results.append({"request": request, "result": "Error: {}".format(e)})
+                ctx.reply = True
@@ -19,6 +19,7 @@ class Plugin(BasePlugin):
         super(Plugin, self).__init__(*args, **kwargs)
         self.id = "openai_dalle"
         self.name = "DALL-E 3: Image generation"
+        self.events = ['cmd.execute', 'cmd.only', 'system.prompt']
         self.description = "Integrates DALL-E 3 image generation with any chat"
         self.allowed_modes = ["chat", "langchain", "vision", "llama_index", "assistant"]
         self.allowed_cmds = [
@@ -20,6 +20,17 @@ class Plugin(BasePlugin):
         self.id = "openai_vision"
         self.name = "GPT-4 Vision (inline, for use in any chat)"
         self.type = ['vision']
+        self.events = [
+            'ctx.select',
+            'mode.before',
+            'mode.select',
+            'model.before',
+            'model.select',
+            'pre.prompt',
+            'system.prompt',
+            'ui.attachments',
+            'ui.vision',
+        ]
         self.description = "Integrates GPT-4 Vision abilities with any chat mode"
         self.order = 100
         self.use_locale = True
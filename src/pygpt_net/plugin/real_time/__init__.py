@@ -20,6 +20,7 @@ class Plugin(BasePlugin):
         super(Plugin, self).__init__(*args, **kwargs)
         self.id = "real_time"
         self.name = "Real Time"
+        self.events = ['system.prompt']
         self.description = "Appends current time and date to every system prompt."
         self.order = 2
         self.use_locale = True
@@ -20,6 +20,17 @@ class Plugin(BasePlugin):
         super(Plugin, self).__init__(*args, **kwargs)
         self.id = "self_loop"
         self.name = "Autonomous Mode: AI to AI conversation"
+        self.events = [
+            'cmd.execute',
+            'cmd.only',
+            'ctx.after',
+            'ctx.before',
+            'ctx.end',
+            'force.stop',
+            'input.before',
+            'system.prompt',
+            'user.send',
+        ]
         self.description = "Enables autonomous conversation (AI to AI), manages loop, and connects output back to input."
         self.iteration = 0
         self.prev_output = None
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.12 04:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 import os
 
@@ -592,6 +592,35 @@ class Patch:
                     ]
                 updated = True
 
+            # < 2.0.109
+            if old < parse_version("2.0.109"):
+                print("Migrating config from < 2.0.109...")
+                if 'audio.cache' not in data:
+                    data['audio.cache'] = True
+                if 'audio.cache.max_size' not in data:
+                    data['audio.cache.max_size'] = 100
+                if 'audio.output.stream' not in data:
+                    data['audio.output.stream'] = True
+                if 'cmd.speculative' not in data:
+                    data['cmd.speculative'] = True
+                if 'ctx.compact' not in data:
+                    data['ctx.compact'] = False
+                if 'ctx.compact.model' not in data:
+                    data['ctx.compact.model'] = "gpt-3.5-turbo-1106"
+                if 'debug.plugins.slow_ms' not in data:
+                    data['debug.plugins.slow_ms'] = 0
+                if 'llama.idx.cache.max_size' not in data:
+                    data['llama.idx.cache.max_size'] = 512
+                if 'llama.idx.storage' not in data:
+                    data['llama.idx.storage'] = "simple"
+                if 'llama.idx.watch' not in data:
+                    data['llama.idx.watch'] = False
+                if 'llama.idx.watch.delay' not in data:
+                    data['llama.idx.watch.delay'] = 2000
+                if 'llama.idx.watch.index' not in data:
+                    data['llama.idx.watch.index'] = "base"
+                updated = True
+
         # update file
         migrated = False
         if updated:
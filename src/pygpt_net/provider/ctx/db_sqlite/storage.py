@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.08 22:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from datetime import datetime
@@ -193,7 +193,9 @@ class Storage:
                 is_deleted = :is_deleted,
                 is_important = :is_important,
                 is_archived = :is_archived,
-                label = :label
+                label = :label,
+                summary = :summary,
+                summary_count = :summary_count
             WHERE id = :id
         """).bindparams(
             id=meta.id,
@@ -214,6 +216,8 @@ class Storage:
             is_important=int(meta.important),
             is_archived=int(meta.archived),
             label=int(meta.label),
+            summary=meta.summary,
+            summary_count=int(meta.summary_count),
         )
         with db.begin() as conn:
             conn.execute(stmt)
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.08 22:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import json
@@ -173,4 +173,6 @@ def unpack_meta(meta: CtxMeta, row: dict) -> CtxMeta:
     meta.important = bool(row['is_important'])
     meta.archived = bool(row['is_archived'])
     meta.label = int(row['label'] or 0)
+    meta.summary = row['summary']
+    meta.summary_count = int(row['summary_count'] or 0)
     return meta
@@ -30,6 +30,7 @@ class Debug:
         self.window.ui.menu['debug.presets'] = QAction(trans("menu.debug.presets"), self.window, checkable=True)
         self.window.ui.menu['debug.models'] = QAction(trans("menu.debug.models"), self.window, checkable=True)
         self.window.ui.menu['debug.plugins'] = QAction(trans("menu.debug.plugins"), self.window, checkable=True)
+        self.window.ui.menu['debug.events'] = QAction(trans("menu.debug.events"), self.window, checkable=True)
         self.window.ui.menu['debug.attachments'] = QAction(trans("menu.debug.attachments"), self.window, checkable=True)
         self.window.ui.menu['debug.assistants'] = QAction(trans("menu.debug.assistants"), self.window, checkable=True)
         self.window.ui.menu['debug.indexes'] = QAction(trans("menu.debug.indexes"), self.window, checkable=True)
@@ -46,6 +47,8 @@ class Debug:
             lambda: self.window.controller.debug.toggle('models'))
         self.window.ui.menu['debug.plugins'].triggered.connect(
             lambda: self.window.controller.debug.toggle('plugins'))
+        self.window.ui.menu['debug.events'].triggered.connect(
+            lambda: self.window.controller.debug.toggle('events'))
         self.window.ui.menu['debug.attachments'].triggered.connect(
             lambda: self.window.controller.debug.toggle('attachments'))
         self.window.ui.menu['debug.assistants'].triggered.connect(
@@ -63,6 +66,7 @@ class Debug:
         self.window.ui.menu['menu.debug'].addAction(self.window.ui.menu['debug.presets'])
         self.window.ui.menu['menu.debug'].addAction(self.window.ui.menu['debug.models'])
         self.window.ui.menu['menu.debug'].addAction(self.window.ui.menu['debug.plugins'])
+        self.window.ui.menu['menu.debug'].addAction(self.window.ui.menu['debug.events'])
         self.window.ui.menu['menu.debug'].addAction(self.window.ui.menu['debug.attachments'])
         self.window.ui.menu['menu.debug'].addAction(self.window.ui.menu['debug.assistants'])
         self.window.ui.menu['menu.debug'].addAction(self.window.ui.menu['debug.indexes'])
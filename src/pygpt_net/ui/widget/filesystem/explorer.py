@@ -6,10 +6,11 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.16 06:00:00                  #
+# Updated Date: 2024.01.17 20:00:00                  #
 # ================================================== #
 
 import datetime
+import os
 from pathlib import Path
 
 from PySide6.QtCore import Qt, QModelIndex
@@ -247,6 +248,8 @@ class IndexedFileSystemModel(QFileSystemModel):
         super().__init__(*args, **kwargs)
         self.window = window
         self.index_dict = index_dict
+        self.root_path = None  # normalized data dir
+        self.file_ids = {}  # cache: file path => file id
 
     def columnCount(self, parent=QModelIndex()):
         """
@@ -278,6 +281,17 @@ class IndexedFileSystemModel(QFileSystemModel):
                 return content
         return super().data(index, role)
 
+    def get_file_id(self, file_path: str) -> str:
+        """
+        Get file id (cached)
+
+        :param file_path: file path
+        :return: file id
+        """
+        if file_path not in self.file_ids:
+            self.file_ids[file_path] = self.window.core.idx.to_file_id(file_path)
+        return self.file_ids[file_path]
+
     def get_index_status(self, file_path) -> dict:
         """
         Get index status
@@ -285,24 +299,17 @@ class IndexedFileSystemModel(QFileSystemModel):
         :param file_path: file path
         :return: file index status
         """
-        file_id = self.window.core.idx.to_file_id(file_path)
-        indexed_in = []
-        indexed_timestamps = {}
-        last_index_at = 0
-        for idx in self.index_dict:
-            items = self.index_dict[idx]
-            if file_id in items:
-                indexed_in.append(idx)  # append idx where file is indexed
-                indexed_timestamps[idx] = items[file_id]['indexed_ts']
-                if items[file_id]['indexed_ts'] > last_index_at:
-                    last_index_at = items[file_id]['indexed_ts']
+        indexed_timestamps = self.window.core.idx.get_file_status(self.get_file_id(file_path))
+        if len(indexed_timestamps) == 0:
+            return {'indexed': False}
 
         # sort indexed_in by timestamp DESC
-        indexed_in = sorted(indexed_in, key=lambda x: indexed_timestamps[x], reverse=True)
-        if len(indexed_in) > 0:
-            return {'indexed': True, 'indexed_in': indexed_in, 'last_index_at': last_index_at}
-        else:
-            return {'indexed': False}
+        indexed_in = sorted(indexed_timestamps, key=lambda x: indexed_timestamps[x], reverse=True)
+        return {
+            'indexed': True,
+            'indexed_in': indexed_in,
+            'last_index_at': indexed_timestamps[indexed_in[0]],
+        }
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         """
@@ -333,7 +340,21 @@ class IndexedFileSystemModel(QFileSystemModel):
         :param idx_data: new index data dict
         """
         self.index_dict = idx_data
-        top_left_index = self.index(0, 0)
-        bottom_right_index = self.index(self.rowCount() - 1, self.columnCount() - 1)
+        column = self.columnCount() - 1
+        top_left_index = self.index(0, column)
+        bottom_right_index = self.index(self.rowCount() - 1, column)
         self.dataChanged.emit(top_left_index, bottom_right_index, [Qt.DisplayRole])
-        self.layoutChanged.emit()
+
+    def update_files(self, file_ids: list):
+        """
+        Update index status only for changed files
+
+        :param file_ids: list of file ids
+        """
+        if self.root_path is None:
+            self.root_path = os.path.normpath(self.window.core.config.get_user_dir('data'))
+        column = self.columnCount() - 1
+        for file_id in file_ids:
+            index = self.index(os.path.join(self.root_path, file_id), column)
+            if index.isValid():  # only files loaded in the view
+                self.dataChanged.emit(index, index, [Qt.DisplayRole])
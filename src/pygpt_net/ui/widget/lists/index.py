@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.16 06:00:00                  #
+# Updated Date: 2024.01.17 18:00:00                  #
 # ================================================== #
 
 from PySide6.QtGui import QAction, QIcon
@@ -57,6 +57,11 @@ class IndexList(BaseList):
         actions['idx_files_all'].triggered.connect(
             lambda: self.action_idx_files_all(event))
 
+        actions['stop'] = QAction(QIcon.fromTheme("media-playback-stop"), trans('idx.btn.stop'), self)
+        actions['stop'].triggered.connect(
+            lambda: self.action_stop(event))
+        actions['stop'].setEnabled(self.window.controller.idx.indexer.is_running())
+
         actions['delete'] = QAction(QIcon.fromTheme("edit-delete"), trans('idx.btn.clear'), self)
         actions['delete'].triggered.connect(
             lambda: self.action_clear(event))
@@ -66,6 +71,7 @@ class IndexList(BaseList):
         menu.addAction(actions['idx_db_all'])
         menu.addAction(actions['idx_db_update'])
         menu.addAction(actions['idx_files_all'])
+        menu.addAction(actions['stop'])
         menu.addAction(actions['delete'])
 
         item = self.indexAt(event.pos())
@@ -107,6 +113,17 @@ class IndexList(BaseList):
         if idx >= 0:
             self.window.controller.idx.idx_files_all_by_idx(idx)
 
+    def action_stop(self, event):
+        """
+        Stop indexing action handler
+
+        :param event: mouse event
+        """
+        item = self.indexAt(event.pos())
+        idx = item.row()
+        if idx >= 0:
+            self.window.controller.idx.indexer.stop_by_idx(idx)
+
     def action_edit(self, event):
         """
         Edit action handler
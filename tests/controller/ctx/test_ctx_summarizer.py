@@ -54,3 +54,44 @@ def test_handle_update(mock_window):
     ctx = CtxItem()
     summarizer.handle_update(3, ctx, 'test_title')
     mock_window.controller.ctx.update_name.assert_called_once_with(3, 'test_title', refresh=True)
+
+
+def test_compact(mock_window):
+    """Test compact starts worker only for new dropped items"""
+    summarizer = Summarizer(mock_window)
+    summarizer.start_compact_worker = MagicMock()
+    items = [CtxItem() for _ in range(5)]
+    mock_window.core.ctx.current = 2
+    mock_window.core.ctx.items = items
+    mock_window.core.ctx.is_compact = MagicMock(return_value=True)
+    mock_window.core.ctx.get_summary = MagicMock(return_value=("summary", 1))
+    mock_window.core.ctx.get_compact_range = MagicMock(return_value=(1, 3))
+    mock_window.core.models.get_num_ctx = MagicMock(return_value=4096)
+    mock_window.core.tokens.from_user = MagicMock(return_value=100)
+    mock_window.core.config.data['max_total_tokens'] = 8000
+    summarizer.compact()
+    summarizer.start_compact_worker.assert_called_once_with(2, items[1:3], "summary", 1)
+
+    summarizer.compact()  # already in progress
+    assert summarizer.start_compact_worker.call_count == 1
+
+    summarizer.handle_compacted(2, "new summary", 3)
+    mock_window.core.ctx.set_summary.assert_called_once_with(2, "new summary", 3)
+    mock_window.core.ctx.get_compact_range = MagicMock(return_value=(3, 3))
+    summarizer.compact()  # nothing new
+    assert summarizer.start_compact_worker.call_count == 1
+
+
+def test_compactor(mock_window):
+    """Test compactor emits number of summarized items"""
+    summarizer = Summarizer(mock_window)
+    signal = MagicMock()
+    mock_window.core.gpt.summarizer.summary_history = MagicMock(return_value=("new summary", 1))
+    summarizer.compactor(2, [CtxItem(), CtxItem()], "summary", 3, mock_window, signal)
+    mock_window.core.gpt.summarizer.summary_history.assert_called_once()
+    signal.emit.assert_called_once_with(2, "new summary", 4)  # only first chunk summarized
+
+    signal = MagicMock()
+    mock_window.core.gpt.summarizer.summary_history = MagicMock(side_effect=Exception("error"))
+    summarizer.compactor(2, [CtxItem()], "summary", 3, mock_window, signal)
+    signal.emit.assert_called_once_with(2, "", 3)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.17 22:00:00                  #
+# ================================================== #
+
+import os
+from unittest.mock import MagicMock, patch
+
+from tests.mocks import mock_window
+from pygpt_net.controller.idx.watcher import Watcher
+
+
+def prepare(mock_window, tmp_path):
+    watcher = Watcher(mock_window)
+    watcher.root = str(tmp_path)
+    watcher.watcher = MagicMock()
+    watcher.watcher.files.return_value = []
+    watcher.watcher.directories.return_value = []
+    watcher.timer = MagicMock()
+    watcher.ready = True
+    mock_window.controller.idx.indexer.is_running_idx = MagicMock(return_value=False)
+    mock_window.core.config.get = MagicMock(return_value='base')
+    return watcher
+
+
+def test_flush_changes(mock_window, tmp_path):
+    """Test created, modified and deleted files are sent to indexer"""
+    (tmp_path / 'a.txt').write_text('a')
+    (tmp_path / 'b.txt').write_text('b')
+    watcher = prepare(mock_window, tmp_path)
+    watcher.mtimes, watcher.dirs = watcher.scan(str(tmp_path))
+
+    (tmp_path / 'b.txt').unlink()
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'c.txt').write_text('c')
+    watcher.on_change(str(tmp_path))
+    watcher.timer.start.assert_called_once()
+    watcher.flush()
+
+    mock_window.controller.idx.indexer.index_changes.assert_called_once_with(
+        'base', [str(tmp_path / 'sub' / 'c.txt')], [str(tmp_path / 'b.txt')])
+    assert watcher.pending == set()
+    assert str(tmp_path / 'sub' / 'c.txt') in watcher.mtimes
+    watcher.watcher.addPaths.assert_called_once_with([str(tmp_path / 'sub')])  # only dirs are watched
+
+    # removed directory
+    (tmp_path / 'sub' / 'c.txt').unlink()
+    (tmp_path / 'sub').rmdir()
+    watcher.on_change(str(tmp_path))
+    watcher.flush()
+    mock_window.controller.idx.indexer.index_changes.assert_called_with('base', [], [str(tmp_path / 'sub' / 'c.txt')])
+    assert str(tmp_path / 'sub') not in watcher.dirs
+
+
+def test_flush_wait_for_job(mock_window, tmp_path):
+    """Test changes are kept while index job is running"""
+    watcher = prepare(mock_window, tmp_path)
+    mock_window.controller.idx.indexer.is_running_idx = MagicMock(return_value=True)
+    watcher.on_change(str(tmp_path))
+    watcher.flush()
+    mock_window.controller.idx.indexer.index_changes.assert_not_called()
+    assert watcher.pending == {os.path.normpath(str(tmp_path))}
+
+
+def test_flush_unchanged(mock_window, tmp_path):
+    """Test no job for unchanged files"""
+    (tmp_path / 'a.txt').write_text('a')
+    watcher = prepare(mock_window, tmp_path)
+    watcher.mtimes, watcher.dirs = watcher.scan(str(tmp_path))
+    watcher.on_change(str(tmp_path))
+    watcher.flush()
+    mock_window.controller.idx.indexer.index_changes.assert_not_called()
+
+
+def test_start(mock_window, tmp_path):
+    """Test initial scan is started in background and only dirs are watched"""
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'a.txt').write_text('a')
+    watcher = Watcher(mock_window)
+    mock_window.core.config.get_user_dir = MagicMock(return_value=str(tmp_path))
+    with patch('pygpt_net.controller.idx.watcher.QFileSystemWatcher'), \
+            patch('pygpt_net.controller.idx.watcher.QTimer'):
+        watcher.start()
+    mock_window.threadpool.start.assert_called_once()
+    assert not watcher.ready
+    watcher.watcher.directories.return_value = []
+    watcher.handle_scanned(*watcher.scan(str(tmp_path)))
+    assert watcher.ready
+    assert str(tmp_path / 'sub' / 'a.txt') in watcher.mtimes
+    watcher.watcher.addPaths.assert_called_once_with([str(tmp_path), str(tmp_path / 'sub')])
+
+
+def test_skip_generated(mock_window, tmp_path):
+    """Test hidden, temporary and app generated files are not indexed"""
+    watcher = prepare(mock_window, tmp_path)
+    watcher.mtimes, watcher.dirs = watcher.scan(str(tmp_path))
+    (tmp_path / '.hidden').write_text('a')
+    (tmp_path / 'file.txt~').write_text('a')
+    (tmp_path / '__pycache__').mkdir()
+    (tmp_path / '__pycache__' / 'a.pyc').write_text('a')
+    watcher.pause()  # e.g. code interpreter is running
+    (tmp_path / 'script.py').write_text('a')
+    watcher.on_change(str(tmp_path))
+    watcher.flush()
+    assert watcher.timer.start.call_count == 2  # waits for resume
+    watcher.resume()
+    watcher.flush()
+    mock_window.controller.idx.indexer.index_changes.assert_not_called()
+    assert str(tmp_path / 'script.py') in watcher.mtimes
+    assert str(tmp_path / '.hidden') not in watcher.mtimes
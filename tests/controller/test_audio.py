@@ -6,13 +6,14 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.03 16:00:00                  #
+# Updated Date: 2024.01.19 20:00:00                  #
 # ================================================== #
 
 from unittest.mock import MagicMock, call
 
 from tests.mocks import mock_window
 from pygpt_net.controller import Audio
+from pygpt_net.item.ctx import CtxItem
 
 
 def test_setup(mock_window):
@@ -138,3 +139,56 @@ def test_read_text(mock_window):
     audio.window.core.dispatcher.dispatch = MagicMock()
     audio.read_text('test')
     audio.window.core.dispatcher.dispatch.assert_called_once()
+
+
+def test_stream(mock_window):
+    """Test speak streamed output sentence by sentence"""
+    audio = Audio(mock_window)
+    audio.window.core.config.data['audio.output.stream'] = True
+    audio.window.core.audio.clean_text = lambda text: text
+    audio.window.core.dispatcher.dispatch = MagicMock()
+    audio.is_output_enabled = MagicMock(return_value=True)
+    ctx = CtxItem()
+    audio.stream_begin(ctx)
+    for chunk in ["This is the first sentence.", " And this is", " the second one. And the rest"]:
+        audio.stream_chunk(ctx, chunk)
+    audio.stream_end(ctx)
+    events = [args[0][0] for args in audio.window.core.dispatcher.dispatch.call_args_list]
+    assert [event.name for event in events] == ['audio.output.stream'] * 3
+    assert [event.data for event in events] == [
+        {"text": "This is the first sentence.", "end": False},
+        {"text": "And this is the second one.", "end": False},
+        {"text": "And the rest", "end": True},
+    ]
+    assert audio.is_streamed(ctx)
+    assert not audio.is_streamed(CtxItem())
+
+
+def test_stream_stopped(mock_window):
+    """Test speak streamed output stopped by user"""
+    audio = Audio(mock_window)
+    audio.window.core.config.data['audio.output.stream'] = True
+    audio.window.core.dispatcher.dispatch = MagicMock()
+    audio.is_output_enabled = MagicMock(return_value=True)
+    audio.stop_output = MagicMock()
+    ctx = CtxItem()
+    audio.stream_begin(ctx)
+    audio.stream_chunk(ctx, "Not finished sentence")
+    audio.stream_end(ctx, True)
+    audio.stop_output.assert_called_once()
+    audio.window.core.dispatcher.dispatch.assert_not_called()
+    assert audio.is_streamed(ctx)  # not spoken again after stop
+
+
+def test_stream_disabled(mock_window):
+    """Test streamed output is not spoken if audio output is disabled"""
+    audio = Audio(mock_window)
+    audio.window.core.config.data['audio.output.stream'] = True
+    audio.window.core.dispatcher.dispatch = MagicMock()
+    audio.is_output_enabled = MagicMock(return_value=False)
+    ctx = CtxItem()
+    audio.stream_begin(ctx)
+    audio.stream_chunk(ctx, "This is the first sentence. ")
+    audio.stream_end(ctx)
+    audio.window.core.dispatcher.dispatch.assert_not_called()
+    assert not audio.is_streamed(ctx)
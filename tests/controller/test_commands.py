@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.03 16:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 # 
 import os
@@ -16,6 +16,7 @@ import PySide6
 
 from pygpt_net.core.dispatcher import Event
 from pygpt_net.item.ctx import CtxItem
+from pygpt_net.plugin.base import BasePlugin
 from tests.mocks import mock_window
 from pygpt_net.controller import Command
 
@@ -35,8 +36,7 @@ def test_dispatch_sync(mock_window):
     """Test dispatch sync"""
     command = Command(mock_window)
     mock_window.core.dispatcher.apply = MagicMock()
-    mock_window.core.plugins.get_ids = MagicMock(return_value=['test'])
-    mock_window.controller.plugins.is_enabled = MagicMock(return_value=True)
+    mock_window.core.dispatcher.get_handlers = MagicMock(return_value=['test'])
     command.handle_finished = MagicMock()
 
     event = Event('test')
@@ -56,8 +56,7 @@ def test_dispatch_async(mock_window):
 def test_worker(mock_window):
     """Test worker"""
     command = Command(mock_window)
-    mock_window.core.plugins.get_ids = MagicMock(return_value=['test'])
-    mock_window.controller.plugins.is_enabled = MagicMock(return_value=True)
+    mock_window.core.dispatcher.get_handlers = MagicMock(return_value=['test'])
     mock_window.controller.command.is_stop = MagicMock(return_value=False)
     event = Event('test')
     command.worker(event, mock_window, MagicMock())
@@ -94,3 +93,282 @@ def test_handle_finished(mock_window):
     command.handle_finished(event)
     mock_window.ui.status.assert_called_once_with('')
     mock_window.controller.chat.input.send.assert_called_once_with('{"test": "test"}', force=True, internal=False)
+
+
+def get_plugins(mock_window) -> dict:
+    files = MagicMock()
+    files.has_cmd = MagicMock(side_effect=lambda cmd: cmd in ["read_file", "save_file"])
+    files.is_cmd_independent = MagicMock(side_effect=lambda cmd: cmd == "read_file")
+    web = MagicMock()
+    web.has_cmd = MagicMock(side_effect=lambda cmd: cmd == "web_search")
+    web.is_cmd_independent = MagicMock(return_value=True)
+    plugins = {"cmd_files": files, "cmd_web": web}
+    mock_window.core.plugins.get = MagicMock(side_effect=lambda id: plugins[id])
+    mock_window.core.dispatcher.get_handlers = MagicMock(return_value=["cmd_files", "cmd_web"])
+    return plugins
+
+
+def result(event: Event, i: int, data: str) -> dict:
+    """Return result of i-th command of dispatched event (as returned by plugin)"""
+    return {"request": {"cmd": event.data['commands'][i]["cmd"], "job": event.data['commands'][i]["job"]},
+            "result": data}
+
+
+def test_get_groups(mock_window):
+    """Test jobs grouping into concurrent chains"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    cmds = [
+        {"cmd": "read_file"},  # before save_file, must be executed before it
+        {"cmd": "web_search"},
+        {"cmd": "save_file"},
+        {"cmd": "read_file"},  # after save_file, must wait for it
+        {"cmd": "image"},  # no result
+        {"cmd": "web_search"},
+    ]
+    jobs = command.get_jobs(cmds)
+    assert [job["plugin"] for job in jobs] == ["cmd_files", "cmd_web", "cmd_files", "cmd_files", None, "cmd_web"]
+    groups = command.get_groups(jobs)
+    assert groups == [
+        ("cmd_files", [jobs[0], jobs[2], jobs[3]]),
+        ("cmd_web", [jobs[1]]),
+        ("cmd_web", [jobs[5]]),
+    ]
+
+    # read-only commands only
+    jobs = command.get_jobs([{"cmd": "read_file"}, {"cmd": "read_file"}])
+    assert command.get_groups(jobs) == [("cmd_files", [jobs[0]]), ("cmd_files", [jobs[1]])]
+
+
+def test_schedule(mock_window):
+    """Test scheduled commands reply once with results in commands order"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    mock_window.core.dispatcher.apply = MagicMock()
+    mock_window.core.dispatcher.reply = MagicMock()
+    ctx = CtxItem()
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "read_file"}, {"cmd": "web_search"}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    assert mock_window.core.dispatcher.apply.call_count == 2
+    assert mock_window.core.dispatcher.apply.call_args.kwargs['is_async'] is True
+    mock_window.core.dispatcher.reply.assert_not_called()
+    file, web = [c.args[1] for c in mock_window.core.dispatcher.apply.call_args_list]
+
+    # results arrive in reverse order
+    ctx.results.append(result(web, 0, "web"))
+    assert command.collect(ctx) is True  # still waiting
+    ctx.results.append(result(file, 0, "file"))
+    assert command.collect(ctx) is False
+    assert ctx.results == [
+        {"request": {"cmd": "read_file"}, "result": "file"},
+        {"request": {"cmd": "web_search"}, "result": "web"},
+    ]  # job tags removed
+    assert ctx.reply is True
+    assert command.batches == {}
+
+
+def test_schedule_same_cmd(mock_window):
+    """Test results of concurrent commands with the same name are matched by job tag"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    mock_window.core.dispatcher.apply = MagicMock()
+    mock_window.core.dispatcher.reply = MagicMock()
+    ctx = CtxItem()
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "web_search", "params": {"query": "a"}}, {"cmd": "web_search", "params": {"query": "b"}}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    first, second = [c.args[1] for c in mock_window.core.dispatcher.apply.call_args_list]
+    assert first.data['commands'][0]["job"] != second.data['commands'][0]["job"]
+    ctx.results.append(result(second, 0, "b"))
+    ctx.results.append(result(first, 0, "a"))
+    assert command.collect(ctx) is False
+    assert [item["result"] for item in ctx.results] == ["a", "b"]
+
+
+def test_schedule_error(mock_window):
+    """Test command not executed by plugin returns error result"""
+    command = Command(mock_window)
+    plugins = get_plugins(mock_window)
+    mock_window.core.dispatcher.reply = MagicMock()
+    plugin = BasePlugin()
+    plugin.window = mock_window
+
+    def apply(id, event, is_async):
+        if id == "cmd_files":
+            plugin.handle_cmd_error(event.ctx, event.data['commands'], "failed")  # worker not started
+
+    mock_window.core.dispatcher.apply = MagicMock(side_effect=apply)
+    ctx = CtxItem()
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "read_file"}, {"cmd": "web_search"}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    web = mock_window.core.dispatcher.apply.call_args.args[1]
+    ctx.results.append(result(web, 0, "web"))
+    assert command.collect(ctx) is False
+    assert ctx.results == [
+        {"request": {"cmd": "read_file"}, "result": "Error: failed"},
+        {"request": {"cmd": "web_search"}, "result": "web"},
+    ]
+    assert command.batches == {}
+
+
+def test_schedule_stop(mock_window):
+    """Test stop drops not dispatched commands and replies with results of started ones"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    mock_window.core.dispatcher.reply = MagicMock()
+
+    def apply(id, event, is_async):
+        command.stop = True  # stopped after first chain
+
+    mock_window.core.dispatcher.apply = MagicMock(side_effect=apply)
+    ctx = CtxItem()
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "read_file"}, {"cmd": "web_search"}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    assert mock_window.core.dispatcher.apply.call_count == 1
+    file = mock_window.core.dispatcher.apply.call_args.args[1]
+    ctx.results.append(result(file, 0, "file"))
+    assert command.collect(ctx) is False
+    assert [item["result"] for item in ctx.results] == ["file"]
+    assert command.batches == {}
+    assert command.stop is False
+
+
+def test_schedule_no_results(mock_window):
+    """Test commands without results are dispatched as before"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    command.dispatch_sync = MagicMock()
+    ctx = CtxItem()
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "image"}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    command.dispatch_sync.assert_called_once_with(event)
+
+
+def test_schedule_internal(mock_window):
+    """Test internal commands are scheduled only if batch owns the reply"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    mock_window.core.dispatcher.apply = MagicMock()
+    mock_window.core.dispatcher.reply = MagicMock()
+    command.handle_finished = MagicMock()
+
+    # commands with results only, results collected in batch
+    ctx = CtxItem()
+    ctx.internal = True
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "read_file"}, {"cmd": "web_search"}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    assert all("job" in c.args[1].data['commands'][0] for c in mock_window.core.dispatcher.apply.call_args_list)
+    assert id(ctx) in command.batches
+
+    # mixed with command replying by itself (image), executed synchronously without batch
+    mock_window.core.dispatcher.apply.reset_mock()
+    ctx = CtxItem()
+    ctx.internal = True
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "read_file"}, {"cmd": "image"}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    assert mock_window.core.dispatcher.apply.call_count == 2  # all handlers
+    for c in mock_window.core.dispatcher.apply.call_args_list:
+        assert c.args[1] is event
+        assert c.kwargs['is_async'] is False
+    assert all("job" not in item for item in event.data['commands'])
+    assert id(ctx) not in command.batches
+    command.handle_finished.assert_not_called()  # internal, replied by plugins
+
+    # not started while streaming
+    command.speculate(ctx, {"cmd": "read_file"})
+    assert id(ctx) not in command.batches
+
+
+def test_speculate(mock_window):
+    """Test commands started while streaming are not dispatched again"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    mock_window.core.dispatcher.apply = MagicMock()
+    mock_window.core.dispatcher.reply = MagicMock()
+    ctx = CtxItem()
+    command.speculate(ctx, {"cmd": "save_file"})  # not independent
+    mock_window.core.dispatcher.apply.assert_not_called()
+    command.speculate(ctx, {"cmd": "web_search"})
+    assert mock_window.core.dispatcher.apply.call_count == 1
+    web = mock_window.core.dispatcher.apply.call_args.args[1]
+
+    # result arrives before response is complete
+    ctx.results.append(result(web, 0, "web"))
+    assert command.collect(ctx) is True
+
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "read_file"}, {"cmd": "web_search"}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    assert mock_window.core.dispatcher.apply.call_count == 2
+    file = mock_window.core.dispatcher.apply.call_args.args[1]
+    assert [item["cmd"] for item in file.data['commands']] == ["read_file"]
+    mock_window.core.dispatcher.reply.assert_not_called()
+
+    ctx.results.append(result(file, 0, "file"))
+    assert command.collect(ctx) is False
+    assert [item["result"] for item in ctx.results] == ["file", "web"]
+    assert command.batches == {}
+
+
+def test_speculate_deferred(mock_window):
+    """Test mutating commands wait for commands of the same plugin started while streaming"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    mock_window.core.dispatcher.apply = MagicMock()
+    mock_window.core.dispatcher.reply = MagicMock()
+    ctx = CtxItem()
+    command.speculate(ctx, {"cmd": "read_file"})
+    read = mock_window.core.dispatcher.apply.call_args.args[1]
+
+    event = Event('cmd.execute', {
+        'commands': [{"cmd": "read_file"}, {"cmd": "save_file"}],
+    })
+    event.ctx = ctx
+    command.dispatch(event)
+    assert mock_window.core.dispatcher.apply.call_count == 1  # save_file waits for read_file
+
+    ctx.results.append(result(read, 0, "file"))
+    assert command.collect(ctx) is True
+    assert mock_window.core.dispatcher.apply.call_count == 2
+    save = mock_window.core.dispatcher.apply.call_args.args[1]
+    assert [item["cmd"] for item in save.data['commands']] == ["save_file"]
+    ctx.results.append(result(save, 0, "OK"))
+    assert command.collect(ctx) is False
+    assert [item["result"] for item in ctx.results] == ["file", "OK"]
+
+
+def test_discard(mock_window):
+    """Test results of discarded speculative commands are not sent"""
+    command = Command(mock_window)
+    get_plugins(mock_window)
+    mock_window.core.dispatcher.apply = MagicMock()
+    ctx = CtxItem()
+    command.speculate(ctx, {"cmd": "web_search"})
+    web = mock_window.core.dispatcher.apply.call_args.args[1]
+    command.discard(ctx)
+    ctx.results.append(result(web, 0, "web"))
+    assert command.collect(ctx) is True
+    assert ctx.results == []
+    assert command.batches == {}
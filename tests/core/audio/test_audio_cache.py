@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 18:00:00                  #
+# ================================================== #
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pygpt_net.core.audio.cache import Cache
+
+# other tests replace some os functions with mocks
+real_os = {
+    'os.path.exists': os.path.exists,
+    'os.makedirs': os.makedirs,
+    'os.mkdir': os.mkdir,
+    'os.listdir': os.listdir,
+    'os.remove': os.remove,
+}
+
+
+@pytest.fixture(autouse=True)
+def restore_os():
+    with patch('os.path.exists', real_os['os.path.exists']), \
+            patch('os.makedirs', real_os['os.makedirs']), \
+            patch('os.mkdir', real_os['os.mkdir']), \
+            patch('os.listdir', real_os['os.listdir']), \
+            patch('os.remove', real_os['os.remove']):
+        yield
+
+
+def mock_cache(path, max_size: int = 1) -> Cache:
+    """Return cache in temporary dir"""
+    window = MagicMock()
+    window.core.config.path = str(path)
+    window.core.config.get = lambda key: {'audio.cache': True, 'audio.cache.max_size': max_size}.get(key)
+    return Cache(window)
+
+
+def test_get_key():
+    """Test cache key"""
+    cache = Cache()
+    key = cache.get_key("audio_openai_tts", "tts-1.alloy", "Hello")
+    assert key.startswith("audio_openai_tts_tts-1.alloy_")
+    assert key != cache.get_key("audio_openai_tts", "tts-1.echo", "Hello")
+    assert key != cache.get_key("audio_azure", "tts-1.alloy", "Hello")
+    assert "/" not in cache.get_key("a/b", "c:d", "Hello")
+
+
+def test_get_put(tmp_path):
+    """Test store and read cached audio"""
+    cache = mock_cache(tmp_path)
+    assert cache.get("p", "v", "Hello") is None
+    cache.put("p", "v", "Hello", b"\x01\x02")
+    assert cache.get("p", "v", "Hello") == b"\x01\x02"
+    assert cache.get("p", "v", "Hello!") is None
+    assert not [name for name in os.listdir(cache.get_dir()) if name.endswith(".tmp")]
+
+
+def test_disabled(tmp_path):
+    """Test disabled cache"""
+    cache = mock_cache(tmp_path)
+    cache.window.core.config.get = lambda key: False
+    cache.put("p", "v", "Hello", b"\x01\x02")
+    assert not os.path.exists(cache.get_dir())
+    assert cache.get("p", "v", "Hello") is None
+
+
+def test_evict(tmp_path):
+    """Test least recently used files are removed first"""
+    cache = mock_cache(tmp_path)
+    size = 400 * 1024
+    cache.put("p", "v", "a", b"\x00" * size)
+    cache.put("p", "v", "b", b"\x00" * size)
+    os.utime(cache.get_path("p", "v", "a"), (1, 1))
+    os.utime(cache.get_path("p", "v", "b"), (2, 2))
+    cache.get("p", "v", "a")  # "a" used recently, "b" is now the oldest
+    cache.put("p", "v", "c", b"\x00" * size)  # over 1 MB
+    assert cache.get("p", "v", "a") is not None
+    assert cache.get("p", "v", "b") is None
+    assert cache.get("p", "v", "c") is not None
+    cache.clear()
+    assert os.listdir(cache.get_dir()) == []
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+from unittest.mock import MagicMock, patch
+
+from pygpt_net.core.audio.output import Output, Playback
+
+
+def test_play():
+    """Test stream is played in blocks from the first chunks"""
+    output = Output()
+    output.init = MagicMock()
+    playback = Playback()
+    playback.put = MagicMock()
+    block = int(output.RATE * output.BLOCK) * output.WIDTH
+    chunks = [b"\x01" * 1001] * 21  # odd sizes, samples split between chunks
+    data = output.play(playback, iter(chunks))
+    assert data == b"\x01" * 21021
+    blocks = [call.args[0] for call in playback.put.call_args_list]
+    assert [len(b) for b in blocks[:-1]] == [block] * (21021 // block)
+    assert len(blocks[-1]) == (21021 % block) - 1  # incomplete sample dropped
+    output.init.assert_called_once()
+
+
+def test_play_stopped():
+    """Test stopped stream is not read further"""
+    output = Output()
+    output.init = MagicMock()
+    playback = Playback()
+    playback.put = MagicMock()
+    read = []
+
+    def chunks():
+        for i in range(10):
+            read.append(i)
+            if i == 2:
+                playback.stop()
+            yield b"\x00" * 100
+
+    assert output.play(playback, chunks()) is None
+    assert read == [0, 1, 2]
+    playback.put.assert_not_called()
+
+
+def test_playback_stop():
+    """Test playback stop"""
+    playback = Playback()
+    playback.stop()  # not started yet
+    assert playback.stopped
+    playback.channel = MagicMock()
+    playback.channel.get_busy.return_value = True
+    assert not playback.is_playing()
+    playback.stop()
+    playback.channel.stop.assert_called_once()
+
+
+def test_playback_run():
+    """Test blocks are played one after another on the same channel"""
+    playback = Playback()
+    channel = MagicMock()
+    channel.get_queue.return_value = None
+    channel.get_busy.side_effect = [False, True, True]
+    playback.blocks.extend([b"\x00\x00", b"\x01\x01", b"\x02\x02"])
+    with patch('pygame.mixer.Sound') as sound, \
+            patch('pygame.mixer.find_channel', return_value=channel):
+        playback.run()
+    assert [c.kwargs["buffer"] for c in sound.call_args_list] == [b"\x00\x00", b"\x01\x01", b"\x02\x02"]
+    assert channel.play.call_count == 1
+    assert channel.queue.call_count == 2
+    assert playback.thread is None
+    assert len(playback.blocks) == 0
+
+
+def test_init():
+    """Test mixer is initialized in PCM format without format changes"""
+    output = Output()
+    with patch('pygame.mixer.get_init', return_value=None), \
+            patch('pygame.mixer.init') as init:
+        output.init()
+    init.assert_called_once_with(frequency=24000, size=-16, channels=1, allowedchanges=0)
+
+    with patch('pygame.mixer.get_init', return_value=(24000, -16, 1)), \
+            patch('pygame.mixer.init') as init:
+        output.init()
+    init.assert_not_called()
+
+
+def test_init_playing():
+    """Test mixer is not restarted while playback is active"""
+    output = Output()
+    playback = output.create()
+    playback.blocks.append(b"\x00\x00")  # playing
+    with patch('pygame.mixer.get_init', return_value=(44100, -16, 2)), \
+            patch('pygame.mixer.quit') as quit, \
+            patch('pygame.mixer.init') as init:
+        output.init()
+        quit.assert_not_called()
+        init.assert_not_called()
+        playback.stop()
+        output.init()
+        quit.assert_called_once()
+        init.assert_called_once()
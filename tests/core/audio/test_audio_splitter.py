@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 20:00:00                  #
+# ================================================== #
+
+from pygpt_net.core.audio.splitter import Splitter
+
+
+def split(text: str, size: int = 3) -> (list, str):
+    """Split text streamed in chunks of given size"""
+    splitter = Splitter()
+    sentences = []
+    for i in range(0, len(text), size):
+        sentences += splitter.append(text[i:i + size])
+    return sentences, splitter.flush()
+
+
+def test_append():
+    """Test sentences are returned when completed"""
+    splitter = Splitter()
+    assert splitter.append("This is the first sentence") == []
+    assert splitter.append(".") == []  # may be continued, e.g. 3.14
+    assert splitter.append(" Second") == ["This is the first sentence."]
+    assert splitter.append(" sentence is here! Third") == ["Second sentence is here!"]
+    assert splitter.flush() == "Third"
+    assert splitter.buffer == ""
+
+
+def test_append_short():
+    """Test short sentences are joined, numbers and new lines"""
+    sentences, rest = split("Hi. Pi is 3.14 exactly. A list:\n1. first item here\n2. second item here")
+    assert sentences == ["Hi. Pi is 3.14 exactly.", "A list:\n1. first item here"]
+    assert rest == "2. second item here"
+
+
+def test_append_cmd():
+    """Test command blocks are not split"""
+    text = 'Searching the web now. ~###~ {"cmd": "web", "params": {"query": "a. b. c. d. e. f."}} ~###~ Done!' \
+           ' And unclosed ~###~ {"cmd": "web", "params": {"query": "a. b. c. d. e. f."'
+    sentences, rest = split(text)
+    assert sentences == [
+        "Searching the web now.",
+        '~###~ {"cmd": "web", "params": {"query": "a. b. c. d. e. f."}} ~###~ Done!',
+    ]
+    assert rest == "And unclosed"
+
+
+def test_append_code():
+    """Test code blocks are not spoken and list numbers are not boundaries"""
+    text = "Here is the code for you:\n```python\nx = 1. \nprint(x)\n```\nIt prints one to the output." \
+           " Steps to follow:\n1. Install the package\n2. Run the script now\n```bash\nunclosed. \n"
+    sentences, rest = split(text)
+    assert sentences == [
+        "Here is the code for you:",
+        "It prints one to the output.",
+        "Steps to follow:\n1. Install the package",
+        "2. Run the script now",
+    ]
+    assert rest == ""
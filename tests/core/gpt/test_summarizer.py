@@ -41,3 +41,30 @@ def test_summary_ctx(mock_window_conf):
     response = summarizer.summary_ctx(CtxItem())
     assert response == 'test_response'
 
+
+
+def test_summary_history(mock_window_conf):
+    """
+    Test rolling summary is updated in chunks fitting summarizer context
+    """
+    summarizer = Summarizer(mock_window_conf)
+    summarizer.window.core.config.get.side_effect = mock_get
+    summarizer.window.core.models.get_num_ctx = MagicMock(return_value=1350)  # 250 tokens for messages
+    summarizer.window.core.tokens.from_text = MagicMock(side_effect=lambda text, model: text.count("#"))
+    summarizer.window.core.gpt.quick_call = MagicMock(side_effect=["summary 1", "summary 2", None])
+    items = [CtxItem() for _ in range(5)]
+    for item in items:
+        item.input = "#" * 100
+    summary, num = summarizer.summary_history(items, "summary 0")
+    assert (summary, num) == ("summary 2", 4)  # last chunk failed
+    calls = summarizer.window.core.gpt.quick_call.call_args_list
+    assert len(calls) == 3
+    assert "Current summary:\nsummary 0" in calls[0].args[0]
+    assert "Current summary:\nsummary 1" in calls[1].args[0]
+    assert [call.args[0].count("#") for call in calls] == [200, 200, 100]
+
+    # too long item is cut to fit
+    summarizer.window.core.gpt.quick_call = MagicMock(return_value="summary")
+    items[0].input = "#" * 600
+    assert summarizer.summary_history(items[:1]) == ("summary", 1)
+    assert 200 < summarizer.window.core.gpt.quick_call.call_args.args[0].count("#") <= 250
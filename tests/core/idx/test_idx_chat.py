@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.17 14:00:00                  #
+# ================================================== #
+
+from unittest.mock import MagicMock, patch
+
+from llama_index.schema import TextNode, NodeWithScore
+
+from tests.mocks import mock_window_conf
+from pygpt_net.core.idx.chat import Chat
+from pygpt_net.item.model import ModelItem
+
+
+def mock_index(nodes):
+    index = MagicMock()
+    index.as_retriever.return_value.retrieve.return_value = nodes
+    return index
+
+
+def prepare(mock_window_conf, indexes):
+    storage = MagicMock()
+    storage.exists = MagicMock(return_value=True)
+    storage.get = MagicMock(side_effect=lambda idx, model=None: indexes[idx])
+    storage.get_service_context.return_value.embed_model.get_query_embedding.return_value = [0.1, 0.2]
+    return Chat(mock_window_conf, storage)
+
+
+def test_retrieve(mock_window_conf):
+    """Test retrieve from multiple indexes, merged by score"""
+    shared = TextNode(text="shared")
+    indexes = {
+        'base': mock_index([NodeWithScore(node=shared, score=0.5), NodeWithScore(node=TextNode(text="a"), score=0.9)]),
+        'other': mock_index([NodeWithScore(node=shared, score=0.7), NodeWithScore(node=TextNode(text="b"), score=0.1)]),
+    }
+    chat = prepare(mock_window_conf, indexes)
+    nodes = chat.retrieve("query", ['base', 'other'], ModelItem(), top_k=3)
+    assert [n.node.text for n in nodes] == ["a", "shared", "b"]
+    assert nodes[1].score == 0.7
+    chat.storage.get_service_context.return_value.embed_model.get_query_embedding.assert_called_once_with("query")
+
+
+def test_query_multi(mock_window_conf):
+    """Test query multiple indexes with single synthesis"""
+    indexes = {
+        'base': mock_index([NodeWithScore(node=TextNode(text="a"), score=0.9)]),
+        'other': mock_index([NodeWithScore(node=TextNode(text="b"), score=0.1)]),
+    }
+    chat = prepare(mock_window_conf, indexes)
+    chat.window.core.config.has = MagicMock(return_value=False)
+    with patch('pygpt_net.core.idx.chat.get_response_synthesizer') as synth:
+        synth.return_value.synthesize.return_value = "answer"
+        response = chat.query_multi("query", ['base', 'other'], ModelItem())
+        assert response == "answer"
+        synth.return_value.synthesize.assert_called_once()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.17 20:00:00                  #
+# ================================================== #
+
+import os
+from unittest.mock import MagicMock
+
+from tests.mocks import mock_window_conf
+from pygpt_net.core.idx import Idx
+
+
+def prepare(mock_window_conf):
+    idx = Idx(mock_window_conf)
+    idx.window.core.config.get_user_dir = MagicMock(return_value=os.path.join('root', 'data'))
+    idx.save = MagicMock()
+    return idx
+
+
+def test_append_files_map(mock_window_conf):
+    """Test reverse files map update on append"""
+    idx = prepare(mock_window_conf)
+    file_ids = idx.append('base', {os.path.join('root', 'data', 'a.txt'): 'id1'})
+    idx.append('other', {os.path.join('root', 'data', 'a.txt'): 'id2'})
+    assert file_ids == ['a.txt']
+    status = idx.get_file_status('a.txt')
+    assert sorted(status.keys()) == ['base', 'other']
+    assert idx.get_file_status('b.txt') == {}
+
+
+def test_clear_files_map(mock_window_conf):
+    """Test reverse files map update on clear"""
+    idx = prepare(mock_window_conf)
+    idx.append('base', {os.path.join('root', 'data', 'a.txt'): 'id1'})
+    idx.append('other', {os.path.join('root', 'data', 'a.txt'): 'id2'})
+    assert idx.clear('base') == ['a.txt']
+    assert list(idx.get_file_status('a.txt').keys()) == ['other']
+    idx.clear('other')
+    assert idx.get_file_status('a.txt') == {}
+    assert idx.files == {}
+
+
+def test_build_files(mock_window_conf):
+    """Test reverse files map build on load"""
+    idx = prepare(mock_window_conf)
+    idx.append('base', {os.path.join('root', 'data', 'a.txt'): 'id1'})
+    items = idx.items
+    idx.provider.load = MagicMock(return_value=items)
+    idx.files = {}
+    idx.load()
+    assert list(idx.get_file_status('a.txt').keys()) == ['base']
+
+
+def test_remove_files_map(mock_window_conf):
+    """Test removing deleted files from index items"""
+    idx = prepare(mock_window_conf)
+    path = os.path.join('root', 'data', 'a.txt')
+    idx.append('base', {path: 'id1'})
+    assert idx.get_doc_id('base', path) == 'id1'
+    assert idx.remove('base', [path]) == ['a.txt']
+    assert idx.get_doc_id('base', path) is None
+    assert idx.get_file_status('a.txt') == {}
+
+
+def test_sync_files(mock_window_conf):
+    """Test re-indexing modified files and removing deleted files"""
+    idx = prepare(mock_window_conf)
+    idx.storage = MagicMock()
+    idx.indexing.remove_file = MagicMock(return_value=1)
+    idx.indexing.index_files = MagicMock(return_value=({'b.txt': 'id2'}, []))
+    files, removed, errors = idx.sync_files('base', ['b.txt'], ['a.txt'])
+    assert files == {'b.txt': 'id2'}
+    assert removed == ['a.txt']
+    assert idx.indexing.remove_file.call_count == 2
+    idx.storage.store.assert_called_once()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.17 18:00:00                  #
+# ================================================== #
+
+import os
+from unittest.mock import MagicMock, patch
+
+from llama_index.readers.schema.base import Document
+
+from tests.mocks import mock_window_conf
+from pygpt_net.core.idx import Idx
+from pygpt_net.core.idx.indexing import Indexing
+
+
+def prepare(mock_window_conf):
+    indexing = Indexing(mock_window_conf)
+    indexing.window.core.tokens.from_str = MagicMock(return_value=5)
+    indexing.get_documents = MagicMock(side_effect=lambda file: [
+        Document(text=file + " 1"),
+        Document(text=file + " 2"),
+    ])
+    return indexing
+
+
+def index_dir(indexing, index, **kwargs):
+    with patch('os.path.isdir', return_value=True), \
+            patch('os.path.isfile', return_value=True), \
+            patch('os.listdir', return_value=['a.txt', 'b.txt']):
+        return indexing.index_files(index, 'dir', **kwargs)
+
+
+def test_index_files_progress(mock_window_conf):
+    """Test indexing progress"""
+    indexing = prepare(mock_window_conf)
+    index = MagicMock()
+    progress = MagicMock()
+    files, errors = index_dir(indexing, index, progress=progress)
+    assert len(files) == 2
+    assert index.insert.call_count == 4
+    data = progress.call_args[0][0]
+    assert data['docs'] == 4
+    assert data['tokens'] == 20
+    assert data['files_done'] == 2
+    assert data['files_total'] == 2
+
+
+def test_index_files_stop(mock_window_conf):
+    """Test indexing cancellation between documents"""
+    indexing = prepare(mock_window_conf)
+    index = MagicMock()
+    stopped = MagicMock(side_effect=[False, False, False, False, False, True])
+    files, errors = index_dir(indexing, index, is_stopped=stopped)
+    assert list(files.keys()) == ['dir/a.txt']
+    assert index.insert.call_count == 3
+    index.delete_ref_doc.assert_called_once()  # partial file removed
+
+
+def test_index_files_skip(mock_window_conf):
+    """Test skip files indexed by interrupted job"""
+    indexing = prepare(mock_window_conf)
+    index = MagicMock()
+    files, errors = index_dir(indexing, index, skip={'dir/a.txt': 'id'})
+    assert list(files.keys()) == ['dir/b.txt']
+    assert index.insert.call_count == 2
+
+
+def test_idx_checkpoint(mock_window_conf):
+    """Test checkpoint on cancel and resume from manifest"""
+    idx = Idx(mock_window_conf)
+    idx.storage = MagicMock()
+    idx.indexing.index_files = MagicMock(return_value=({'dir/b.txt': 'id2'}, []))
+    idx.load_manifest = MagicMock(return_value={'dir/a.txt': 'id1'})
+    idx.save_manifest = MagicMock()
+    idx.remove_manifest = MagicMock()
+
+    files, errors = idx.index_files('base', 'dir', is_stopped=lambda: True)
+    assert files == {'dir/a.txt': 'id1', 'dir/b.txt': 'id2'}
+    idx.save_manifest.assert_called_once_with('base', 'dir', files)
+    assert idx.indexing.index_files.call_args[1]['skip'] == {'dir/a.txt': 'id1'}
+
+    idx.index_files('base', 'dir', is_stopped=lambda: False)
+    idx.remove_manifest.assert_called_once_with('base')
+
+
+def test_get_db_data_from_ts(mock_window_conf):
+    """Test ctx items are read in update order and resumed after last indexed item"""
+    from sqlalchemy import create_engine, text
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE ctx_meta (id INTEGER PRIMARY KEY, updated_ts INTEGER)"))
+        conn.execute(text("CREATE TABLE ctx_item (id INTEGER PRIMARY KEY, meta_id INTEGER, input TEXT, output TEXT)"))
+        conn.execute(text("INSERT INTO ctx_meta (id, updated_ts) VALUES (1, 20), (2, 10), (3, 5)"))
+        conn.execute(text("INSERT INTO ctx_item (id, meta_id, input, output) VALUES "
+                          "(1, 1, 'a', 'b'), (2, 2, 'c', 'd'), (3, 1, 'e', 'f'), (4, 3, 'g', 'h')"))
+    indexing = Indexing(mock_window_conf)
+    indexing.window.core.db.get_db = MagicMock(return_value=engine)
+    documents, positions = indexing.get_db_data_from_ts(10)
+    assert [d.text for d in documents] == ['User: c; Assistant: d', 'User: a; Assistant: b', 'User: e; Assistant: f']
+    assert positions == [(10, 2), (20, 1), (20, 3)]
+    documents, positions = indexing.get_db_data_from_ts(20, 1)
+    assert positions == [(20, 3)]
+
+
+def test_idx_db_checkpoint(mock_window_conf):
+    """Test DB indexing is resumed from last record indexed by cancelled job"""
+    idx = Idx(mock_window_conf)
+    idx.window.core.config.get_user_dir = MagicMock(return_value='idx')
+    assert idx.get_manifest_path('base', 'db') == os.path.join('idx', '_manifest', 'base.db.json')  # not in index dir
+    manifests = {}
+    idx.read_manifest = MagicMock(side_effect=lambda i, name="files": manifests.get(name, {}))
+    idx.write_manifest = MagicMock(side_effect=lambda i, data, name="files": manifests.update({name: data}))
+    idx.remove_manifest = MagicMock(side_effect=lambda i, name="files": manifests.pop(name, None))
+    idx.storage = MagicMock()
+    idx.indexing.index_db_from_updated_ts = MagicMock(return_value=(2, [], (20, 3)))
+
+    num, errors = idx.index_db_from_updated_ts('base', 10, is_stopped=lambda: True)
+    assert num == 2
+    assert idx.load_db_checkpoint('base', 10) == (20, 3)
+    assert idx.load_db_checkpoint('base', 0) == (0, 0)  # other job
+
+    idx.indexing.index_db_from_updated_ts = MagicMock(return_value=(0, [], None))
+    idx.index_db_from_updated_ts('base', 10, is_stopped=lambda: False)
+    assert idx.indexing.index_db_from_updated_ts.call_args[0][1] == 20
+    assert idx.indexing.index_db_from_updated_ts.call_args[0][4] == 3
+    assert idx.load_db_checkpoint('base', 10) == (10, 0)  # finished, checkpoint removed
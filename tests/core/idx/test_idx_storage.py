@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.17 10:00:00                  #
+# ================================================== #
+
+from unittest.mock import MagicMock, patch
+
+from tests.mocks import mock_window_conf
+from pygpt_net.core.idx.storage import Storage
+
+
+def prepare(mock_window_conf, limit=512):
+    mock_window_conf.core.config.get_user_dir = MagicMock(return_value='test_path')
+    mock_window_conf.core.config.has = MagicMock(return_value=True)
+    mock_window_conf.core.config.get = MagicMock(
+        side_effect=lambda key: limit if key == 'llama.idx.cache.max_size' else 'key')
+    storage = Storage(mock_window_conf)
+    storage.get_llm = MagicMock(return_value=None)
+    storage.exists = MagicMock(return_value=True)
+    storage.get_dir_info = MagicMock(return_value=(100, 1024))
+    return storage
+
+
+def test_get_cached(mock_window_conf):
+    """Test get index from cache"""
+    storage = prepare(mock_window_conf)
+    with patch('pygpt_net.core.idx.storage.ServiceContext') as ctx, \
+            patch('pygpt_net.core.idx.storage.StorageContext'), \
+            patch('pygpt_net.core.idx.storage.load_index_from_storage') as load:
+        load.return_value = MagicMock()
+        index1 = storage.get('base')
+        index2 = storage.get('base')
+        assert index1 is index2
+        assert load.call_count == 1
+        assert ctx.from_defaults.call_count == 1
+    assert storage.stats['hits'] == 1
+    assert storage.stats['misses'] == 1
+
+
+def test_get_modified(mock_window_conf):
+    """Test reload index modified on disk"""
+    storage = prepare(mock_window_conf)
+    with patch('pygpt_net.core.idx.storage.ServiceContext'), \
+            patch('pygpt_net.core.idx.storage.StorageContext'), \
+            patch('pygpt_net.core.idx.storage.load_index_from_storage') as load:
+        load.return_value = MagicMock()
+        storage.get('base')
+        storage.get_dir_info = MagicMock(return_value=(200, 1024))  # modified
+        storage.get('base')
+        assert load.call_count == 2
+    assert storage.stats['invalidations'] == 1
+
+
+def test_store(mock_window_conf):
+    """Test store index refreshes cache"""
+    storage = prepare(mock_window_conf)
+    index = MagicMock()
+    storage.store('base', index)
+    index.storage_context.persist.assert_called_once()
+    assert storage.indexes['base'] is index
+    assert storage.meta['base']['mtime'] == 100
+
+
+def test_remove(mock_window_conf):
+    """Test remove index invalidates cache"""
+    storage = prepare(mock_window_conf)
+    storage.indexes['base'] = MagicMock()
+    storage.meta['base'] = {'mtime': 0, 'size': 0, 'context': None}
+    with patch('os.path.exists', return_value=False):
+        assert storage.remove('base') is True
+    assert 'base' not in storage.indexes
+    assert 'base' not in storage.meta
+
+
+def test_evict(mock_window_conf):
+    """Test evict least recently used index above budget"""
+    storage = prepare(mock_window_conf, limit=0)
+    storage.cache('base', MagicMock())
+    storage.cache('other', MagicMock())
+    assert list(storage.indexes.keys()) == ['other']
+    assert storage.stats['evictions'] == 1
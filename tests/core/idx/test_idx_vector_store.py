@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import os
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import pytest
+from llama_index import Document, PromptHelper, ServiceContext, StorageContext, VectorStoreIndex
+from llama_index.node_parser import SentenceSplitter
+from llama_index.schema import TextNode, NodeRelationship, RelatedNodeInfo
+from llama_index.token_counter.mock_embed_model import MockEmbedding
+from llama_index.vector_stores.types import VectorStoreQuery, MetadataFilters, ExactMatchFilter
+
+from tests.mocks import mock_window_conf
+from pygpt_net.core.idx import Idx
+from pygpt_net.core.idx.vector_store import SQLiteVectorStore
+
+# other tests replace some os functions with mocks
+real_os = {
+    'os.path.exists': os.path.exists,
+    'os.makedirs': os.makedirs,
+    'os.mkdir': os.mkdir,
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with patch('os.path.exists', real_os['os.path.exists']), \
+            patch('os.makedirs', real_os['os.makedirs']), \
+            patch('os.mkdir', real_os['os.mkdir']):
+        path = os.path.join(str(tmp_path), 'base')
+        store = SQLiteVectorStore(path)
+        yield store
+        store.close()
+
+
+def make_node(id, embedding, ref_doc_id, file):
+    return TextNode(
+        id_=id,
+        text='text ' + id,
+        embedding=embedding,
+        metadata={'file': file},
+        relationships={NodeRelationship.SOURCE: RelatedNodeInfo(node_id=ref_doc_id)},
+    )
+
+
+def test_add_query(store):
+    """Test add nodes and query by similarity"""
+    ids = store.add([
+        make_node('n1', [1.0, 0.0], 'd1', 'a'),
+        make_node('n2', [0.0, 1.0], 'd2', 'b'),
+    ])
+    assert ids == ['n1', 'n2']
+    result = store.query(VectorStoreQuery(query_embedding=[0.1, 1.0], similarity_top_k=1))
+    assert result.ids == ['n2']
+    assert result.nodes[0].text == 'text n2'
+
+
+def test_reopen(store):
+    """Test reopen persisted store"""
+    store.add([make_node('n1', [1.0, 0.0], 'd1', 'a')])
+    store.persist()
+    store.close()
+    other = SQLiteVectorStore(store.path)
+    assert SQLiteVectorStore.is_store(store.path)
+    result = other.query(VectorStoreQuery(query_embedding=[1.0, 0.0], similarity_top_k=5))
+    assert result.ids == ['n1']
+    other.close()
+
+
+def test_filters(store):
+    """Test query with metadata filters"""
+    store.add([
+        make_node('n1', [1.0, 0.0], 'd1', 'a'),
+        make_node('n2', [0.9, 0.1], 'd2', 'b'),
+    ])
+    filters = MetadataFilters(filters=[ExactMatchFilter(key='file', value='b')])
+    result = store.query(VectorStoreQuery(query_embedding=[1.0, 0.0], similarity_top_k=2, filters=filters))
+    assert result.ids == ['n2']
+
+
+def test_delete(store):
+    """Test delete nodes by ref doc id"""
+    store.add([
+        make_node('n1', [1.0, 0.0], 'd1', 'a'),
+        make_node('n2', [0.9, 0.1], 'd2', 'b'),
+    ])
+    store.delete('d1')
+    result = store.query(VectorStoreQuery(query_embedding=[1.0, 0.0], similarity_top_k=2))
+    assert result.ids == ['n2']
+
+
+def test_add_rollback(store):
+    """Test failed add leaves no rows and no vectors"""
+    store.add([make_node('n1', [1.0, 0.0], 'd1', 'a')])
+    conn = store.get_conn()
+
+    class FailingConn:
+        def __getattr__(self, name):
+            return getattr(conn, name)
+
+        def commit(self):
+            raise sqlite3.OperationalError("disk I/O error")
+
+    store.conn = FailingConn()
+    with pytest.raises(sqlite3.OperationalError):
+        store.add([make_node('n2', [0.0, 1.0], 'd2', 'b')])
+    store.conn = conn
+    store.persist()  # nothing left to commit
+    assert os.path.getsize(store.vectors_path) == 8
+    assert conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 1
+
+    with open(store.vectors_path, "ab") as f:
+        f.write(b"\x00\x00\x00")  # incomplete row from interrupted write
+    store.add([make_node('n3', [0.0, 1.0], 'd3', 'c')])
+    assert os.path.getsize(store.vectors_path) == 16
+    result = store.query(VectorStoreQuery(query_embedding=[0.0, 1.0], similarity_top_k=2))
+    assert result.ids == ['n3', 'n1']
+
+
+def test_sync_files(store, mock_window_conf):
+    """Test remove deleted and modified files from SQLite index (ref_doc_info is not available)"""
+    context = ServiceContext.from_defaults(
+        llm=None,
+        embed_model=MockEmbedding(embed_dim=2),
+        prompt_helper=PromptHelper(tokenizer=str.split),  # other tests replace tiktoken with mocks
+        node_parser=SentenceSplitter(tokenizer=str.split),
+    )
+    index = VectorStoreIndex([], storage_context=StorageContext.from_defaults(vector_store=store),
+                             service_context=context)
+    index.insert(Document(text='aaa', metadata={'file_path': '/data/a.txt'}))
+    index.insert(Document(text='bbb', metadata={'file_path': '/data/b.txt'}))
+    idx = Idx(mock_window_conf)
+    idx.storage = MagicMock()
+    idx.storage.get.return_value = index
+    idx.indexing.index_files = MagicMock(return_value=({}, []))
+    files, removed, errors = idx.sync_files('base', ['/data/c.txt'], ['/data/a.txt'])
+    assert removed == ['/data/a.txt']
+    assert errors == []
+    assert store.get_ref_doc_ids('/data/a.txt') == []
+    assert len(store.get_ref_doc_ids('/data/b.txt')) == 1
+    idx.storage.store.assert_called_once()
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.03 19:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from unittest.mock import MagicMock, patch
@@ -21,3 +21,6 @@ def test_clean_text():
     text = 'speak this~###~ignore this~###~ only'
     res = audio.clean_text(text)
     assert res == 'speak this only'
+    text = 'speak this\n```python\nprint("x")\n```\n only'
+    res = audio.clean_text(text)
+    assert res == 'speak this\n\n only'
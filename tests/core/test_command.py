@@ -77,4 +77,20 @@ def test_extract_cmd_white_spaces():
     cmd = Command()
     cmd1 = '   ' \
            '{"cmd": "command1", "params": {"arg1": "some arg"}}   '
-    assert cmd.extract_cmd(cmd1) == json.loads(cmd1.strip())
\ No newline at end of file
+    assert cmd.extract_cmd(cmd1) == json.loads(cmd1.strip())
+
+def test_extract_cmds_partial():
+    """
+    Test extract closed cmds from partial (streamed) response
+    """
+    cmd = Command()
+    cmd1 = '{"cmd": "command1", "params": {"arg1": "some arg"}}'
+    cmd2 = '{"cmd": "command2", "params": {"query": "some other arg"}}'
+    response = 'bla bla bla ~###~ ' + cmd1 + ' ~###~ ' + cmd2
+    cmds, offset = cmd.extract_cmds_partial(response[:20])
+    assert cmds == []
+    cmds, offset = cmd.extract_cmds_partial(response, offset)
+    assert cmds == [json.loads(cmd1)]
+    assert response[offset:].startswith('~###~ ' + cmd2)
+    cmds, offset = cmd.extract_cmds_partial(response + ' ~###~', offset)
+    assert cmds == [json.loads(cmd2)]
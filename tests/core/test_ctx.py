@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.02 11:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 from unittest.mock import MagicMock, patch
@@ -759,11 +759,17 @@ def test_check(mock_window_conf):
     ctx.get_tokens_left = MagicMock()
     ctx.get_tokens_left.return_value = 10
     ctx.remove_first = MagicMock()
+    ctx.is_compact = MagicMock(return_value=False)
     ctx.check(5, 20)
     ctx.remove_first.assert_not_called()
     ctx.check(10, 20)
     ctx.remove_first.assert_called_once_with()
 
+    # compaction enabled, first item is summarized instead of removed
+    ctx.is_compact = MagicMock(return_value=True)
+    ctx.check(10, 20)
+    ctx.remove_first.assert_called_once_with()
+
 
 def test_get_tokens_left(mock_window_conf):
     """
@@ -951,3 +957,70 @@ def test_store(mock_window_conf):
     ctx.store()
     ctx.save.assert_called_once_with(7)
 
+
+
+def test_get_prompt_items_compact():
+    """
+    Test get_prompt_items with summary of dropped items
+    """
+    ctx = Ctx()
+    ctx.window = MagicMock()
+    ctx.window.core.config.get = MagicMock(side_effect=lambda key: key == 'ctx.compact')
+    ctx.window.core.tokens.from_ctx = MagicMock(return_value=100)
+    ctx.save = MagicMock()
+    ctx.current = 1
+    ctx.meta[1] = CtxMeta()
+    items = [CtxItem() for _ in range(16)]
+    ctx.items = items
+
+    # not summarized yet, oldest items are dropped
+    assert ctx.get_prompt_items('test_model', 'test_mode', 100, 1500) == items[1:15]
+
+    # range includes items not fitting next to summary (reserve: 100 + 1000 tokens)
+    assert ctx.get_summary_reserve('test_model', 'test_mode') == 1100
+    assert ctx.get_compact_range('test_model', 'test_mode', 100, 1500) == (0, 13)
+
+    # summary replaces dropped and summarized items, nothing else is dropped
+    ctx.set_summary(1, "summary", 13)
+    assert ctx.meta[1].summary == "summary"
+    assert ctx.meta[1].summary_count == 13
+    result = ctx.get_prompt_items('test_model', 'test_mode', 100, 1500)
+    assert result[0].output.endswith("summary")
+    assert result[1:] == items[13:15]
+    assert ctx.get_compact_range('test_model', 'test_mode', 100, 1500) == (13, 13)
+
+    # no summary if all items fit
+    assert ctx.get_prompt_items('test_model', 'test_mode', 100, 10000) == items[:15]
+
+    # compaction disabled
+    ctx.window.core.config.get = MagicMock(return_value=False)
+    assert ctx.get_prompt_items('test_model', 'test_mode', 100, 1500) == items[1:15]
+
+
+def test_reset_summary():
+    """
+    Test clear summary on change of summarized items
+    """
+    ctx = Ctx()
+    ctx.window = MagicMock()
+    ctx.provider = MagicMock()
+    ctx.save = MagicMock()
+    ctx.current = 1
+    ctx.meta[1] = CtxMeta()
+    items = [CtxItem() for _ in range(4)]
+    ctx.items = items
+    ctx.set_summary(1, "summary", 2)
+
+    # not summarized item
+    ctx.update_item(items[3])
+    assert ctx.meta[1].summary == "summary"
+
+    # summarized item
+    ctx.update_item(items[1])
+    assert ctx.meta[1].summary is None
+    assert ctx.meta[1].summary_count == 0
+
+    # positions shifted
+    ctx.set_summary(1, "summary", 2)
+    ctx.remove_first()
+    assert ctx.meta[1].summary is None
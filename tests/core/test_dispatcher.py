@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.03 19:00:00                  #
+# Updated Date: 2024.01.19 04:00:00                  #
 # ================================================== #
 import json
 import os
@@ -21,13 +21,44 @@ def test_dispatch(mock_window):
     dispatcher = Dispatcher(mock_window)
     event = Event('test')
     dispatcher.apply = MagicMock()
-    mock_window.core.plugins.plugins = ['test1', 'test2', 'test3']
+    mock_window.core.plugins.plugins = {
+        'test1': MagicMock(events=None),
+        'test2': MagicMock(events=None),
+        'test3': MagicMock(events=None),
+    }
     mock_window.controller.plugins.is_enabled = MagicMock(return_value=True)
     affected, event = dispatcher.dispatch(event)
     assert affected == ['test1', 'test2', 'test3']
     assert event.name == 'test'
 
 
+def test_dispatch_subscribed(mock_window):
+    """Test dispatch only to enabled plugins subscribed to event"""
+    dispatcher = Dispatcher(mock_window)
+    dispatcher.apply = MagicMock()
+    mock_window.core.plugins.plugins = {
+        'test1': MagicMock(events=['test']),
+        'test2': MagicMock(events=['other']),
+        'test3': MagicMock(events=None),
+        'test4': MagicMock(events=['test']),
+    }
+    mock_window.controller.plugins.is_enabled = MagicMock(side_effect=lambda id: id != 'test4')
+    affected, event = dispatcher.dispatch(Event('test'))
+    assert affected == ['test1', 'test3']
+    affected, event = dispatcher.dispatch(Event('other'))
+    assert affected == ['test2', 'test3']
+
+    # cached until rebuild
+    mock_window.controller.plugins.is_enabled = MagicMock(return_value=True)
+    assert dispatcher.get_handlers('test') == ['test1', 'test3']
+    dispatcher.rebuild()
+    assert dispatcher.get_handlers('test') == ['test1', 'test3', 'test4']
+
+    # dispatch to all plugins
+    affected, event = dispatcher.dispatch(Event('test'), all=True)
+    assert affected == ['test1', 'test2', 'test3', 'test4']
+
+
 def test_apply(mock_window):
     """Test apply"""
     dispatcher = Dispatcher(mock_window)
@@ -45,8 +76,36 @@ def test_reply(mock_window):
     ctx.reply = True
     ctx.results = {'test': 'test'}
     ctx.internal = False
+    dispatcher.window.controller.command.collect = MagicMock(return_value=False)
     dispatcher.window.core.ctx.update_item = MagicMock()
     dispatcher.window.controller.chat.input.send = MagicMock()
     dispatcher.reply(ctx)
     dispatcher.window.core.ctx.update_item.assert_called_once_with(ctx)
     dispatcher.window.controller.chat.input.send.assert_called_once_with(json.dumps(ctx.results), force=True, internal=False)
+
+
+def test_apply_timings(mock_window):
+    """Test handle() timings stats"""
+    dispatcher = Dispatcher(mock_window)
+    mock_window.core.plugins.plugins = {'test1': MagicMock()}
+    mock_window.core.config.get = MagicMock(return_value=0)
+    dispatcher.apply('test1', Event('test'))
+    dispatcher.apply('test1', Event('test'))
+    assert dispatcher.timings[('test1', 'test')]['count'] == 2
+
+
+def test_get_stats(mock_window):
+    """Test stats percentiles"""
+    dispatcher = Dispatcher(mock_window)
+    mock_window.core.config.get = MagicMock(return_value=0)
+    for i in range(1, 101):
+        dispatcher.record('test1', 'test', i / 1000)
+    dispatcher.record('test2', 'test', 0.5)
+    stats = dispatcher.get_stats()
+    assert stats[0]['id'] == 'test2'
+    assert stats[1]['count'] == 100
+    assert round(stats[1]['p50']) == 50
+    assert round(stats[1]['p95']) == 95
+    assert round(stats[1]['max']) == 100
+    dispatcher.reset_stats()
+    assert dispatcher.get_stats() == []
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.18 22:00:00                  #
+# ================================================== #
+
+import sys
+
+from pygpt_net.core.process import Process
+
+
+def python(code: str) -> str:
+    return '"{}" -c "{}"'.format(sys.executable, code)
+
+
+def test_run():
+    """Test output is captured and streamed"""
+    chunks = []
+    process = Process(python("import sys; print('out'); print('err', file=sys.stderr)"),
+                      callback=lambda name, data: chunks.append((name, data)))
+    process.run()
+    assert process.code == 0
+    assert process.get_stdout().strip() == "out"
+    assert process.get_stderr().strip() == "err"
+    assert process.get_result().split() == ["out", "err"]
+    assert "".join(data for name, data in chunks if name == "stdout").strip() == "out"
+    assert not process.timed_out
+
+
+def test_run_max_bytes():
+    """Test only the tail is kept"""
+    process = Process(python("print('a' * 1000 + 'END')"), max_bytes=10)
+    process.run()
+    assert process.is_truncated()
+    assert process.get_stdout().strip().endswith("END")
+    assert len(process.buffers["stdout"]) == 10
+    assert process.get_result().startswith("[output truncated")
+
+
+def test_run_timeout():
+    """Test process is killed after timeout"""
+    process = Process(python("import time; print('started', flush=True); time.sleep(30)"), timeout=1)
+    process.run()
+    assert process.timed_out
+    assert process.time < 10
+    assert "started" in process.get_result()
+    assert process.get_result().endswith("[timeout after 1 s, process killed]")
+
+
+def test_run_empty():
+    """Test empty output"""
+    process = Process(python("pass"))
+    process.run()
+    assert process.get_result() == "No result (STDOUT/STDERR empty)"
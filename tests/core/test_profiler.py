@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.18 16:00:00                  #
+# ================================================== #
+
+from unittest.mock import patch, mock_open
+
+from pygpt_net.core.debug.profiler import Profiler
+
+
+def test_timeline():
+    """Test startup timeline"""
+    profiler = Profiler()
+    with profiler.phase('init'):
+        with profiler.phase('init.sub'):
+            pass
+    profiler.mark('ready')
+    lines = profiler.get_timeline()
+    assert len(lines) == 3
+    assert lines[0].endswith(' init')
+    assert lines[1].endswith('   init.sub')  # nested
+    assert profiler.get_duration('init') >= profiler.get_duration('init.sub')
+
+
+def test_dump():
+    """Test trace file is written only in trace mode"""
+    profiler = Profiler()
+    profiler.mark('ready')
+    profiler.enabled = False
+    with patch('builtins.open', mock_open()) as mocked:
+        profiler.dump('test_path')
+        mocked.assert_not_called()
+    profiler.enabled = True
+    with patch('builtins.open', mock_open()) as mocked:
+        profiler.dump('test_path')
+        mocked.assert_called_once()
+        assert 'ready' in mocked().write.call_args[0][0]
@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.04 05:00:00                  #
+# Updated Date: 2024.01.19 20:00:00                  #
 # ================================================== #
 
 import os
@@ -77,3 +77,57 @@ def test_handle_audio_stop(mock_window):
     event.ctx = ctx
     plugin.handle(event)
     plugin.stop_audio.assert_called_once()
+
+
+def test_handle_ctx_after_streamed(mock_window):
+    """Test handle event: ctx.after (already spoken while streaming)"""
+    plugin = Plugin(window=mock_window)
+    plugin.init_options()
+    plugin.setup()
+    mock_window.threadpool.start = MagicMock()
+    ctx = CtxItem()
+    ctx.output = "output text"
+    event = Event()
+    event.name = "ctx.after"
+    event.data = {"streamed": True}
+    event.ctx = ctx
+    plugin.handle(event)
+    mock_window.threadpool.start.assert_not_called()
+
+
+def test_handle_stream(mock_window):
+    """Test handle event: audio.output.stream"""
+    plugin = Plugin(window=mock_window)
+    plugin.init_options()
+    plugin.setup()
+    plugin.options["azure_api_key"]["value"] = "API KEY"
+    plugin.options["azure_region"]["value"] = "REGION"
+    mock_window.threadpool.start = MagicMock()
+    for text, end in [("First sentence.", False), ("Second sentence.", False), ("Rest", True)]:
+        event = Event()
+        event.name = "audio.output.stream"
+        event.data = {"text": text, "end": end}
+        event.ctx = CtxItem()
+        plugin.handle(event)
+    mock_window.threadpool.start.assert_called_once()  # one worker for whole stream
+    worker = mock_window.threadpool.start.call_args[0][0]
+    assert [worker.stream.get_nowait() for _ in range(4)] == ["First sentence.", "Second sentence.", "Rest", None]
+    assert plugin.stream is None
+
+
+def test_stop_audio_stream(mock_window):
+    """Test stop audio cancels streamed output"""
+    plugin = Plugin(window=mock_window)
+    plugin.init_options()
+    plugin.setup()
+    plugin.options["azure_api_key"]["value"] = "API KEY"
+    plugin.options["azure_region"]["value"] = "REGION"
+    mock_window.threadpool.start = MagicMock()
+    plugin.on_stream("First sentence.")
+    worker = mock_window.threadpool.start.call_args[0][0]
+    plugin.playback = MagicMock()
+    playback = plugin.playback
+    plugin.stop_audio()
+    playback.stop.assert_called_once()
+    assert plugin.stream is None
+    assert [worker.stream.get_nowait() for _ in range(2)] == ["First sentence.", None]
@@ -41,6 +41,7 @@ def test_options(mock_window):
     assert "recognition_energy_threshold" in options
     assert "recognition_dynamic_energy_threshold" in options
     assert "recognition_dynamic_energy_adjustment_damping" in options
+    assert "recognition_dynamic_energy_ratio" in options
     assert "recognition_pause_threshold" in options
     assert "recognition_adjust_for_ambient_noise_duration" in options
 
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 16:00:00                  #
+# ================================================== #
+
+import wave
+
+import numpy as np
+
+from pygpt_net.plugin.audio_openai_whisper.capture import Listener, rms, to_wav
+
+CHUNK = 160  # 10ms at 16kHz
+
+
+def chunk(amplitude: int) -> bytes:
+    """Return chunk of constant amplitude samples"""
+    return np.full(CHUNK, amplitude, dtype=np.int16).tobytes()
+
+
+def reader(chunks: list):
+    """Return read callable returning chunks, then silence"""
+    items = list(chunks)
+
+    def read():
+        if items:
+            return items.pop(0)
+        return chunk(0)
+    return read
+
+
+def test_rms():
+    """Test RMS"""
+    assert rms(chunk(100)) == 100.0
+    assert rms(np.array([3, -4, 3, -4], dtype=np.int16).tobytes()) == np.sqrt(12.5)
+    assert rms(b"") == 0.0
+
+
+def test_to_wav():
+    """Test in-memory WAV"""
+    file = to_wav(chunk(100), 16000)
+    assert file.name == "audio.wav"
+    with wave.open(file, "rb") as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == 2
+        assert wav.getframerate() == 16000
+        assert wav.readframes(CHUNK) == chunk(100)
+
+
+def test_calibrate():
+    """Test calibrate to ambient noise"""
+    listener = Listener(16000, 2, CHUNK)
+    listener.energy_threshold = 0
+    listener.calibrate(reader([chunk(100)] * 1000), 5.0)
+    assert listener.calibrated
+    assert round(listener.energy_threshold) == 150  # noise * ratio
+
+
+def test_listen():
+    """Test listen for phrase"""
+    listener = Listener(16000, 2, CHUNK)
+    listener.energy_threshold = 500
+    listener.dynamic_energy_threshold = False
+    listener.pause_threshold = 0.1  # 10 chunks
+    listener.non_speaking_duration = 0.05  # 5 chunks
+    chunks = [chunk(10)] * 20 + [chunk(1000)] * 30
+    data = listener.listen(reader(chunks), timeout=5)
+    samples = np.frombuffer(data, dtype=np.int16)
+    assert samples.size == (5 + 30 + 5) * CHUNK  # pre-roll, phrase, kept silence
+    assert (samples[:5 * CHUNK] == 10).all()
+    assert (samples[5 * CHUNK:35 * CHUNK] == 1000).all()
+    assert (samples[35 * CHUNK:] == 0).all()
+
+
+def test_listen_phrase_limit():
+    """Test listen with phrase limit"""
+    listener = Listener(16000, 2, CHUNK)
+    listener.energy_threshold = 500
+    listener.non_speaking_duration = 0.01
+    data = listener.listen(reader([chunk(1000)] * 100), phrase_limit=0.2)
+    assert len(data) == 20 * CHUNK * 2
+
+
+def test_listen_timeout():
+    """Test listen timeout and stop"""
+    listener = Listener(16000, 2, CHUNK)
+    listener.energy_threshold = 500
+    listener.dynamic_energy_threshold = False
+    assert listener.listen(reader([]), timeout=0.1) is None
+    assert listener.listen(reader([chunk(1000)]), is_stopped=lambda: True) is None
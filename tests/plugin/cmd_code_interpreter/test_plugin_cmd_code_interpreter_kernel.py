@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.18 20:00:00                  #
+# ================================================== #
+
+import sys
+from unittest.mock import MagicMock, patch
+
+from tests.mocks import mock_window
+from pygpt_net.plugin.cmd_code_interpreter import Plugin
+from pygpt_net.plugin.cmd_code_interpreter.kernel import Kernel, KERNEL_SOURCE
+
+
+def get_kernel() -> Kernel:
+    return Kernel([sys.executable, "-c", KERNEL_SOURCE])
+
+
+def test_kernel_state():
+    """Test state is kept between executions"""
+    kernel = get_kernel()
+    try:
+        assert kernel.execute("x = 40\nprint('a')") == {"stdout": "a\n", "stderr": "", "truncated": False}
+        assert kernel.execute("print(x + 2)")["stdout"] == "42\n"
+        response = kernel.execute("1 / 0", "test.py")
+        assert "ZeroDivisionError" in response["stderr"]
+        assert 'File "test.py"' in response["stderr"]
+    finally:
+        kernel.stop()
+
+
+def test_kernel_max_output():
+    """Test output is truncated"""
+    kernel = get_kernel()
+    try:
+        response = kernel.execute("print('x' * 100)", max_output=10)
+        assert response["stdout"] == "x" * 10
+        assert response["truncated"] is True
+    finally:
+        kernel.stop()
+
+
+def test_kernel_timeout():
+    """Test kernel is restarted after timeout"""
+    kernel = get_kernel()
+    try:
+        kernel.execute("x = 1")
+        response = kernel.execute("import time\ntime.sleep(10)", timeout=1)
+        assert "timeout" in response["error"]
+        assert not kernel.is_alive()
+        response = kernel.execute("print('x' in globals())")
+        assert response["stdout"] == "False\n"  # new process
+    finally:
+        kernel.stop()
+
+
+def test_kernel_crash():
+    """Test kernel is restarted after crash"""
+    kernel = get_kernel()
+    try:
+        response = kernel.execute("import os\nos._exit(3)")
+        assert "code: 3" in response["error"]
+        assert kernel.execute("print(1)")["stdout"] == "1\n"
+    finally:
+        kernel.stop()
+
+
+def test_code_execute_kernel(mock_window):
+    """Test code_execute uses conversation kernel"""
+    plugin = Plugin(window=mock_window)
+    plugin.init_options()
+    plugin.setup()
+    plugin.options["kernel"]["value"] = True
+    mock_window.core.config.get_user_dir = MagicMock(return_value="/tmp")
+    plugin.runner.kernels.execute = MagicMock(return_value={"stdout": "ok\n", "stderr": "", "truncated": False})
+    ctx = MagicMock(meta_id=5)
+    item = {"cmd": "code_execute", "params": {"filename": "test.py", "code": "print('ok')"}}
+    with patch("builtins.open"):
+        response = plugin.runner.code_execute_host(ctx, item, {"cmd": "code_execute"})
+    assert response["result"] == "ok\n"
+    args = plugin.runner.kernels.execute.call_args.args
+    assert args[0] == 5
+    assert args[1] == "print('ok')"
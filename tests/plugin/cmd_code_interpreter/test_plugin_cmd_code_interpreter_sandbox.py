@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import itertools
+from unittest.mock import MagicMock, patch
+
+from tests.mocks import mock_window
+from pygpt_net.item.ctx import CtxItem
+from pygpt_net.plugin.cmd_code_interpreter import Plugin
+
+
+def get_plugin(mock_window) -> Plugin:
+    plugin = Plugin(window=mock_window)
+    plugin.init_options()
+    plugin.setup()
+    mock_window.core.config.get_user_dir = MagicMock(return_value="/tmp/data")
+    container = MagicMock()
+    container.status = "running"
+    container.client.api.exec_create.return_value = {"Id": "exec1"}
+    container.client.api.exec_start.return_value = iter([(b"out\n", None), (None, b"err\n")])
+    container.client.api.exec_inspect.return_value = {"ExitCode": 0}
+    client = MagicMock()
+    client.containers.run.return_value = container
+    plugin.runner.get_docker = MagicMock(return_value=client)
+    return plugin
+
+
+def test_run_docker_reuse_container(mock_window):
+    """Test kept sandbox container is reused between commands"""
+    plugin = get_plugin(mock_window)
+    client = plugin.runner.get_docker()
+    container = client.containers.run.return_value
+
+    assert plugin.runner.run_docker("echo 1") == "out\nerr\n"
+    container.client.api.exec_start.return_value = iter([(b"2\n", None)])
+    assert plugin.runner.run_docker("echo 2") == "2\n"
+
+    client.containers.run.assert_called_once()
+    kwargs = client.containers.run.call_args.kwargs
+    assert kwargs["detach"] is True
+    assert kwargs["mem_limit"] == "512m"
+    assert kwargs["nano_cpus"] == 1000000000
+    assert kwargs["pids_limit"] == 256
+    assert kwargs["network_disabled"] is False
+    assert container.client.api.exec_create.call_count == 2
+    assert container.client.api.exec_create.call_args.args[1] == \
+           ["timeout", "-s", "KILL", "120", "sh", "-c", "echo 2"]
+
+
+def test_run_docker_recreate_on_config_change(mock_window):
+    """Test sandbox container is recreated when options change"""
+    plugin = get_plugin(mock_window)
+    client = plugin.runner.get_docker()
+    container = client.containers.run.return_value
+
+    plugin.runner.run_docker("echo 1")
+    plugin.options["sandbox_docker_mem_limit"]["value"] = "1g"
+    container.client.api.exec_start.return_value = iter([])
+    plugin.runner.run_docker("echo 2")
+
+    assert client.containers.run.call_count == 2
+    container.remove.assert_called_once_with(force=True)
+
+
+def test_run_docker_no_keep(mock_window):
+    """Test one-shot container when keep option is disabled"""
+    plugin = get_plugin(mock_window)
+    plugin.options["sandbox_docker_keep"]["value"] = False
+    client = plugin.runner.get_docker()
+    client.containers.run.return_value = b"result"
+
+    assert plugin.runner.run_docker("echo 1") == b"result"
+    assert client.containers.run.call_args.args == ("python:3.8-alpine", "echo 1")
+    assert "mem_limit" not in client.containers.run.call_args.kwargs  # limits only in kept container
+    assert plugin.runner.sandbox.container is None
+
+
+def test_check_idle(mock_window):
+    """Test idle sandbox container is removed"""
+    plugin = get_plugin(mock_window)
+    sandbox = plugin.runner.sandbox
+    sandbox.remove = MagicMock()
+    plugin.runner.run_docker("echo 1")
+    container = sandbox.container
+
+    plugin.on_post_update()  # not idle yet
+    assert sandbox.container is container
+
+    sandbox.last_used -= 301
+    plugin.on_post_update()
+    assert sandbox.container is None
+
+
+def test_check_idle_running(mock_window):
+    """Test sandbox container is not removed while silent command is executed"""
+    plugin = get_plugin(mock_window)
+    sandbox = plugin.runner.sandbox
+    sandbox.remove = MagicMock()
+    container = sandbox.get_container()
+
+    def output():
+        sandbox.last_used -= 301  # command prints nothing for longer than timeout
+        plugin.on_post_update()
+        assert sandbox.container is container
+        yield b"done\n", None
+
+    container.client.api.exec_start.return_value = output()
+    assert sandbox.execute("sleep 400") == "done\n"
+    assert sandbox.running == 0
+    plugin.on_post_update()  # used just now
+    assert sandbox.container is container
+
+
+def test_destroy(mock_window):
+    """Test sandbox container is removed on destroy"""
+    plugin = get_plugin(mock_window)
+    plugin.runner.run_docker("echo 1")
+    container = plugin.runner.sandbox.container
+
+    plugin.destroy()
+    container.remove.assert_called_once_with(force=True)
+    assert plugin.runner.sandbox.container is None
+
+
+def test_execute_stream(mock_window):
+    """Test output is streamed to ctx and exit code is reported"""
+    plugin = get_plugin(mock_window)
+    plugin.runner.signals = MagicMock()
+    ctx = CtxItem()
+    container = plugin.runner.sandbox.get_container()
+    container.client.api.exec_inspect.return_value = {"ExitCode": 2}
+    result = plugin.runner.run_docker("python3 fail.py", ctx)
+    assert result == "out\nerr\n[error: command returned non-zero exit code 2]"
+    chunks = [call.args for call in plugin.runner.signals.output.emit.call_args_list]
+    assert chunks == [(ctx, "out\n"), (ctx, "err\n")]
+
+
+def test_execute_limit(mock_window):
+    """Test captured output is limited and timeout is reported"""
+    plugin = get_plugin(mock_window)
+    plugin.options["max_output"]["value"] = 4
+    plugin.options["sandbox_docker_timeout"]["value"] = 0
+    sandbox = plugin.runner.sandbox
+    container = sandbox.get_container()
+    assert sandbox.execute("echo 1") == "[output truncated, showing last 4 bytes]\nerr\n"
+    assert container.client.api.exec_create.call_args.args[1] == ["sh", "-c", "echo 1"]
+
+    plugin.options["sandbox_docker_timeout"]["value"] = 1
+    container.client.api.exec_start.return_value = iter([])
+    container.client.api.exec_inspect.return_value = {"ExitCode": 137}
+    with patch('time.time', side_effect=itertools.count(0, 5)):  # 5 s between calls
+        assert sandbox.execute("sleep 10") == "[timeout after 1 s, process killed]"
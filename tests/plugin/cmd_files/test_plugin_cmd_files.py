@@ -6,7 +6,7 @@
 # GitHub:  https://github.com/szczyglis-dev/py-gpt   #
 # MIT License                                        #
 # Created By  : Marcin Szczygliński                  #
-# Updated Date: 2024.01.04 05:00:00                  #
+# Updated Date: 2024.01.19 22:00:00                  #
 # ================================================== #
 
 import os
@@ -39,6 +39,7 @@ def test_options(mock_window):
     assert "cmd_file_exists" in options
     assert "cmd_file_size" in options
     assert "cmd_file_info" in options
+    assert "cmd_search_files" in options
     assert "syntax_read_file" in options
     assert "syntax_save_file" in options
     assert "syntax_append_file" in options
@@ -55,6 +56,7 @@ def test_options(mock_window):
     assert "syntax_file_exists" in options
     assert "syntax_file_size" in options
     assert "syntax_file_info" in options
+    assert "syntax_search_files" in options
 
 
 def test_handle_cmd_syntax(mock_window):
@@ -70,7 +72,7 @@ def test_handle_cmd_syntax(mock_window):
     }
     event.ctx = ctx
     plugin.handle(event)
-    assert len(event.data["syntax"]) == 16  # 16 commands
+    assert len(event.data["syntax"]) == 17  # 17 commands
 
 
 def test_handle_cmd_execute(mock_window):
@@ -94,3 +96,25 @@ def test_handle_cmd_execute(mock_window):
     event.ctx = ctx
     plugin.handle(event)
     mock_window.threadpool.start.assert_called_once()
+
+
+def test_handle_cmd_execute_internal(mock_window):
+    """Test internal commands are executed synchronously unless scheduled"""
+    plugin = Plugin(window=mock_window)
+    plugin.init_options()
+    plugin.setup()
+    ctx = CtxItem()
+    ctx.internal = True
+    event = Event("cmd.execute", {"commands": [{"cmd": "read_file", "params": {"filename": "test.txt"}}]})
+    event.ctx = ctx
+    plugin.is_async = True  # dispatched from worker
+    with patch('pygpt_net.plugin.cmd_files.worker.Worker.run') as run:
+        plugin.handle(event)
+        run.assert_called_once()
+        mock_window.threadpool.start.assert_not_called()
+
+        # scheduled by command controller (batch owns the reply)
+        event.data["commands"][0]["job"] = 1
+        plugin.handle(event)
+        run.assert_called_once()
+        mock_window.threadpool.start.assert_called_once()
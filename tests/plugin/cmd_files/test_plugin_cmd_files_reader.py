@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pygpt_net.plugin.cmd_files.reader import Reader
+
+
+@pytest.fixture
+def path():
+    with tempfile.NamedTemporaryFile('wb', suffix='.txt', delete=False) as file:
+        file.write("".join("line {}\n".format(i) for i in range(1, 11)).encode("utf-8"))
+    yield file.name
+    Path(file.name).unlink()
+
+
+def test_read_whole(path):
+    """Test whole file is returned as before"""
+    assert Reader().read(path, {"filename": "test.txt"}) == "".join("line {}\n".format(i) for i in range(1, 11))
+
+
+def test_read_max_bytes(path):
+    """Test large file is returned in parts"""
+    result = Reader(max_bytes=14).read(path, {"filename": "test.txt"})
+    assert result == {"data": "line 1\nline 2\n", "offset": 0, "end": 14, "next_offset": 14, "size": 71}
+    result = Reader(max_bytes=14).read(path, {"offset": 63})
+    assert result == {"data": "line 10\n", "offset": 63, "end": 71, "size": 71}
+
+
+def test_read_lines(path):
+    """Test lines range"""
+    result = Reader().read(path, {"line_start": 3, "line_end": 4})
+    assert result["data"] == "line 3\nline 4\n"
+    assert result["lines"] == "3-4"
+    result = Reader().read(path, {"line_start": 9, "max_bytes": 10})
+    assert result["data"] == "line 9\n"
+    assert result["next_line"] == 10
+
+
+def test_read_lines_long_line(path):
+    """Test part of line longer than max bytes is returned"""
+    result = Reader().read(path, {"line_start": 2, "max_bytes": 4})
+    assert result["data"] == "line"
+    assert result["lines"] == "2-2"
+    assert result["offset"] == 7
+    assert result["next_offset"] == 11
+    assert result["next_line"] == 3
+    assert Reader().read(path, {"offset": 11, "max_bytes": 4})["data"] == " 2\nl"
+
+
+def test_read_head_tail(path):
+    """Test head and tail"""
+    assert Reader().read(path, {"head": 2})["data"] == "line 1\nline 2\n"
+    result = Reader().read(path, {"tail": 2})
+    assert result["data"] == "line 9\nline 10\n"
+    assert result["offset"] == 56
+    assert Reader().read(path, {"tail": 100})["data"].startswith("line 1\n")
+    assert Reader().read(path, {"tail": 2, "max_bytes": 3})["data"] == "10\n"
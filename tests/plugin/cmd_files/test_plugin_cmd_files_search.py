@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import os
+from unittest.mock import MagicMock
+
+from pygpt_net.plugin.cmd_files.search import Search
+
+ROOT = os.path.normpath("/data")
+A = os.path.join(ROOT, "a.txt")
+B = os.path.join(ROOT, "sub", "b.txt")
+C = os.path.join(ROOT, "c.bin")
+
+
+def get_search(files: dict) -> Search:
+    """Search on fake directory tree built from files: path => (mtime, text)"""
+    search = Search()
+
+    def scan_dir(path):
+        names = {}
+        dirs = set()
+        for p, (mtime, text) in files.items():
+            rel = os.path.relpath(p, path)
+            if rel.startswith(".."):
+                continue
+            if os.sep in rel:
+                dirs.add(rel.split(os.sep)[0])
+            else:
+                names[rel] = (mtime, len(text or ""))
+        return names, sorted(dirs)
+
+    def get_mtime(path):
+        names, dirs = scan_dir(path)
+        return hash(tuple(sorted(names)) + tuple(dirs))  # changed only if entries added or removed
+
+    search.RESCAN_INTERVAL = 0  # full rescan on every update
+    search.get_mtime = MagicMock(side_effect=get_mtime)
+    search.scan_dir = MagicMock(side_effect=scan_dir)
+    search.read = MagicMock(side_effect=lambda path: files[path][1])
+    return search
+
+
+def test_search():
+    """Test search with incremental index update"""
+    files = {
+        A: (1, "first line\nHello World\nhello again\n"),
+        B: (1, "nothing here\n"),
+        C: (1, None),  # binary
+    }
+    search = get_search(files)
+    result = search.search(ROOT, "hello")
+    assert result["matches"] == 2
+    assert result["files"] == 1
+    assert result["results"][0] == {"path": "a.txt", "line": 2, "snippet": "Hello World"}
+    assert result["results"][1]["line"] == 3
+    assert "truncated" not in result
+
+    # limit
+    result = search.search(ROOT, "hello", limit=1)
+    assert len(result["results"]) == 1
+    assert result["truncated"] is True
+
+    # modified and deleted files are re-indexed
+    files[B] = (2, "nothing here\nsay hello\n")
+    del files[A]
+    result = search.search(ROOT, "hello")
+    assert result["results"] == [{"path": os.path.join("sub", "b.txt"), "line": 2, "snippet": "say hello"}]
+    assert A not in search.files
+    assert all(A not in paths for paths in search.postings.values())
+
+    # path filter
+    assert search.search(ROOT, "hello", path="other")["results"] == []
+    assert search.search(ROOT, "hello", path="sub")["matches"] == 1
+
+
+def test_update():
+    """Test only changed files are re-indexed"""
+    files = {A: (1, "abc")}
+    search = get_search(files)
+    assert search.update(ROOT) == 1
+    assert search.update(ROOT) == 0
+    assert search.postings["abc"] == {A}
+    files[A] = (2, "abd")
+    assert search.update(ROOT) == 1
+    assert "abc" not in search.postings
+    assert search.postings["abd"] == {A}
+
+
+def test_update_dirs():
+    """Test not modified directories are not listed again"""
+    files = {A: (1, "abc"), B: (1, "abc")}
+    search = get_search(files)
+    search.RESCAN_INTERVAL = 60
+    search.update(ROOT)
+    assert search.scan_dir.call_count == 2
+    search.update(ROOT)
+    assert search.scan_dir.call_count == 2  # no changes
+
+    # new file in subdirectory
+    files[os.path.join(ROOT, "sub", "d.txt")] = (1, "abd")
+    assert search.update(ROOT) == 1
+    assert search.scan_dir.call_args_list[-1].args[0] == os.path.join(ROOT, "sub")
+    assert search.scan_dir.call_count == 3
+
+    # file modified in place is found on full rescan (e.g. after files modified by command)
+    files[A] = (3, "abe")
+    assert search.update(ROOT) == 0
+    search.invalidate()
+    assert search.update(ROOT) == 1
+    assert search.postings["abe"] == {A}
+
+
+def test_search_skipped():
+    """Test large files are reported in result"""
+    files = {A: (1, "hello"), B: (1, "hello")}
+    search = get_search(files)
+    search.MAX_FILE_SIZE = 4
+    result = search.search(ROOT, "hello")
+    assert result["matches"] == 0
+    assert result["skipped"]["paths"] == ["a.txt", os.path.join("sub", "b.txt")]
+    assert search.search(ROOT, "hello", path="sub")["skipped"]["paths"] == [os.path.join("sub", "b.txt")]
+    search.MAX_FILE_SIZE = 10
+    assert "skipped" not in search.search(ROOT, "hello")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+from unittest.mock import MagicMock
+
+from tests.mocks import mock_window
+from pygpt_net.core.dispatcher import Event
+from pygpt_net.item.ctx import CtxItem
+from pygpt_net.plugin.crontab import Plugin
+
+ITEM = {"enabled": True, "crontab": "* * * * *", "prompt": "test", "preset": "_", "priority": 0}
+
+
+def get_plugin(mock_window, isolated: bool = False) -> Plugin:
+    plugin = Plugin(window=mock_window)
+    plugin.attach(mock_window)
+    plugin.get_option_value = MagicMock(side_effect=lambda name: {
+        "isolated": isolated,
+        "max_concurrency": 2,
+        "coalesce": True,
+    }[name])
+    plugin.runs = MagicMock()
+    return plugin
+
+
+def test_options(mock_window):
+    """Test options"""
+    plugin = Plugin(window=mock_window)
+    options = plugin.setup()
+    assert "crontab" in options
+    assert "missed" in options
+    assert "coalesce" in options
+    assert "isolated" in options
+    assert "max_concurrency" in options
+
+
+def ctx_end(plugin: Plugin, output: str = "response") -> callable:
+    """Return job mock dispatching ctx end"""
+    def job(item):
+        ctx = CtxItem()
+        ctx.output = output
+        event = Event('ctx.end')
+        event.ctx = ctx
+        plugin.handle(event)
+    return job
+
+
+def test_process_queue_busy(mock_window):
+    """Test jobs wait for the current response"""
+    plugin = get_plugin(mock_window)
+    plugin.job = MagicMock(side_effect=ctx_end(plugin))
+    mock_window.controller.chat.input.generating = True
+    mock_window.controller.chat.input.locked = False
+    plugin.queue.add("a", ITEM)
+    plugin.process_queue()
+    plugin.job.assert_not_called()
+
+    mock_window.controller.chat.input.generating = False
+    plugin.process_queue()
+    plugin.job.assert_called_once_with(ITEM)
+    plugin.runs.add.assert_called_once()
+    assert plugin.runs.add.call_args.args[1] == "success"
+    assert plugin.queue.running == {}
+
+
+def test_process_queue_isolated(mock_window):
+    """Test isolated jobs run concurrently and results are stored in new ctx"""
+    plugin = get_plugin(mock_window, isolated=True)
+    plugin.start_worker = MagicMock()
+    plugin.store_ctx = MagicMock(return_value=5)
+    mock_window.controller.chat.input.generating = True  # not used in isolated mode
+    for key in ["a", "b", "c"]:
+        plugin.queue.add(key, ITEM)
+    plugin.process_queue()
+    assert plugin.start_worker.call_count == 2
+
+    job = plugin.start_worker.call_args_list[0].args[0]
+    plugin.handle_job_finished({"job": job, "output": "response"})
+    plugin.handle_finished_jobs()
+    plugin.store_ctx.assert_called_once_with(job, "response")
+    assert plugin.runs.add.call_args.args[3] == 5
+    plugin.process_queue()
+    assert plugin.start_worker.call_count == 3
+
+
+def test_run_job_finished_on_ctx_end(mock_window):
+    """Test job sent to current chat is finished when response ends"""
+    plugin = get_plugin(mock_window)
+    plugin.job = MagicMock()  # response is still generated
+    mock_window.controller.chat.input.generating = False
+    mock_window.controller.chat.input.locked = False
+    mock_window.core.ctx.current = 3
+
+    def send(item):
+        mock_window.controller.chat.input.generating = True
+    plugin.job.side_effect = send
+    plugin.queue.add("a", ITEM)
+    plugin.process_queue()
+    plugin.runs.add.assert_not_called()
+    assert len(plugin.queue.running) == 1
+
+    ctx_end(plugin, "")(ITEM)  # empty response
+    mock_window.controller.chat.input.generating = False
+    plugin.runs.add.assert_called_once()
+    assert plugin.runs.add.call_args.args[1:] == ("error", "Empty response", 3)
+    assert plugin.queue.running == {}
+
+
+def test_run_job_not_sent(mock_window):
+    """Test job is finished with error if prompt was not sent"""
+    plugin = get_plugin(mock_window)
+    plugin.job = MagicMock()
+    mock_window.controller.chat.input.generating = False
+    mock_window.controller.chat.input.locked = False
+    plugin.queue.add("a", ITEM)
+    plugin.process_queue()
+    assert plugin.runs.add.call_args.args[1:3] == ("error", "Prompt not sent")
+    assert plugin.current is None
+    assert plugin.queue.running == {}
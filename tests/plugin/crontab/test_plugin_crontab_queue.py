@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 10:00:00                  #
+# ================================================== #
+
+from pygpt_net.plugin.crontab.queue import Queue
+
+
+def test_add_priority():
+    """Test jobs are started by priority, then by order of adding"""
+    queue = Queue()
+    queue.add("a", {"prompt": "a"})
+    queue.add("b", {"prompt": "b"}, priority=5)
+    queue.add("c", {"prompt": "c"})
+    keys = []
+    while True:
+        job = queue.next(max_running=10)
+        if job is None:
+            break
+        keys.append(job["key"])
+    assert keys == ["b", "a", "c"]
+    assert len(queue.running) == 3
+
+
+def test_coalesce():
+    """Test pending runs of the same task are merged"""
+    queue = Queue()
+    assert queue.add("a", {}) is True
+    assert queue.add("a", {}, priority=3) is False
+    assert queue.count() == 1
+    queue.add("b", {}, priority=2)
+    job = queue.next(max_running=2)
+    assert job["key"] == "a"
+    assert job["coalesced"] == 1
+    assert queue.add("a", {}, coalesce=False) is True
+    assert queue.add("a", {}, coalesce=False) is True
+    assert queue.count() == 3
+    assert queue.next(max_running=10)["key"] == "b"
+    assert queue.next(max_running=10) is None  # outdated entry of started job skipped, "a" running
+
+
+def test_max_running():
+    """Test concurrency limit and no overlapping runs of the same task"""
+    queue = Queue()
+    queue.add("a", {}, coalesce=False)
+    queue.add("a", {}, coalesce=False)
+    queue.add("b", {})
+    first = queue.next(max_running=2)
+    second = queue.next(max_running=2)
+    assert (first["key"], second["key"]) == ("a", "b")  # second "a" waits for the first one
+    assert queue.next(max_running=2) is None
+    queue.finish(second)
+    assert queue.next(max_running=2) is None  # "a" still running
+    queue.finish(first)
+    assert queue.next(max_running=2)["key"] == "a"
+    assert queue.count() == 0
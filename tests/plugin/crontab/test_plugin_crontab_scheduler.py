@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 08:00:00                  #
+# ================================================== #
+
+from datetime import datetime, timedelta
+
+from pygpt_net.plugin.crontab.scheduler import Scheduler
+
+NOW = datetime(2024, 1, 19, 9, 0, 0)
+HOURLY = {"enabled": True, "crontab": "0 * * * *", "prompt": "hourly", "preset": "_"}
+DAILY = {"enabled": True, "crontab": "30 9 * * *", "prompt": "daily", "preset": "_"}
+
+
+def test_load():
+    """Test queue is rebuilt only when tasks are changed"""
+    scheduler = Scheduler()
+    crontab = [HOURLY, DAILY, {"enabled": False, "crontab": "* * * * *"}, {"enabled": True, "crontab": "bad"}]
+    assert scheduler.load(crontab, NOW) is True
+    assert scheduler.count() == 2
+    assert len(scheduler.errors) == 1
+    assert scheduler.get_next_time() == datetime(2024, 1, 19, 9, 30)
+    assert scheduler.load(crontab, NOW) is False
+    crontab[0] = dict(HOURLY, enabled=False)
+    assert scheduler.load(crontab, NOW) is True
+    assert scheduler.count() == 1
+
+
+def test_get_due():
+    """Test due tasks are popped and rescheduled"""
+    scheduler = Scheduler()
+    scheduler.load([HOURLY, DAILY], NOW)
+    assert scheduler.get_due(NOW + timedelta(minutes=10)) == []
+    assert scheduler.get_due(datetime(2024, 1, 19, 9, 30, 1)) == [(DAILY, 1)]
+    assert scheduler.get_next_time() == datetime(2024, 1, 19, 10, 0)
+    assert scheduler.get_due(datetime(2024, 1, 19, 10, 0, 1)) == [(HOURLY, 1)]
+    assert scheduler.get_next_time() == datetime(2024, 1, 19, 11, 0)
+
+
+def test_get_due_missed():
+    """Test missed runs policy (e.g. after sleep)"""
+    wake = datetime(2024, 1, 19, 12, 10)  # 3 hourly runs missed
+    for policy, runs in [(Scheduler.POLICY_SKIP, None), (Scheduler.POLICY_ONCE, 1), (Scheduler.POLICY_CATCH_UP, 3)]:
+        scheduler = Scheduler()
+        scheduler.load([HOURLY], NOW)
+        due = scheduler.get_due(wake, policy)
+        assert due == ([(HOURLY, runs)] if runs else [])
+        assert scheduler.get_next_time() == datetime(2024, 1, 19, 13, 0)
+
+
+def test_get_due_catch_up_limit():
+    """Test number of caught up runs is limited"""
+    scheduler = Scheduler()
+    scheduler.load([dict(HOURLY, crontab="* * * * *")], NOW)
+    wake = NOW + timedelta(days=7)
+    due = scheduler.get_due(wake, Scheduler.POLICY_CATCH_UP)
+    assert due[0][1] == Scheduler.MAX_CATCH_UP
+    assert scheduler.get_next_time() == wake + timedelta(minutes=1)
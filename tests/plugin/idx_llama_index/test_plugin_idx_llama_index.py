@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+from unittest.mock import MagicMock
+
+from llama_index.schema import TextNode, NodeWithScore
+
+from pygpt_net.core.dispatcher import Event
+from pygpt_net.item.ctx import CtxItem
+from tests.mocks import mock_window
+from pygpt_net.plugin.idx_llama_index import Plugin
+
+
+def prepare(mock_window):
+    plugin = Plugin(window=mock_window)
+    plugin.init_options()
+    plugin.setup()
+    plugin.options["ask_llama_first"]["value"] = True
+    plugin.options["retrieve_only"]["value"] = True
+    plugin.options["idx"]["value"] = "base, other"
+    mock_window.core.idx.storage.get_version = MagicMock(return_value=1.0)
+    mock_window.core.idx.chat.retrieve = MagicMock(return_value=[
+        NodeWithScore(node=TextNode(text="first chunk"), score=0.9),
+        NodeWithScore(node=TextNode(text="second chunk"), score=0.8),
+    ])
+    mock_window.core.tokens.from_str = MagicMock(return_value=10)
+    return plugin
+
+
+def test_options(mock_window):
+    """Test options"""
+    plugin = Plugin(window=mock_window)
+    plugin.init_options()
+    options = plugin.setup()
+    assert "merge" in options
+    assert "retrieve_only" in options
+    assert "max_tokens" in options
+    assert "cache_ttl" in options
+
+
+def test_handle_post_prompt_retrieve_only(mock_window):
+    """Test handle event: post.prompt in retrieval only mode"""
+    plugin = prepare(mock_window)
+    ctx = CtxItem()
+    ctx.input = "question"
+    event = Event("post.prompt", {"value": "prompt"})
+    event.ctx = ctx
+    plugin.handle(event)
+    assert event.data["value"] == "prompt\nADDITIONAL KNOWLEDGE: first chunk\n\nsecond chunk"
+    mock_window.core.idx.chat.retrieve.assert_called_once()
+    assert mock_window.core.idx.chat.retrieve.call_args[0][1] == ["base", "other"]
+
+
+def test_get_context_budget(mock_window):
+    """Test token budget for retrieved chunks"""
+    plugin = prepare(mock_window)
+    plugin.options["max_tokens"]["value"] = 15
+    assert plugin.get_context("question") == "first chunk\n\nsecond"  # cut to fit
+    plugin.options["max_tokens"]["value"] = 10
+    assert plugin.get_context("question") == "first chunk"
+
+
+def test_retrieve_cache(mock_window):
+    """Test retrieval cache with normalized query"""
+    plugin = prepare(mock_window)
+    plugin.retrieve("Some  Question ")
+    plugin.retrieve("some question")
+    assert mock_window.core.idx.chat.retrieve.call_count == 1
+
+    # index updated
+    mock_window.core.idx.storage.get_version = MagicMock(return_value=2.0)
+    plugin.retrieve("some question")
+    assert mock_window.core.idx.chat.retrieve.call_count == 2
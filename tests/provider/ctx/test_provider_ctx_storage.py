@@ -42,6 +42,8 @@ def test_get_meta(mock_window):
         'is_important': 0,
         'is_archived': 0,
         'label': 0,
+        'summary': None,
+        'summary_count': 0,
     }
     conn = Mock()
     conn.execute.return_value = [fake_row]
@@ -279,6 +281,8 @@ def test_unpack_meta(mock_window):
         'is_important': 1,
         'is_archived': 1,
         'label': 0,
+        'summary': None,
+        'summary_count': 0,
     }
     meta = CtxMeta()
     unpack_meta(meta, row)
@@ -303,6 +307,8 @@ def test_unpack_meta(mock_window):
     assert meta.important is True
     assert meta.archived is True
     assert meta.label == 0
+    assert meta.summary is None
+    assert meta.summary_count == 0
 
 
 def test_unpack_item(mock_window):
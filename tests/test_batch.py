@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.mocks import mock_window
+from pygpt_net.batch import Batch
+from pygpt_net.core.gpt.chat import Chat
+from pygpt_net.core.gpt.completion import Completion
+
+
+@pytest.fixture
+def files():
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding="utf-8") as file:
+        file.write('{"id": "a", "prompt": "first"}\n\n"second"\n{"prompt": "third", "mode": "completion"}\n')
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding="utf-8") as output:
+        pass
+    yield file.name, output.name
+    Path(file.name).unlink()
+    Path(output.name).unlink()
+
+
+def test_load(files):
+    """Test jobs are loaded with IDs and defaults"""
+    batch = Batch()
+    batch.defaults = {"mode": "chat"}
+    jobs = batch.load(files[0])
+    assert [job["id"] for job in jobs] == ["a", "3", "4"]
+    assert jobs[1] == {"id": "3", "prompt": "second", "mode": "chat"}
+    assert jobs[2]["mode"] == "completion"
+
+
+def test_prepare(mock_window):
+    """Test request params: config, then preset, then job params"""
+    batch = Batch(mock_window)
+    data = {'mode': 'chat', 'model': 'gpt-4', 'prompt': 'sys', 'temperature': 1.0, 'max_output_tokens': 100,
+            'user_name': 'me', 'ai_name': 'AI'}
+    mock_window.core.config.get = MagicMock(side_effect=lambda key, default=None: data.get(key, default))
+    preset = MagicMock(model=None, prompt="preset prompt", temperature=0.5, user_name="", ai_name="")
+    mock_window.core.presets.exists = MagicMock(return_value=True)
+    mock_window.core.presets.items = {"test": preset}
+    mock_window.core.presets.get_first_mode = MagicMock(return_value="completion")
+    mock_window.core.models.has = MagicMock(return_value=True)
+    mock_window.core.models.get_id = MagicMock(side_effect=lambda key: key + "-id")
+
+    request = batch.prepare({"prompt": "x", "preset": "test", "model": "gpt-3.5"})
+    assert request["mode"] == "completion"
+    assert request["model"] == "gpt-3.5"
+    assert request["model_id"] == "gpt-3.5-id"
+    assert request["sys_prompt"] == "preset prompt"
+    assert request["temperature"] == 0.5
+    assert request["max_tokens"] == 100
+
+    with pytest.raises(Exception):
+        batch.prepare({"prompt": "x", "mode": "assistant"})
+
+
+def test_call_chat(mock_window):
+    """Test chat request is built by core.gpt.chat (tokens fitted to model context)"""
+    batch = Batch(mock_window)
+    mock_window.core.gpt.chat = Chat(mock_window)
+    mock_window.core.tokens.from_messages = MagicMock(return_value=90)
+    mock_window.core.models.get_num_ctx = MagicMock(return_value=100)
+    client = mock_window.core.gpt.get_client.return_value
+    client.chat.completions.create.return_value.choices[0].message.content = " answer "
+    request = {"sys_prompt": "sys", "model": "gpt-4", "model_id": "gpt-4-id", "max_tokens": 50, "temperature": 0.5}
+    output, _ = batch.call_chat("question", request)
+    assert output == "answer"
+    kwargs = client.chat.completions.create.call_args.kwargs
+    assert kwargs["messages"] == [{"role": "system", "content": "sys"}, {"role": "user", "content": "question"}]
+    assert kwargs["model"] == "gpt-4-id"
+    assert kwargs["max_tokens"] == 9
+    assert kwargs["temperature"] == 0.5
+
+
+def test_call_completion(mock_window):
+    """Test completion request is built by core.gpt.completion"""
+    batch = Batch(mock_window)
+    mock_window.core.gpt.completion = Completion(mock_window)
+    client = mock_window.core.gpt.get_client.return_value
+    client.completions.create.return_value.choices[0].text = " answer "
+    request = {"sys_prompt": "sys", "model_id": "text-davinci-003", "max_tokens": 50, "temperature": 0.5,
+               "user_name": "me", "ai_name": "AI"}
+    output, _ = batch.call_completion("question", request)
+    assert output == "answer"
+    kwargs = client.completions.create.call_args.kwargs
+    assert kwargs["prompt"] == "sys\nme: question\nAI:"
+    assert kwargs["model"] == "gpt-3.5-turbo-instruct"
+    assert kwargs["stop"] == ["me:"]
+
+
+def test_run_resume(files):
+    """Test results are appended and finished jobs are skipped on next run"""
+    path, output = files
+    batch = Batch(workers=2, store_ctx=False)
+    batch.call = MagicMock(side_effect=lambda job: {
+        "id": job["id"],
+        "status": "error" if job["id"] == "3" else "ok",
+    })
+    summary = batch.run(path, output)
+    assert summary == {"total": 3, "skipped": 0, "ok": 2, "error": 1}
+    with open(output, encoding="utf-8") as file:
+        assert sorted(json.loads(line)["id"] for line in file) == ["3", "4", "a"]
+
+    summary = batch.run(path, output)  # only failed job is executed again
+    assert summary == {"total": 3, "skipped": 2, "ok": 0, "error": 1}
+    assert batch.call.call_args.args[0]["id"] == "3"
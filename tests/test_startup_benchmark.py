@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.18 16:00:00                  #
+# ================================================== #
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cold/warm startup benchmark, run with: PYGPT_BENCHMARK=1 pytest -s tests/test_startup_benchmark.py
+# Optional regression limit for warm startup (ms): PYGPT_BENCHMARK_MAX_MS
+STARTUP = """
+from PySide6.QtWidgets import QApplication
+from pygpt_net.app import MainWindow
+app = QApplication([])
+window = MainWindow()
+window.setup()
+window.show()
+window.profiler.mark('window.show')
+window.post_setup()
+app.processEvents()  # run deferred setup
+window.close()
+"""
+
+
+def run_startup(home: str) -> dict:
+    """
+    Run app startup in clean interpreter and parse startup timeline
+
+    :param home: home directory (user config)
+    :return: dict: phase => (start, duration) in ms
+    """
+    env = dict(os.environ, HOME=home, PYTHONPATH=os.pathsep.join(sys.path),
+               QT_QPA_PLATFORM='offscreen', PYGPT_TRACE_STARTUP='1')
+    result = subprocess.run([sys.executable, '-c', STARTUP], capture_output=True, text=True, env=env, timeout=300)
+    assert result.returncode == 0, result.stderr
+    timeline = {}
+    for line in result.stdout.split("Startup timeline:")[1].splitlines()[2:]:
+        parts = line.split()
+        if len(parts) != 5 or parts[1] != 'ms':
+            break
+        timeline[parts[4]] = (float(parts[0]), float(parts[2]))
+    return timeline
+
+
+@pytest.mark.skipif(not os.environ.get('PYGPT_BENCHMARK'), reason="benchmark, set PYGPT_BENCHMARK=1 to run")
+def test_startup_benchmark(tmp_path):
+    """Test cold (first run, fresh install) and warm startup time"""
+    cold = run_startup(str(tmp_path))
+    warm = run_startup(str(tmp_path))
+
+    print()
+    for name in cold:
+        print("{:<30} cold: {:>10.2f} ms  warm: {:>10.2f} ms".format(name, cold[name][1], warm.get(name, (0, 0))[1]))
+    print("{:<30} cold: {:>10.2f} ms  warm: {:>10.2f} ms".format('first paint', cold['window.show'][0],
+                                                                warm['window.show'][0]))
+    print("{:<30} cold: {:>10.2f} ms  warm: {:>10.2f} ms".format('ready', cold['ready'][0], warm['ready'][0]))
+
+    # deferred subsystems are not initialized before first paint
+    for timeline in [cold, warm]:
+        for name in timeline:
+            if name.startswith('deferred'):
+                assert timeline[name][0] >= timeline['window.show'][0]
+
+    if os.environ.get('PYGPT_BENCHMARK_MAX_MS'):
+        assert warm['window.show'][0] <= float(os.environ.get('PYGPT_BENCHMARK_MAX_MS'))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ================================================== #
+# This file is a part of PYGPT package               #
+# Website: https://pygpt.net                         #
+# GitHub:  https://github.com/szczyglis-dev/py-gpt   #
+# MIT License                                        #
+# Created By  : Marcin Szczygliński                  #
+# Updated Date: 2024.01.19 22:00:00                  #
+# ================================================== #
+
+import os
+import subprocess
+import sys
+
+PLUGINS = [
+    'audio_azure',
+    'audio_openai_tts',
+    'audio_openai_whisper',
+    'cmd_code_interpreter',
+    'cmd_custom',
+    'cmd_files',
+    'cmd_web_google',
+    'crontab',
+    'idx_llama_index',
+    'openai_dalle',
+    'openai_vision',
+    'real_time',
+    'self_loop',
+]
+LLMS = ['Anthropic', 'AzureOpenAI', 'HuggingFace', 'Llama2', 'Ollama', 'OpenAI']
+HEAVY = ['docker', 'pygame', 'speech_recognition', 'bs4', 'langchain', 'langchain_core', 'langchain_community',
+         'langchain_openai', 'langchain_experimental', 'azure', 'llama_index', 'cv2']
+
+
+def import_cost(modules: list) -> dict:
+    """
+    Import modules in clean interpreter and get import cost per top-level module (-X importtime)
+
+    :param modules: modules to import
+    :return: dict: module => cumulative import time in us
+    """
+    code = "; ".join("import " + module for module in modules)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    costs = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # header
+        name = parts[2].strip()
+        costs[name] = cumulative
+    return costs
+
+
+def test_plugins_llms_import_cost():
+    """Test plugins and LLMs wrappers do not import heavy dependencies on registration (benchmark)"""
+    modules = ['pygpt_net.plugin.' + id for id in PLUGINS] + ['pygpt_net.llm.' + id for id in LLMS]
+    costs = import_cost(modules)
+
+    # report import cost per module (run with -s)
+    print()
+    for name in modules:
+        print("{:<50} {:>10.2f} ms".format(name, costs.get(name, 0) / 1000))
+    total = sum(costs[name] for name in costs if '.' not in name)
+    print("{:<50} {:>10.2f} ms".format('total (top-level)', total / 1000))
+
+    loaded = [name for name in HEAVY if name in costs]
+    assert loaded == []
+
+
+def test_app_import_cost():
+    """Test app does not import heavy dependencies before they are used (benchmark)"""
+    costs = import_cost(['pygpt_net.app'])
+    print()
+    print("{:<50} {:>10.2f} ms".format('pygpt_net.app', costs.get('pygpt_net.app', 0) / 1000))
+
+    loaded = [name for name in HEAVY if name in costs]
+    assert loaded == []